@@ -2,79 +2,281 @@
 
 from __future__ import annotations
 
+import argparse
 import asyncio
 import logging
-from contextlib import asynccontextmanager
-from typing import TYPE_CHECKING
+import os
+import time
+from contextlib import asynccontextmanager, suppress
+from pathlib import Path
+from typing import TYPE_CHECKING, Annotated, Any
 
 import uvicorn
-from fastapi import FastAPI
+from fastapi import FastAPI, Header, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from sse_starlette.sse import EventSourceResponse
 
+from mimir_api.cache import ResponseCache
+from mimir_api.cluster import EventLog, LeaderLock
 from mimir_api.config import load_config
 from mimir_api.db import Database
-from mimir_api.dependencies import set_db
-from mimir_api.ingestion import ingest_all, ingest_project
-from mimir_api.routes import activity, agents, projects
-from mimir_api.sse import EventBus
+from mimir_api.ingestion import IngestProgress, ingest_all, ingest_project, make_parse_executor
+from mimir_api.registry import AgentRegistry
+from mimir_api.routes import activity, agents, export, projects, search, stats
+from mimir_api.scheduler import IngestScheduler
+from mimir_api.sse import EventBus, EventRecord
 from mimir_api.watcher import ProjectWatcher
 
 if TYPE_CHECKING:
     from collections.abc import AsyncGenerator
-    from pathlib import Path
+    from concurrent.futures import Executor
+
+    from mimir_api.config import MimirConfig
+    from mimir_api.discovery import Discovery
+    from mimir_api.ingestion import IngestResult, ProjectChanges
+    from mimir_api.registry import Agent
 
 logger = logging.getLogger(__name__)
 
 event_bus = EventBus()
 
+# Events published after an ingest committed a project's data; followers invalidate their caches on these only
+DATA_EVENTS = frozenset({"ingest_progress", "board_updated", "tasks_delta", "activity_new", "story_counts"})
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
-    """Startup: connect DB, run initial ingestion, start watcher."""
+    """Startup: connect DB, then start the watcher and initial ingestion in the background.
+
+    Requests are served from the existing database while the initial pass runs;
+    `/api/ready` reports its progress.
+    """
     config = load_config()
 
     # Database
-    db = Database(config.db_path)
+    db = Database(
+        config.db_path,
+        readers=config.db_readers,
+        synchronous=config.db_synchronous,
+        cache_size=config.db_cache_size,
+        mmap_size=config.db_mmap_size,
+        busy_timeout_ms=config.db_busy_timeout_ms,
+        write_batch_rows=config.db_write_batch_rows,
+        write_batch_delay_ms=config.db_write_batch_delay_ms,
+    )
     await db.connect()
-    set_db(db)
+    app.state.db = db
+    app.state.response_cache = ResponseCache(config.response_cache_entries)
 
-    # Initial ingestion
-    count = await ingest_all(db, config.watch_paths, config.max_depth)
-    logger.info("Initial ingestion complete: %d projects discovered", count)
+    # SSE: replay buffer for reconnecting clients, keep-alive comments for idle ones
+    event_bus.configure(config.sse_replay_events, config.sse_replay_bytes)
+    app.state.sse_ping_seconds = config.sse_ping_seconds
+
+    # File parsing runs in this pool, off the event loop
+    executor = make_parse_executor(config.parse_executor, config.parse_workers)
+
+    # Re-ingest scheduler: debounced, single-flight per project
+    scheduler = IngestScheduler(
+        lambda project_path: _reingest(db, project_path, executor),
+        debounce_seconds=config.ingest_debounce_seconds,
+        max_concurrency=config.max_concurrent_ingests,
+    )
+    scheduler.start()
+    app.state.scheduler = scheduler
 
     # File watcher
-    def on_file_change(path: Path) -> None:
-        """Handle filesystem change — re-ingest the affected project."""
-        project_dir = path.parent
-        # Walk up to find ullr.yaml
-        while project_dir != project_dir.parent:
-            if (project_dir / "ullr.yaml").exists():
-                break
-            project_dir = project_dir.parent
-        else:
-            return
-
-        asyncio.get_event_loop().create_task(_reingest(db, project_dir))
-
-    watcher = ProjectWatcher(config.watch_paths, on_file_change)
-    watcher.start()
+    watcher = ProjectWatcher(
+        config.watch_paths,
+        scheduler.notify_threadsafe,
+        mode=config.watch_mode,
+        max_depth=config.max_depth,
+        ignore=config.discovery_ignore,
+        poll_interval_seconds=config.poll_interval_seconds,
+        poll_workers=config.poll_workers,
+    )
+    app.state.watcher = watcher
+
+    # Workers elect a leader through a lock file next to the database; the leader runs
+    # the watcher and ingestion, the others serve reads and stream its events
+    leader_lock = LeaderLock(Path(f"{config.db_path}.leader"))
+    event_log = EventLog(db, event_bus, retain=config.sse_replay_events)
+    app.state.leader_lock = leader_lock
+    app.state.event_log = event_log
+
+    # Live agents from heartbeats; every worker keeps the table, only the leader announces changes
+    async def announce(event_type: str, agent: Agent) -> None:
+        if leader_lock.held:
+            await event_bus.publish(event_type, agent.as_dict(), conflate=False)
+
+    registry = AgentRegistry(
+        config.agents_dir,
+        ttl_seconds=config.agent_ttl_seconds,
+        scan_seconds=config.agent_scan_seconds,
+        max_agents=config.max_agents,
+        on_change=announce,
+    )
+    registry.start()
+    app.state.agent_registry = registry
+    app.state.heartbeat_token = config.agent_heartbeat_token
+
+    # Initial ingestion, in the background once this worker leads
+    progress = IngestProgress()
+    app.state.ingest_progress = progress
+    startup = asyncio.create_task(_lead_or_follow(db, config, watcher, executor, progress, leader_lock, event_log))
 
     yield
 
     # Shutdown
+    startup.cancel()
+    with suppress(asyncio.CancelledError):
+        await startup
     watcher.stop()
+    await registry.close()
+    await scheduler.close()
+    logger.info(
+        "Ingest scheduler: %(events)d change events coalesced into %(runs)d runs (%(coalesced)d coalesced)",
+        scheduler.stats,
+    )
+    executor.shutdown(wait=False, cancel_futures=True)
+    event_bus.persist_with(None)
     await db.close()
+    # Only once nothing more will be written, so a follower can take over
+    leader_lock.release()
 
 
-async def _reingest(db: Database, project_path: Path) -> None:
-    """Re-ingest a single project and notify SSE subscribers."""
+async def _lead_or_follow(
+    db: Database,
+    config: MimirConfig,
+    watcher: ProjectWatcher,
+    executor: Executor,
+    progress: IngestProgress,
+    leader_lock: LeaderLock,
+    event_log: EventLog,
+) -> None:
+    """Stream the leader's events from the event log until this worker wins the lock, then lead.
+
+    A follower never writes: it serves reads, invalidates its response cache from the
+    data-change events it reads, and mirrors the leader's ingest progress for
+    `/api/ready`. When the leader exits, the first follower to take the lock catches
+    up on the log and starts the watcher and ingestion itself. This holds for a
+    single worker too: a second server on the same database follows the first
+    instead of ingesting alongside it.
+    """
+
+    def on_event(event_type: str, data: dict[str, Any]) -> None:
+        if event_type in DATA_EVENTS and data.get("project_id"):
+            db.generations.bump(data["project_id"])
+        if event_type == "ingest_progress" and progress.status != "ready":
+            progress.status = data["status"]
+            progress.projects_done = data["projects_done"]
+            progress.projects_total = data["projects_total"]
+            if progress.status == "ready":
+                progress.finished_at = time.monotonic()
+
+    if leader_lock.acquire():
+        await event_log.start()
+    else:
+        logger.info("Worker %d is following the leader", os.getpid())
+        await event_log.start(on_event)
+        while not leader_lock.acquire():
+            try:
+                await event_log.follow(on_event)
+            except Exception:
+                logger.exception("Failed to read the event log")
+            await asyncio.sleep(config.leader_poll_seconds)
+        while await event_log.follow(on_event):
+            pass
+
+    event_bus.persist_with(event_log.store)
+    # Data served so far is already complete after a failover; keep /api/ready ready while re-checking it
+    await _initial_ingest(db, config, watcher, executor, progress if progress.status != "ready" else IngestProgress())
+
+
+async def _initial_ingest(
+    db: Database,
+    config: MimirConfig,
+    watcher: ProjectWatcher,
+    executor: Executor,
+    progress: IngestProgress,
+) -> None:
+    """Start the watcher, then discover and ingest every project, publishing progress over SSE."""
+
+    def on_discovered(discovery: Discovery) -> None:
+        # Watch projects before ingesting them, so no write between the two is missed
+        watcher.track(Path(project["path"]) for project in discovery.projects)
+        watcher.watch_dirs(discovery.dirs)
+
+    async def on_project(progress: IngestProgress, result: IngestResult) -> None:
+        await event_bus.publish("ingest_progress", {**progress.as_dict(), "project_id": result.project_id})
+
     try:
-        await ingest_project(db, project_path)
-        await event_bus.publish("board_updated", {"project_path": str(project_path)})
-        logger.info("Re-ingested project at %s", project_path)
+        await asyncio.to_thread(watcher.start)
+        count = await ingest_all(
+            db,
+            config.watch_paths,
+            config.max_depth,
+            ignore=config.discovery_ignore,
+            workers=config.discovery_workers,
+            executor=executor,
+            progress=progress,
+            on_project=on_project,
+            on_discovered=on_discovered,
+            concurrency=config.max_concurrent_ingests,
+        )
     except Exception:
-        logger.exception("Failed to re-ingest %s", project_path)
+        progress.status = "failed"
+        logger.exception("Initial ingestion failed")
+        return
+    await event_bus.publish("ingest_progress", progress.as_dict())
+    logger.info("Initial ingestion complete: %d projects discovered", count)
+
+
+async def _reingest(db: Database, project_path: Path, executor: Executor) -> None:
+    """Re-ingest a single project and notify SSE subscribers of what changed."""
+    result = await ingest_project(db, project_path, executor)
+    if result.project_id is not None:
+        await _publish_changes(result.project_id, project_path, result.changes)
+    logger.info("Re-ingested project at %s", project_path)
+
+
+async def _publish_changes(project_id: str, project_path: Path, changes: ProjectChanges) -> None:
+    """Publish an ingest's changes as typed deltas that clients apply to their cached board and feed.
+
+    Falls back to a single `board_updated` (clients refetch) when the change is too
+    large to send row by row. The deltas of one ingest are published (and stored) together.
+    """
+    if changes.refetch:
+        await event_bus.publish("board_updated", {"project_id": project_id, "project_path": str(project_path)})
+        return
+    events: list[EventRecord] = []
+    if changes.has_task_changes:
+        events.append(
+            EventRecord(
+                "tasks_delta",
+                {
+                    "project_id": project_id,
+                    "added": changes.tasks_added,
+                    "moved": changes.tasks_moved,
+                    "edited": changes.tasks_edited,
+                    "removed": changes.tasks_removed,
+                },
+                conflate=False,
+            )
+        )
+    if changes.activity:
+        events.append(
+            EventRecord("activity_new", {"project_id": project_id, "events": changes.activity}, conflate=False)
+        )
+    if changes.story_counts is not None:
+        total, done = changes.story_counts
+        events.append(
+            EventRecord(
+                "story_counts",
+                {"project_id": project_id, "total_stories": total, "done_stories": done},
+                conflate=True,
+            )
+        )
+    await event_bus.publish_many(events)
 
 
 def create_app() -> FastAPI:
@@ -90,47 +292,92 @@ def create_app() -> FastAPI:
     app.add_middleware(
         CORSMiddleware,
         allow_origins=["http://localhost:3400", "http://localhost:3000", "http://localhost:8080", "http://[::]:8080"],
-        allow_methods=["GET"],
+        allow_methods=["GET", "POST"],
         allow_headers=["*"],
+        expose_headers=["ETag", "X-Next-Cursor", "X-Prev-Cursor"],
     )
 
     # Routes
     app.include_router(projects.router)
     app.include_router(agents.router)
     app.include_router(activity.router)
+    app.include_router(export.router)
+    app.include_router(search.router)
+    app.include_router(stats.router)
 
     @app.get("/api/sse")
-    async def sse_endpoint() -> EventSourceResponse:
-        """Server-Sent Events stream for live updates."""
-        queue = event_bus.subscribe()
-
-        async def generate() -> AsyncGenerator[dict[str, str], None]:
-            try:
-                while True:
-                    event = await queue.get()
-                    yield {"event": event["event"], "data": str(event.get("data", "{}"))}
-            except asyncio.CancelledError:
-                event_bus.unsubscribe(queue)
+    async def sse_endpoint(
+        request: Request,
+        project: Annotated[list[str] | None, Query(description="Only send events for these project IDs")] = None,
+        last_event_id: str | None = Header(None, alias="Last-Event-ID"),
+    ) -> EventSourceResponse:
+        """Server-Sent Events stream for live updates.
 
-        return EventSourceResponse(generate())
+        Reconnecting clients send `Last-Event-ID`; events published since then are
+        replayed from the buffer, or a single `resync` event is sent if they have
+        already been evicted and the client should refetch everything.
+        """
+        subscriber = event_bus.subscribe(last_event_id, project)
+        ping = request.app.state.sse_ping_seconds
+        return EventSourceResponse(event_bus.stream(subscriber, request.is_disconnected, ping), ping=ping)
 
     @app.get("/api/health")
     async def health() -> dict[str, str]:
         return {"status": "ok"}
 
+    @app.get("/api/metrics")
+    async def metrics(request: Request) -> dict[str, Any]:
+        """Internal counters: caches, re-ingest scheduling, group commit, agents, SSE lag, file watching."""
+        return {
+            "response_cache": request.app.state.response_cache.stats,
+            "scheduler": request.app.state.scheduler.stats,
+            "writes": request.app.state.db.writes.stats,
+            "agents": request.app.state.agent_registry.stats,
+            "board": request.app.state.db.board.stats,
+            "sse": event_bus.stats,
+            "watcher": request.app.state.watcher.stats,
+            "worker": {
+                "pid": os.getpid(),
+                "role": "leader" if request.app.state.leader_lock.held else "follower",
+                "event_log": request.app.state.event_log.stats,
+            },
+        }
+
+    @app.get("/api/ready", responses={503: {"description": "Initial ingestion has not finished yet"}})
+    async def ready(request: Request, response: Response) -> dict[str, Any]:
+        """Readiness and initial ingestion progress (projects done/total, ETA).
+
+        Answers 503, with the same body, until the initial ingestion completes, so
+        readiness probes hold traffic back until then.
+        """
+        progress: IngestProgress = request.app.state.ingest_progress
+        role = "leader" if request.app.state.leader_lock.held else "follower"
+        if progress.status != "ready":
+            response.status_code = 503
+        return {**progress.as_dict(), "role": role, "scheduler": request.app.state.scheduler.stats}
+
     return app
 
 
 def main() -> None:
-    """Entry point for `mimir-api` CLI command."""
+    """Entry point for `mimir-api` CLI command.
+
+    With one worker (the default) the server auto-reloads for development. With
+    `--workers N` (or `api_workers`) it runs N worker processes without reload; one
+    is elected leader to watch and ingest, and the rest serve reads.
+    """
     logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
     config = load_config()
+    parser = argparse.ArgumentParser(prog="mimir-api", description="Run the Mimir API server.")
+    parser.add_argument("--workers", type=int, default=config.api_workers, help="worker processes (default: 1)")
+    args = parser.parse_args()
     uvicorn.run(
         "mimir_api.app:create_app",
         factory=True,
         host="0.0.0.0",
         port=config.api_port,
-        reload=True,
+        reload=args.workers == 1,
+        workers=args.workers if args.workers > 1 else None,
     )
 
 
@@ -0,0 +1,288 @@
+"""Materialized Kanban board: every project's tasks per column, kept sorted and serialized in memory."""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import json
+from operator import itemgetter
+from typing import TYPE_CHECKING, Any
+
+from mimir_api.pagination import decode_cursor, encode_cursor
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from mimir_api.db import Database
+
+# Board columns, in response order; tasks with any other status are not on the board
+COLUMNS = ("backlog", "in_progress", "blocked", "done")
+
+# A task's columns, in the order `/api/board` rows (and the task export) carry them
+TASK_COLUMNS = (
+    "id",
+    "project_id",
+    "story_id",
+    "title",
+    "description",
+    "status",
+    "domain",
+    "complexity",
+    "blocked_reason",
+    "assigned_agent",
+    "priority",
+    "updated_at",
+)
+
+# Board rows, each column in board order; project_id and id break ties, so the order is total.
+# CROSS JOIN keeps tasks as the outer loop, so the ORDER BY walks idx_tasks_board (or
+# idx_tasks_project_board for one project) instead of sorting
+BOARD_QUERY = f"""SELECT {", ".join(f"t.{column}" for column in TASK_COLUMNS)}, p.name as project_name
+    FROM tasks t
+    CROSS JOIN projects p ON t.project_id = p.id
+    {{where}}
+    ORDER BY t.status, t.priority ASC, t.updated_at DESC, t.project_id, t.id"""
+
+# A task on the board: its sort key and its JSON, as `/api/board` serializes it
+_Card = tuple[tuple[Any, ...], bytes]
+
+
+class _Descending:
+    """Wraps a sort key component so it sorts in reverse."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: tuple[Any, ...]) -> None:
+        self.value = value
+
+    def __lt__(self, other: _Descending) -> bool:
+        return other.value < self.value
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _Descending) and self.value == other.value
+
+    __hash__ = None  # type: ignore[assignment]
+
+
+def _sql_value(value: Any) -> tuple[Any, ...]:
+    """Sort key for a column value in SQLite's order: NULL, numbers, text, then blobs."""
+    if value is None:
+        return (0,)
+    if isinstance(value, int | float):
+        return (1, value)
+    if isinstance(value, str):
+        return (2, value)
+    return (3, value)
+
+
+def _key(priority: Any, updated_at: Any, project_id: str, task_id: str) -> tuple[Any, ...]:
+    """A task's sort key within its column, matching `BOARD_QUERY`'s ORDER BY."""
+    return (_sql_value(priority), _Descending(_sql_value(updated_at)), project_id, task_id)
+
+
+def _card(task: dict[str, Any]) -> _Card:
+    """A task's sort key and its JSON, serialized as `/api/board` returns it."""
+    key = _key(task["priority"], task["updated_at"], task["project_id"], task["id"])
+    return key, json.dumps(task, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+
+
+def encode_position(key: tuple[Any, ...]) -> str:
+    """A page cursor for the card with sort key `key`: its priority, updated_at, project_id and id."""
+    priority, updated_at, project_id, task_id = key
+    return encode_cursor(
+        priority[-1] if priority[0] else None,
+        updated_at.value[-1] if updated_at.value[0] else None,
+        project_id,
+        task_id,
+    )
+
+
+def decode_position(token: str) -> tuple[Any, ...]:
+    """The sort key a cursor made by `encode_position` stands for, raising ValueError if it is malformed."""
+    priority, updated_at, project_id, task_id = decode_cursor(token, 4)
+    scalar = (int, float, str, type(None))
+    if not (isinstance(priority, scalar) and isinstance(updated_at, scalar)):
+        msg = "Invalid cursor"
+        raise ValueError(msg)
+    if not (isinstance(project_id, str) and isinstance(task_id, str)):
+        msg = "Invalid cursor"
+        raise ValueError(msg)
+    return _key(priority, updated_at, project_id, task_id)
+
+
+class BoardView:
+    """The `/api/board` data for every project, held in memory so board requests run no SQL.
+
+    Each project's tasks are kept per column as cards (sort key plus pre-serialized
+    JSON), sorted in board order, and so are the `project=all` columns: when a
+    project is reloaded its old cards are filtered out of them and its new ones
+    bisected in, so no request re-sorts or re-merges the whole board. Rendered
+    response bodies are kept until one of the projects they cover changes.
+
+    The view is loaded in full on the first request and then kept current one
+    project at a time: ingestion calls `refresh` after committing a project, and
+    `sync` (run before serving) reloads any project whose generation has moved
+    since it was loaded, which is how follower workers, which never ingest, keep up.
+    """
+
+    def __init__(self, db: Database) -> None:
+        self._db = db
+        self._projects: dict[str, dict[str, list[_Card]]] = {}
+        self._all: dict[str, list[_Card]] = {column: [] for column in COLUMNS}
+        # Generation each project was loaded at, and the total generation the view was last synced to
+        self._generations: dict[str, int] = {}
+        self._synced: int | None = None
+        # Rendered bodies by project (None for all projects), then status filter
+        self._rendered: dict[str | None, dict[str | None, bytes]] = {}
+        self._lock = asyncio.Lock()
+        self.loads = 0
+        self.reloads = 0
+
+    async def sync(self) -> None:
+        """Load the view, or reload the projects that changed since it was last synced."""
+        generations = self._db.generations
+        if self._synced == generations.total:
+            return
+        async with self._lock:
+            total = generations.total
+            if self._synced is None:
+                await self._load_all()
+            elif self._synced != total:
+                for project_id, generation in generations.snapshot().items():
+                    if self._generations.get(project_id, 0) != generation:
+                        await self._load(project_id)
+            self._synced = total
+
+    async def refresh(self, project_id: str, tasks_changed: bool = True) -> None:
+        """Bring one project up to date after an ingest bumped its generation.
+
+        With `tasks_changed` False (only activity changed), the project's cards are
+        kept and only its generation is recorded, unless it was already stale.
+        """
+        if self._synced is None:
+            return
+        async with self._lock:
+            generation = self._db.generations.get(project_id)
+            if not tasks_changed and self._generations.get(project_id, 0) == generation - 1:
+                self._generations[project_id] = generation
+                return
+            await self._load(project_id)
+
+    def render(self, project_id: str | None, status: str | None = None) -> bytes:
+        """The `/api/board` response body for one project (None for all), optionally one status only."""
+        body = self._rendered.get(project_id, {}).get(status)
+        if body is not None:
+            return body
+        columns = {column: self.column(project_id, column) if status in (None, column) else [] for column in COLUMNS}
+        parts = b",".join(b'"%s":[%s]' % (column.encode(), b",".join(cards)) for column, cards in columns.items())
+        total = sum(len(cards) for cards in columns.values())
+        body = b'{"columns":{%s},"total":%d,"done_count":%d}' % (parts, total, len(columns["done"]))
+        # Only bodies for known projects and columns are kept, so arbitrary query values can't grow the cache
+        if (project_id is None or project_id in self._projects) and status in (None, *COLUMNS):
+            self._rendered.setdefault(project_id, {})[status] = body
+        return body
+
+    def summary(self, project_id: str | None, status: str | None, limit: int) -> bytes:
+        """A summary board body: each column's task count, its first `limit` tasks, and a cursor for the rest."""
+        columns = {column: self._cards(project_id, column) if status in (None, column) else [] for column in COLUMNS}
+        parts = b",".join(
+            b'"%s":[%s]' % (column.encode(), b",".join(task for _, task in cards[:limit]))
+            for column, cards in columns.items()
+        )
+        counts = {column: len(cards) for column, cards in columns.items()}
+        cursors = {
+            column: encode_position(cards[limit - 1][0]) if len(cards) > limit else None
+            for column, cards in columns.items()
+        }
+        return b'{"columns":{%s},"counts":%s,"cursors":%s,"total":%d,"done_count":%d}' % (
+            parts,
+            json.dumps(counts, separators=(",", ":")).encode(),
+            json.dumps(cursors, separators=(",", ":")).encode(),
+            sum(counts.values()),
+            counts["done"],
+        )
+
+    def page(
+        self, project_id: str | None, column: str, after: tuple[Any, ...] | None, limit: int
+    ) -> tuple[bytes, str | None]:
+        """A JSON array of up to `limit` tasks in one column after the position `after`, and the next page's cursor."""
+        cards = self._cards(project_id, column)
+        start = 0 if after is None else bisect.bisect_right(cards, after, key=itemgetter(0))
+        page = cards[start : start + limit]
+        next_cursor = encode_position(page[-1][0]) if start + limit < len(cards) else None
+        return b"[%s]" % b",".join(task for _, task in page), next_cursor
+
+    def column(self, project_id: str | None, column: str) -> list[bytes]:
+        """Serialized tasks in one column, in board order, for one project (None for all)."""
+        return [task for _, task in self._cards(project_id, column)]
+
+    def _cards(self, project_id: str | None, column: str) -> list[_Card]:
+        board = self._all if project_id is None else self._projects.get(project_id)
+        return board[column] if board else []
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Projects and tasks held, and full loads versus single-project reloads."""
+        return {
+            "projects": len(self._projects),
+            "tasks": sum(len(cards) for board in self._projects.values() for cards in board.values()),
+            "loads": self.loads,
+            "reloads": self.reloads,
+        }
+
+    async def _load_all(self) -> None:
+        generations = self._db.generations.snapshot()
+        async with self._db.reader() as conn:
+            cursor = await conn.execute(BOARD_QUERY.format(where=""))
+            rows = await cursor.fetchall()
+        self._projects, self._all = _boards(dict(row) for row in rows)
+        self._generations = generations
+        self._rendered.clear()
+        self.loads += 1
+
+    async def _load(self, project_id: str) -> None:
+        generation = self._db.generations.get(project_id)
+        async with self._db.reader() as conn:
+            cursor = await conn.execute(BOARD_QUERY.format(where="WHERE t.project_id = ?"), (project_id,))
+            rows = await cursor.fetchall()
+        _, board = _boards(dict(row) for row in rows)
+        previous = self._projects.pop(project_id, None)
+        if any(board.values()):
+            self._projects[project_id] = board
+        for column in COLUMNS:
+            cards = self._all[column]
+            if previous and previous[column]:
+                cards = [card for card in cards if card[0][2] != project_id]
+            if board[column]:
+                cards = _insert(cards, board[column])
+            self._all[column] = cards
+        self._generations[project_id] = generation
+        self._rendered.pop(project_id, None)
+        self._rendered.pop(None, None)
+        self.reloads += 1
+
+
+def _insert(cards: list[_Card], new: list[_Card]) -> list[_Card]:
+    """Merge sorted `new` cards into sorted `cards`: a bisect per new card, then one pass of list slices."""
+    merged: list[_Card] = []
+    start = 0
+    for card in new:
+        index = bisect.bisect_right(cards, card[0], lo=start, key=itemgetter(0))
+        merged.extend(cards[start:index])
+        merged.append(card)
+        start = index
+    merged.extend(cards[start:])
+    return merged
+
+
+def _boards(tasks: Iterable[dict[str, Any]]) -> tuple[dict[str, dict[str, list[_Card]]], dict[str, list[_Card]]]:
+    """Cards for tasks given in board order, per project and column, and per column across all of them."""
+    boards: dict[str, dict[str, list[_Card]]] = {}
+    columns: dict[str, list[_Card]] = {column: [] for column in COLUMNS}
+    for task in tasks:
+        if task["status"] in COLUMNS:
+            card = _card(task)
+            board = boards.setdefault(task["project_id"], {column: [] for column in COLUMNS})
+            board[task["status"]].append(card)
+            columns[task["status"]].append(card)
+    return boards, columns
@@ -0,0 +1,151 @@
+"""Generation-versioned response cache with strong ETags."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import secrets
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from fastapi import Response
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from fastapi import Request
+
+
+class Generations:
+    """Per-project data generation counters, bumped whenever a project's rows change.
+
+    `get(None)` returns the global generation, which moves whenever any project does,
+    for responses that span every project.
+    """
+
+    def __init__(self) -> None:
+        self._projects: dict[str, int] = {}
+        self.total = 0
+
+    def bump(self, project_id: str) -> None:
+        self._projects[project_id] = self._projects.get(project_id, 0) + 1
+        self.total += 1
+
+    def get(self, project_id: str | None) -> int:
+        if project_id is None:
+            return self.total
+        return self._projects.get(project_id, 0)
+
+    def snapshot(self) -> dict[str, int]:
+        """Every bumped project's current generation (projects never bumped are at 0)."""
+        return dict(self._projects)
+
+
+class CachedResponse(NamedTuple):
+    generation: int
+    etag: str
+    body: bytes
+
+
+class ResponseCache:
+    """Bounded LRU of serialized JSON responses keyed by endpoint and query params.
+
+    An entry is only served while the data generation it was built from is current,
+    so ingestion invalidates entries simply by bumping a generation. ETags are made
+    from the key and generation, so they are known before a body is built; a random
+    per-cache epoch keeps a restarted server's counters from matching old ETags.
+    """
+
+    def __init__(self, max_entries: int = 256) -> None:
+        self._max_entries = max_entries
+        self._epoch = secrets.token_hex(4)
+        self._entries: OrderedDict[tuple[str, ...], CachedResponse] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.evictions = 0
+
+    def etag(self, key: tuple[str, ...], generation: int) -> str:
+        """The strong ETag of the body cached under `key` at `generation`."""
+        digest = hashlib.blake2b("\0".join(key).encode(), digest_size=8).hexdigest()
+        return f'"{self._epoch}-{digest}-{generation}"'
+
+    def lookup(self, key: tuple[str, ...], generation: int) -> CachedResponse | None:
+        entry = self._entries.get(key)
+        if entry is None or entry.generation != generation:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def store(self, key: tuple[str, ...], generation: int, body: bytes) -> CachedResponse:
+        entry = CachedResponse(generation, self.etag(key, generation), body)
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return entry
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Hit/miss counters plus current size."""
+        return {
+            "entries": len(self._entries),
+            "max_entries": self._max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+            "evictions": self.evictions,
+        }
+
+
+async def cached_json(
+    request: Request,
+    generations: Generations,
+    build: Callable[[], Awaitable[Any]],
+    project_id: str | None = None,
+    *,
+    generation: int | None = None,
+) -> Response:
+    """Serve a JSON response from the app's response cache, building it on a miss.
+
+    `project_id` scopes the entry to that project's generation (None means all
+    projects); `generation` replaces it for responses that depend on more than
+    the database. A matching `If-None-Match` gets a 304 without calling `build`.
+    """
+
+    async def build_body() -> bytes:
+        data = await build()
+        return json.dumps(data, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+
+    return await cached_body(request, generations, build_body, project_id, generation=generation)
+
+
+async def cached_body(
+    request: Request,
+    generations: Generations,
+    build: Callable[[], Awaitable[bytes]],
+    project_id: str | None = None,
+    *,
+    generation: int | None = None,
+) -> Response:
+    """Like `cached_json`, for a `build` that returns the serialized JSON body itself."""
+    cache: ResponseCache = request.app.state.response_cache
+    key = (request.url.path, *sorted(f"{k}={v}" for k, v in request.query_params.multi_items()))
+    if generation is None:
+        generation = generations.get(project_id)
+
+    # The ETag is known from the generation alone, so a revalidation is answered before anything is built
+    etag = cache.etag(key, generation)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag in {tag.strip() for tag in if_none_match.split(",")}:
+        cache.not_modified += 1
+        return Response(status_code=304, headers=headers)
+
+    entry = cache.lookup(key, generation)
+    if entry is None:
+        entry = cache.store(key, generation, await build())
+    return Response(content=entry.body, media_type="application/json", headers=headers)
@@ -0,0 +1,147 @@
+"""Multi-worker coordination: file-lock leader election and a shared SQLite event log."""
+
+from __future__ import annotations
+
+import fcntl
+import json
+import logging
+import os
+import time
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+    from mimir_api.db import Database
+    from mimir_api.sse import EventBus, EventRecord
+
+logger = logging.getLogger(__name__)
+
+# Rows fetched per follower poll; a follower further behind catches up over several polls
+FOLLOW_BATCH = 1000
+
+
+class LeaderLock:
+    """An exclusive, non-blocking `flock` on a lock file, held for the life of the worker.
+
+    The kernel drops the lock when its holder exits, however it exits, so a waiting
+    worker takes over on its next `acquire` without leases or heartbeats. The
+    holder's PID is written into the file for operators.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._fd: int | None = None
+        self.held = False
+
+    def acquire(self) -> bool:
+        """Try to become the leader; True if this worker holds the lock."""
+        if self.held:
+            return True
+        if self._fd is None:
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(self._fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return False
+        os.ftruncate(self._fd, 0)
+        os.write(self._fd, f"{os.getpid()}\n".encode())
+        self.held = True
+        logger.info("Worker %d is the leader (%s)", os.getpid(), self.path)
+        return True
+
+    def release(self) -> None:
+        """Give up the lock (closing the file releases it)."""
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+        self.held = False
+
+
+class EventLog:
+    """SSE events persisted in `event_log`, so every worker process streams the same events.
+
+    The leader stores each event here before publishing it locally (installed with
+    `EventBus.persist_with`), in the same group-committed transactions as ingestion
+    writes (see `WriteQueue`); a burst of events is one write. Followers (the other
+    workers, or another server on the same database) tail the table with `follow`
+    and publish what they read under the same IDs, so a client's `Last-Event-ID`
+    means the same thing on whichever worker it reconnects to. Only the newest
+    `retain` rows are kept.
+    """
+
+    def __init__(self, db: Database, bus: EventBus, retain: int = 1000) -> None:
+        self._db = db
+        self._bus = bus
+        self._retain = retain
+        self.stored = 0
+        self.followed = 0
+
+    async def start(self, on_event: Callable[[str, dict[str, Any]], None] | None = None) -> None:
+        """Position the bus at the end of the log, replaying only the latest `ingest_progress` to `on_event`."""
+        async with self._db.reader() as conn:
+            cursor = await conn.execute("SELECT MAX(id) AS last_id FROM event_log")
+            row = await cursor.fetchone()
+            cursor = await conn.execute(
+                "SELECT data FROM event_log WHERE event = 'ingest_progress' ORDER BY id DESC LIMIT 1"
+            )
+            progress = await cursor.fetchone()
+        # An empty log starts at 0, so the leader's first (wall-clock) ID is never skipped
+        self._bus.seek((row["last_id"] if row is not None else None) or 0)
+        if progress is not None and on_event is not None:
+            on_event("ingest_progress", json.loads(progress["data"]))
+
+    async def store(self, events: list[EventRecord]) -> list[int]:
+        """Append events in one write-queue job and return their IDs once committed (leader only)."""
+        db = self._db
+
+        async def write() -> list[int]:
+            # The first ID is taken from the wall clock, like EventBus's own IDs
+            cursor = await db.writer.execute(
+                "SELECT COALESCE(MAX(id) + 1, ?) AS next_id FROM event_log", (time.time_ns() // 1_000_000,)
+            )
+            row = await cursor.fetchone()
+            assert row is not None  # An aggregate always yields a row
+            first: int = row["next_id"]
+            event_ids = list(range(first, first + len(events)))
+            await db.writer.executemany(
+                "INSERT INTO event_log (id, event, data, conflate) VALUES (?, ?, ?, ?)",
+                [
+                    (event_id, event.event, json.dumps(event.data), int(event.conflate))
+                    for event_id, event in zip(event_ids, events, strict=True)
+                ],
+            )
+            if event_ids[-1] // 100 != (first - 1) // 100:
+                # Keep the latest ingest_progress so late-starting followers know whether ingestion finished
+                await db.writer.execute(
+                    """DELETE FROM event_log WHERE id <= ?
+                         AND id IS NOT (SELECT MAX(id) FROM event_log WHERE event = 'ingest_progress')""",
+                    (event_ids[-1] - self._retain,),
+                )
+            return event_ids
+
+        event_ids = await db.writes.submit(write, len(events))
+        self.stored += len(events)
+        return event_ids
+
+    async def follow(self, on_event: Callable[[str, dict[str, Any]], None] | None = None) -> int:
+        """Publish events stored since the bus's last ID (follower only); returns how many."""
+        async with self._db.reader() as conn:
+            cursor = await conn.execute(
+                "SELECT id, event, data, conflate FROM event_log WHERE id > ? ORDER BY id LIMIT ?",
+                (self._bus.last_id, FOLLOW_BATCH),
+            )
+            rows = list(await cursor.fetchall())
+        for row in rows:
+            data = json.loads(row["data"])
+            if on_event is not None:
+                on_event(row["event"], data)
+            self._bus.deliver(row["id"], row["event"], data, conflate=bool(row["conflate"]))
+        self.followed += len(rows)
+        return len(rows)
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Events stored (as leader) and read back (as follower) by this worker."""
+        return {"stored": self.stored, "followed": self.followed, "last_event_id": self._bus.last_id}
@@ -3,19 +3,48 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import Literal
 
 import yaml
 from pydantic import BaseModel, Field
 
+from mimir_api.discovery import DEFAULT_IGNORE
+
 
 class MimirConfig(BaseModel):
     """Configuration loaded from mimir.yaml."""
 
     watch_paths: list[Path] = Field(default_factory=list)
     max_depth: int = 3
-    poll_interval_seconds: int = 30
+    discovery_ignore: list[str] = Field(default_factory=lambda: list(DEFAULT_IGNORE))
+    discovery_workers: int = 8
+    watch_mode: Literal["auto", "native", "poll"] = "auto"
+    poll_interval_seconds: float = 30
+    poll_workers: int = 4
+    ingest_debounce_seconds: float = 0.5
+    max_concurrent_ingests: int = 4
+    parse_executor: Literal["thread", "process"] = "thread"
+    parse_workers: int = 4
     api_port: int = 8400
+    api_workers: int = 1
+    leader_poll_seconds: float = 0.25
     db_path: Path = Path("./mimir.db")
+    db_readers: int = 4
+    db_synchronous: Literal["OFF", "NORMAL", "FULL", "EXTRA"] = "NORMAL"
+    db_cache_size: int = -64000
+    db_mmap_size: int = 268435456
+    db_busy_timeout_ms: int = 5000
+    db_write_batch_rows: int = 5000
+    db_write_batch_delay_ms: float = 50
+    response_cache_entries: int = 256
+    agents_dir: Path = Path("~/.mimir/agents")
+    agent_ttl_seconds: float = 30
+    agent_scan_seconds: float = 2
+    max_agents: int = 1000
+    agent_heartbeat_token: str | None = None
+    sse_replay_events: int = 1000
+    sse_replay_bytes: int = 1_048_576
+    sse_ping_seconds: int = 15
     next_port: int = 3400
 
 
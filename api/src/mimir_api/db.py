@@ -2,11 +2,20 @@
 
 from __future__ import annotations
 
+import asyncio
+import sqlite3
+from contextlib import asynccontextmanager
 from typing import TYPE_CHECKING
 
 import aiosqlite
 
+from mimir_api.boardview import TASK_COLUMNS, BoardView
+from mimir_api.cache import Generations
+from mimir_api.rollups import ACTIVITY_ROLLUP, BURNDOWN_SNAPSHOT
+from mimir_api.writequeue import WriteQueue
+
 if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
     from pathlib import Path
 
 SCHEMA = """
@@ -22,6 +31,7 @@ CREATE TABLE IF NOT EXISTS projects (
 );
 
 CREATE TABLE IF NOT EXISTS tasks (
+    seq           INTEGER PRIMARY KEY,  -- Keys tasks_fts: an alias for the rowid, so VACUUM keeps it
     id            TEXT NOT NULL,
     project_id    TEXT NOT NULL REFERENCES projects(id),
     story_id      TEXT,
@@ -34,7 +44,7 @@ CREATE TABLE IF NOT EXISTS tasks (
     assigned_agent TEXT,
     priority      INTEGER DEFAULT 2,
     updated_at    TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    PRIMARY KEY (project_id, id)
+    UNIQUE (project_id, id)
 );
 
 CREATE TABLE IF NOT EXISTS activity (
@@ -48,37 +58,294 @@ CREATE TABLE IF NOT EXISTS activity (
     timestamp     TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
 );
 
-CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status);
-CREATE INDEX IF NOT EXISTS idx_tasks_project ON tasks(project_id);
-CREATE INDEX IF NOT EXISTS idx_activity_project ON activity(project_id);
-CREATE INDEX IF NOT EXISTS idx_activity_timestamp ON activity(timestamp DESC);
+CREATE TABLE IF NOT EXISTS progress_cursors (
+    project_id    TEXT PRIMARY KEY REFERENCES projects(id),
+    byte_offset   INTEGER NOT NULL DEFAULT 0,
+    inode         INTEGER,
+    tail_hash     TEXT NOT NULL DEFAULT '',
+    updated_at    TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS file_fingerprints (
+    path          TEXT PRIMARY KEY,
+    project_id    TEXT NOT NULL,
+    mtime_ns      INTEGER NOT NULL,
+    size          INTEGER NOT NULL,
+    content_hash  TEXT,
+    updated_at    TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS discovery_dirs (
+    path          TEXT PRIMARY KEY,
+    mtime_ns      INTEGER NOT NULL,
+    is_project    INTEGER NOT NULL DEFAULT 0,
+    children      TEXT NOT NULL DEFAULT '[]'
+);
+
+-- SSE events written by the leader worker and tailed by the others (see cluster.EventLog)
+CREATE TABLE IF NOT EXISTS event_log (
+    id            INTEGER PRIMARY KEY,
+    event         TEXT NOT NULL,
+    data          TEXT NOT NULL,
+    conflate      INTEGER NOT NULL DEFAULT 1,
+    created_at    TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Board columns in board order, across projects and within one; they cover the single-column indexes they replaced
+DROP INDEX IF EXISTS idx_tasks_status;
+DROP INDEX IF EXISTS idx_tasks_project;
+CREATE INDEX IF NOT EXISTS idx_tasks_board ON tasks(status, priority, updated_at DESC, project_id, id);
+CREATE INDEX IF NOT EXISTS idx_tasks_project_board ON tasks(project_id, status, priority, updated_at DESC, id);
+-- Activity is paged by (timestamp, id); id is the rowid, which every index carries as its last column
+-- idx_activity_timestamp used to be on (timestamp DESC), which can't serve that order; connect() rebuilds an old one
+DROP INDEX IF EXISTS idx_activity_project;
+CREATE INDEX IF NOT EXISTS idx_activity_timestamp ON activity(timestamp);
+CREATE INDEX IF NOT EXISTS idx_activity_project_ts ON activity(project_id, timestamp);
+CREATE INDEX IF NOT EXISTS idx_activity_agent_ts ON activity(agent_name, timestamp);
+CREATE INDEX IF NOT EXISTS idx_activity_story_ts ON activity(story_id, timestamp);
+CREATE INDEX IF NOT EXISTS idx_activity_event_ts ON activity(event_type, timestamp);
+
+-- Full-text search: external-content FTS5 indexes over activity and tasks, kept in
+-- sync by triggers, so ingestion maintains them incrementally in its own transactions
+CREATE VIRTUAL TABLE IF NOT EXISTS activity_fts USING fts5(
+    summary, metadata, content='activity', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS activity_fts_insert AFTER INSERT ON activity BEGIN
+    INSERT INTO activity_fts (rowid, summary, metadata) VALUES (new.id, new.summary, new.metadata);
+END;
+CREATE TRIGGER IF NOT EXISTS activity_fts_delete AFTER DELETE ON activity BEGIN
+    INSERT INTO activity_fts (activity_fts, rowid, summary, metadata)
+    VALUES ('delete', old.id, old.summary, old.metadata);
+END;
+CREATE TRIGGER IF NOT EXISTS activity_fts_update AFTER UPDATE OF summary, metadata ON activity BEGIN
+    INSERT INTO activity_fts (activity_fts, rowid, summary, metadata)
+    VALUES ('delete', old.id, old.summary, old.metadata);
+    INSERT INTO activity_fts (rowid, summary, metadata) VALUES (new.id, new.summary, new.metadata);
+END;
+
+CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+    title, description, content='tasks', content_rowid='seq', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN
+    INSERT INTO tasks_fts (rowid, title, description) VALUES (new.seq, new.title, new.description);
+END;
+CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN
+    INSERT INTO tasks_fts (tasks_fts, rowid, title, description)
+    VALUES ('delete', old.seq, old.title, old.description);
+END;
+-- Re-index only when the text changed, not on every status move
+CREATE TRIGGER IF NOT EXISTS tasks_fts_update AFTER UPDATE OF title, description ON tasks
+WHEN old.title IS NOT new.title OR old.description IS NOT new.description BEGIN
+    INSERT INTO tasks_fts (tasks_fts, rowid, title, description)
+    VALUES ('delete', old.seq, old.title, old.description);
+    INSERT INTO tasks_fts (rowid, title, description) VALUES (new.seq, new.title, new.description);
+END;
+
+-- Analytics rollups, maintained by ingestion (see rollups.py); buckets are UTC hours 'YYYY-MM-DDTHH'
+CREATE TABLE IF NOT EXISTS activity_rollup (
+    project_id    TEXT NOT NULL,
+    bucket        TEXT NOT NULL,
+    agent_name    TEXT NOT NULL,
+    event_type    TEXT NOT NULL,
+    events        INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (project_id, bucket, agent_name, event_type)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_activity_rollup_bucket ON activity_rollup(bucket);
+
+CREATE TABLE IF NOT EXISTS task_transitions (
+    id            INTEGER PRIMARY KEY,
+    project_id    TEXT NOT NULL,
+    task_id       TEXT NOT NULL,
+    story_id      TEXT,
+    from_status   TEXT,
+    to_status     TEXT,
+    agent_name    TEXT,
+    at            TIMESTAMP NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_task_transitions_task ON task_transitions(project_id, task_id);
+
+CREATE TABLE IF NOT EXISTS transition_rollup (
+    project_id    TEXT NOT NULL,
+    bucket        TEXT NOT NULL,
+    agent_name    TEXT NOT NULL,
+    to_status     TEXT NOT NULL,
+    transitions   INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (project_id, bucket, agent_name, to_status)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_transition_rollup_bucket ON transition_rollup(bucket);
+
+CREATE TABLE IF NOT EXISTS story_cycles (
+    project_id    TEXT NOT NULL,
+    story_id      TEXT NOT NULL,
+    started_at    TIMESTAMP,
+    finished_at   TIMESTAMP,
+    PRIMARY KEY (project_id, story_id)
+);
+CREATE INDEX IF NOT EXISTS idx_story_cycles_finished ON story_cycles(finished_at);
+
+CREATE TABLE IF NOT EXISTS burndown (
+    project_id    TEXT NOT NULL,
+    day           TEXT NOT NULL,
+    tasks_total   INTEGER NOT NULL,
+    tasks_done    INTEGER NOT NULL,
+    stories_total INTEGER NOT NULL,
+    stories_done  INTEGER NOT NULL,
+    PRIMARY KEY (project_id, day)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_burndown_day ON burndown(day);
+"""
+
+# Set aside a tasks table from before `seq`, so SCHEMA creates the new one (rows are copied over in connect());
+# tasks_fts and the triggers go too, as they are keyed on the old implicit rowids
+UNKEYED_TASKS = """DROP TRIGGER IF EXISTS tasks_fts_insert;
+DROP TRIGGER IF EXISTS tasks_fts_delete;
+DROP TRIGGER IF EXISTS tasks_fts_update;
+DROP TABLE IF EXISTS tasks_fts;
+DROP INDEX IF EXISTS idx_tasks_board;
+DROP INDEX IF EXISTS idx_tasks_project_board;
+ALTER TABLE tasks RENAME TO tasks_unkeyed;
 """
 
+# Derived tables and how to fill them from existing rows, run once when the table is first created
+BACKFILL = {
+    "activity_fts": "INSERT INTO activity_fts (activity_fts) VALUES ('rebuild')",
+    "tasks_fts": "INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild')",
+    "activity_rollup": ACTIVITY_ROLLUP.format(where="true"),
+    "burndown": BURNDOWN_SNAPSHOT.format(day="date('now')", where="true"),
+}
+
+
+def _statements(script: str) -> list[str]:
+    """Split a SQL script into its statements (a trigger body holds `;`s of its own)."""
+    statements: list[str] = []
+    current = ""
+    for line in script.splitlines(keepends=True):
+        current += line
+        if sqlite3.complete_statement(current):
+            statements.append(current.strip())
+            current = ""
+    return statements
+
 
 class Database:
-    """Async SQLite database wrapper."""
+    """Async SQLite database: one writer connection plus a pool of read-only readers.
 
-    def __init__(self, db_path: Path) -> None:
+    The database runs in WAL mode, so readers see the last committed state and never
+    wait on an ingestion transaction held by the writer. Ingestion writes go through
+    `writes`, which group-commits them (see `WriteQueue`). `board` serves
+    `/api/board` from memory (see `BoardView`).
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        *,
+        readers: int = 4,
+        synchronous: str = "NORMAL",
+        cache_size: int = -64000,
+        mmap_size: int = 268435456,
+        busy_timeout_ms: int = 5000,
+        write_batch_rows: int = 5000,
+        write_batch_delay_ms: float = 50,
+    ) -> None:
         self.db_path = db_path
-        self._db: aiosqlite.Connection | None = None
+        self._reader_count = readers
+        self._pragmas = {
+            "synchronous": synchronous,
+            "cache_size": cache_size,
+            "mmap_size": mmap_size,
+            "busy_timeout": busy_timeout_ms,
+        }
+        self._writer: aiosqlite.Connection | None = None
+        self._readers: asyncio.Queue[aiosqlite.Connection] = asyncio.Queue()
+        self._all_readers: list[aiosqlite.Connection] = []
+        # Serializes ingestion transactions that share the writer connection
+        self.write_lock = asyncio.Lock()
+        # Per-project data generations, bumped after each committed change; keys the response cache
+        self.generations = Generations()
+        self.writes = WriteQueue(self, max_rows=write_batch_rows, max_delay=write_batch_delay_ms / 1000)
+        # The board, materialized in memory and kept current per project
+        self.board = BoardView(self)
 
     async def connect(self) -> None:
-        """Open connection and initialize schema."""
-        self._db = await aiosqlite.connect(self.db_path)
-        self._db.row_factory = aiosqlite.Row
-        await self._db.executescript(SCHEMA)
-        await self._db.commit()
+        """Open the writer, initialize schema, then open the reader pool."""
+        self._writer = await self._open(self.db_path)
+        await self._writer.execute("PRAGMA journal_mode=WAL")
+        # Workers started together all run this: whichever takes the write lock first creates and
+        # backfills, the others wait on it and then find the tables already there
+        await self._writer.execute("BEGIN IMMEDIATE")
+        try:
+            cursor = await self._writer.execute(
+                f"SELECT name FROM sqlite_master WHERE name IN ({', '.join('?' * len(BACKFILL))})", list(BACKFILL)
+            )
+            existing = {row["name"] for row in await cursor.fetchall()}
+            cursor = await self._writer.execute("SELECT sql FROM sqlite_master WHERE name = 'idx_activity_timestamp'")
+            row = await cursor.fetchone()
+            if row is not None and "DESC" in row["sql"]:
+                await self._writer.execute("DROP INDEX idx_activity_timestamp")
+            cursor = await self._writer.execute("SELECT name FROM pragma_table_info('tasks')")
+            task_columns = {row["name"] for row in await cursor.fetchall()}
+            rekey = bool(task_columns) and "seq" not in task_columns
+            # Statement by statement: executescript() would commit the transaction first
+            statements = _statements(SCHEMA)
+            if rekey:
+                statements = _statements(UNKEYED_TASKS) + statements
+            for statement in statements:
+                await self._writer.execute(statement)
+            if rekey:
+                # The triggers index the copied rows into the new tasks_fts
+                columns = ", ".join(TASK_COLUMNS)
+                await self._writer.execute(f"INSERT INTO tasks ({columns}) SELECT {columns} FROM tasks_unkeyed")
+                await self._writer.execute("DROP TABLE tasks_unkeyed")
+            for table, backfill in BACKFILL.items():
+                if table not in existing:
+                    await self._writer.execute(backfill)
+        except BaseException:
+            await self._writer.rollback()
+            raise
+        await self._writer.commit()
+
+        for _ in range(self._reader_count):
+            reader = await self._open(f"file:{self.db_path}?mode=ro", uri=True)
+            await reader.execute("PRAGMA query_only=ON")
+            self._all_readers.append(reader)
+            self._readers.put_nowait(reader)
+        self.writes.start()
+
+    async def _open(self, database: str | Path, *, uri: bool = False) -> aiosqlite.Connection:
+        conn = await aiosqlite.connect(database, uri=uri)
+        conn.row_factory = aiosqlite.Row
+        for name, value in self._pragmas.items():
+            await conn.execute(f"PRAGMA {name}={value}")
+        return conn
 
     async def close(self) -> None:
-        """Close the database connection."""
-        if self._db:
-            await self._db.close()
-            self._db = None
+        """Commit queued writes, then close the reader pool and the writer connection."""
+        await self.writes.close()
+        for reader in self._all_readers:
+            await reader.close()
+        self._all_readers.clear()
+        self._readers = asyncio.Queue()
+        if self._writer:
+            await self._writer.close()
+            self._writer = None
 
     @property
-    def conn(self) -> aiosqlite.Connection:
-        """Get the active connection, raising if not connected."""
-        if self._db is None:
+    def writer(self) -> aiosqlite.Connection:
+        """Get the writer connection (ingestion only), raising if not connected."""
+        if self._writer is None:
+            msg = "Database not connected. Call connect() first."
+            raise RuntimeError(msg)
+        return self._writer
+
+    @asynccontextmanager
+    async def reader(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Borrow a read-only connection from the pool for the duration of the block."""
+        if self._writer is None:
             msg = "Database not connected. Call connect() first."
             raise RuntimeError(msg)
-        return self._db
+        conn = await self._readers.get()
+        try:
+            yield conn
+        finally:
+            self._readers.put_nowait(conn)
@@ -2,24 +2,34 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Annotated
 
-if TYPE_CHECKING:
-    from mimir_api.db import Database
-
-# Module-level singleton, set during app lifespan
-_db: Database | None = None
+import aiosqlite
+from fastapi import Depends, Request
 
+from mimir_api.db import Database
 
-def set_db(db: Database) -> None:
-    """Set the global database instance (called during app startup)."""
-    global _db  # noqa: PLW0603
-    _db = db
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
 
 
-def get_db() -> Database:
-    """Get the global database instance."""
-    if _db is None:
+def get_database(request: Request) -> Database:
+    """Get the database instance attached to the app during lifespan startup."""
+    db: Database | None = getattr(request.app.state, "db", None)
+    if db is None:
         msg = "Database not initialized. App not started?"
         raise RuntimeError(msg)
-    return _db
+    return db
+
+
+async def get_reader(request: Request) -> AsyncIterator[aiosqlite.Connection]:
+    """Borrow a read-only connection from the pool for one request."""
+    async with get_database(request).reader() as conn:
+        yield conn
+
+
+# Route parameter type for a pooled read-only connection
+Reader = Annotated[aiosqlite.Connection, Depends(get_reader)]
+
+# Route parameter type for the database itself, for routes that only borrow a reader when needed
+Db = Annotated[Database, Depends(get_database)]
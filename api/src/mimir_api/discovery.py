@@ -0,0 +1,234 @@
+"""Project discovery: find Ullr projects (directories containing ullr.yaml) under watch paths."""
+
+from __future__ import annotations
+
+import asyncio
+import fnmatch
+import json
+import logging
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from pathlib import Path
+
+    from mimir_api.db import Database
+
+logger = logging.getLogger(__name__)
+
+# Directory names never descended into, in addition to hidden directories
+DEFAULT_IGNORE = ("node_modules", "__pycache__", "venv", "dist", "build", "target")
+
+
+class CachedDir(NamedTuple):
+    """What a directory looked like the last time it was listed."""
+
+    mtime_ns: int
+    is_project: bool
+    children: tuple[str, ...]
+
+
+class Discovery(NamedTuple):
+    """Projects found by a scan, plus every other directory it looked in."""
+
+    projects: list[dict[str, str]]
+    dirs: list[str]
+
+
+class _ScanResult(NamedTuple):
+    projects: list[str]
+    dirs: dict[str, CachedDir]
+    listed: int
+
+
+async def discover(
+    watch_paths: list[Path],
+    max_depth: int = 3,
+    *,
+    db: Database | None = None,
+    ignore: Iterable[str] = DEFAULT_IGNORE,
+    workers: int = 8,
+) -> Discovery:
+    """Find all directories containing ullr.yaml, and the directories searched for them.
+
+    Each watch path is listed with `os.scandir`, and its subtrees are scanned in a
+    thread pool so the event loop stays free. When `db` is given, the set of scanned
+    directories is persisted in `discovery_dirs`; on later scans a directory whose
+    mtime has not changed reuses its cached listing instead of being read again.
+
+    The non-project directories in the result are where a new project could appear;
+    the watcher keeps shallow watches on them.
+    """
+    cache = await _load_cache(db) if db is not None else {}
+    ignored = _compile_ignore(ignore)
+    loop = asyncio.get_running_loop()
+
+    dirs: dict[str, CachedDir] = {}
+    found: list[str] = []
+    visited = listed = 0
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mimir-discovery") as pool:
+        for watch_path in watch_paths:
+            root = str(watch_path)
+            # List the root on its own, then fan its subtrees out across the pool
+            top = await loop.run_in_executor(pool, _scan_tree, root, 0, 0, ignored, cache)
+            dirs.update(top.dirs)
+            found.extend(top.projects)
+            visited += len(top.dirs)
+            listed += top.listed
+            entry = top.dirs.get(root)
+            if entry is None or entry.is_project or max_depth < 1:
+                continue
+            subtrees = await asyncio.gather(
+                *(
+                    loop.run_in_executor(pool, _scan_tree, os.path.join(root, name), 1, max_depth, ignored, cache)
+                    for name in _descend(entry, ignored)
+                )
+            )
+            for result in subtrees:
+                dirs.update(result.dirs)
+                found.extend(result.projects)
+                visited += len(result.dirs)
+                listed += result.listed
+
+    projects: list[dict[str, str]] = []
+    seen: set[str] = set()
+    for path in found:
+        resolved = os.path.realpath(path)
+        if resolved in seen:
+            continue
+        seen.add(resolved)
+        projects.append({"path": path, "config_path": os.path.join(path, "ullr.yaml")})
+
+    if db is not None:
+        await _save_cache(db, cache, dirs)
+    logger.info(
+        "Discovered %d projects in %d directories (%d listed, %d reused from cache)",
+        len(projects),
+        len(dirs),
+        listed,
+        visited - listed,
+    )
+    return Discovery(projects, [path for path, entry in dirs.items() if not entry.is_project])
+
+
+def scan_directory(root: str, depth: int, max_depth: int, ignore: Iterable[str]) -> tuple[list[str], list[str]]:
+    """Synchronously scan a newly created directory: (project directories, other directories).
+
+    `depth` is the directory's depth below its watch path. A hidden or ignored
+    directory yields nothing, as it would not have been descended into.
+    """
+    ignored = _compile_ignore(ignore)
+    name = os.path.basename(root)
+    if name.startswith(".") or (ignored is not None and ignored.match(name)):
+        return [], []
+    result = _scan_tree(root, depth, max_depth, ignored, {})
+    return result.projects, [path for path, entry in result.dirs.items() if not entry.is_project]
+
+
+def _compile_ignore(patterns: Iterable[str]) -> re.Pattern[str] | None:
+    """Combine ignore globs into one regex matched against directory names."""
+    translated = [fnmatch.translate(pattern) for pattern in patterns]
+    return re.compile("|".join(translated)) if translated else None
+
+
+def _scan_tree(
+    root: str,
+    depth: int,
+    max_depth: int,
+    ignored: re.Pattern[str] | None,
+    cache: dict[str, CachedDir],
+) -> _ScanResult:
+    """Depth-first scan of one subtree for ullr.yaml, reusing cached listings.
+
+    Runs in a worker thread. Each directory costs one stat; it is only listed when
+    its mtime differs from the cache. Entry types come from the directory listing
+    (`d_type`), so files and subdirectories are told apart without extra stats.
+    Ullr projects are not descended into. Listings are cached before `ignored` is
+    applied, so a changed ignore list takes effect without re-listing anything.
+    """
+    projects: list[str] = []
+    dirs: dict[str, CachedDir] = {}
+    listed = 0
+    stack = [(root, depth)]
+
+    while stack:
+        path, current_depth = stack.pop()
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            continue
+
+        entry = cache.get(path)
+        if entry is None or entry.mtime_ns != mtime_ns:
+            try:
+                entry = _list_directory(path, mtime_ns)
+            except OSError:
+                continue
+            listed += 1
+        dirs[path] = entry
+
+        if entry.is_project:
+            projects.append(path)
+            continue
+        if current_depth < max_depth:
+            children = _descend(entry, ignored)
+            stack.extend((os.path.join(path, name), current_depth + 1) for name in reversed(children))
+
+    return _ScanResult(projects, dirs, listed)
+
+
+def _descend(entry: CachedDir, ignored: re.Pattern[str] | None) -> list[str]:
+    """A listed directory's children that are not ignored."""
+    return [name for name in entry.children if ignored is None or not ignored.match(name)]
+
+
+def _list_directory(path: str, mtime_ns: int) -> CachedDir:
+    """List a directory once, noting whether it holds ullr.yaml and its non-hidden subdirectories."""
+    is_project = False
+    children: list[str] = []
+    with os.scandir(path) as entries:
+        for child in entries:
+            name = child.name
+            if name == "ullr.yaml":
+                is_project = is_project or child.is_file()
+            elif not name.startswith(".") and child.is_dir():
+                children.append(name)
+    return CachedDir(mtime_ns, is_project, tuple(sorted(children)))
+
+
+async def _load_cache(db: Database) -> dict[str, CachedDir]:
+    """Read the persisted directory listings from the previous scan."""
+    async with db.reader() as conn:
+        cursor = await conn.execute("SELECT path, mtime_ns, is_project, children FROM discovery_dirs")
+        rows = await cursor.fetchall()
+    return {
+        row["path"]: CachedDir(row["mtime_ns"], bool(row["is_project"]), tuple(json.loads(row["children"])))
+        for row in rows
+    }
+
+
+async def _save_cache(db: Database, previous: dict[str, CachedDir], current: dict[str, CachedDir]) -> None:
+    """Write changed listings and drop directories that were not reached this scan."""
+    changed = [
+        (path, entry.mtime_ns, int(entry.is_project), json.dumps(entry.children))
+        for path, entry in current.items()
+        if previous.get(path) != entry
+    ]
+    stale = [(path,) for path in previous.keys() - current.keys()]
+    if not changed and not stale:
+        return
+
+    async def write() -> None:
+        await db.writer.executemany(
+            """INSERT INTO discovery_dirs (path, mtime_ns, is_project, children)
+               VALUES (?, ?, ?, ?)
+               ON CONFLICT(path) DO UPDATE SET
+                 mtime_ns=excluded.mtime_ns, is_project=excluded.is_project, children=excluded.children""",
+            changed,
+        )
+        await db.writer.executemany("DELETE FROM discovery_dirs WHERE path = ?", stale)
+
+    await db.writes.submit(write, rows=len(changed) + len(stale))
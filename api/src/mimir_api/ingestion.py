@@ -1,221 +1,883 @@
-"""Project discovery and data ingestion from Ullr project files."""
+"""Data ingestion from Ullr project files."""
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import json
+import logging
+import multiprocessing
 import re
+import time
+from collections import Counter
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, BinaryIO, NamedTuple
+from weakref import WeakValueDictionary
+
+from mimir_api.discovery import DEFAULT_IGNORE, discover
+from mimir_api.jsonstream import JsonStream
+from mimir_api.rollups import Transition, record_activity, record_transitions, snapshot_burndown
 
 if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Iterable
+
+    import aiosqlite
+
     from mimir_api.db import Database
+    from mimir_api.discovery import Discovery
 
+logger = logging.getLogger(__name__)
 
-async def discover_projects(watch_paths: list[Path], max_depth: int = 3) -> list[dict[str, str]]:
-    """Find all directories containing ullr.yaml.
+# Files read from each Ullr project root
+PROJECT_FILES = ("ullr.yaml", "taskboard.json", "prd.json", "progress.jsonl")
 
-    Returns a list of dicts with 'name', 'path', and config data.
+
+def _slugify(name: str) -> str:
+    """Convert project name to a URL-safe slug."""
+    slug = name.lower().strip()
+    slug = re.sub(r"[^a-z0-9]+", "-", slug)
+    return slug.strip("-")
+
+
+# Above this many changed task or activity rows, clients are told to refetch instead
+# of being sent every row as a delta
+DELTA_LIMIT = 200
+
+
+@dataclass
+class ProjectChanges:
+    """What one ingest changed in the database, published to clients as SSE deltas.
+
+    Tasks and activity rows are shaped like the `/api/board` and `/api/activity`
+    rows they correspond to. `refetch` is set instead of filling the lists when the
+    project's own row changed or there are more than `DELTA_LIMIT` rows.
     """
-    projects: list[dict[str, str]] = []
-    seen: set[Path] = set()
 
-    for watch_path in watch_paths:
-        if not watch_path.exists():
-            continue
-        _scan_directory(watch_path, max_depth, 0, projects, seen)
+    tasks_added: list[dict[str, Any]] = field(default_factory=list)
+    tasks_moved: list[dict[str, Any]] = field(default_factory=list)
+    tasks_edited: list[dict[str, Any]] = field(default_factory=list)
+    tasks_removed: list[str] = field(default_factory=list)
+    activity: list[dict[str, Any]] = field(default_factory=list)
+    story_counts: tuple[int, int] | None = None
+    refetch: bool = False
 
-    return projects
+    @property
+    def has_task_changes(self) -> bool:
+        return bool(self.tasks_added or self.tasks_moved or self.tasks_edited or self.tasks_removed)
 
+    @property
+    def is_empty(self) -> bool:
+        """Whether the ingest changed nothing clients can see (the files read held the data already stored)."""
+        return self == ProjectChanges()
 
-def _scan_directory(
-    directory: Path,
-    max_depth: int,
-    current_depth: int,
-    results: list[dict[str, str]],
-    seen: set[Path],
-) -> None:
-    """Recursively scan for ullr.yaml files."""
-    if current_depth > max_depth:
-        return
 
-    resolved = directory.resolve()
-    if resolved in seen:
-        return
-    seen.add(resolved)
-
-    config_file = directory / "ullr.yaml"
-    if config_file.exists():
-        results.append(
-            {
-                "path": str(directory),
-                "config_path": str(config_file),
-            }
-        )
-        return  # Don't recurse into Ullr projects
+@dataclass
+class IngestResult:
+    """Outcome of ingesting one project: which files were re-read versus skipped, and what changed."""
 
-    try:
-        for child in sorted(directory.iterdir()):
-            if child.is_dir() and not child.name.startswith("."):
-                _scan_directory(child, max_depth, current_depth + 1, results, seen)
-    except PermissionError:
-        pass
+    project_id: str | None = None
+    files_read: int = 0
+    files_skipped: int = 0
+    changes: ProjectChanges = field(default_factory=ProjectChanges)
 
 
-def _slugify(name: str) -> str:
-    """Convert project name to a URL-safe slug."""
-    slug = name.lower().strip()
-    slug = re.sub(r"[^a-z0-9]+", "-", slug)
-    return slug.strip("-")
+class _Fingerprint(NamedTuple):
+    """A watched file's fingerprint as stored in `file_fingerprints`."""
 
+    project_id: str
+    mtime_ns: int
+    size: int
+    content_hash: str | None
 
-async def ingest_project(db: Database, project_path: Path) -> None:
-    """Read a single Ullr project's files and upsert into the database."""
-    config_path = project_path / "ullr.yaml"
-    if not config_path.exists():
-        return
 
-    # Read project config for name/description
-    import yaml
+class _FileCheck(NamedTuple):
+    """A watched file's current fingerprint compared against the stored one."""
 
-    with open(config_path) as f:
-        config = yaml.safe_load(f) or {}
+    path: str
+    mtime_ns: int
+    size: int
+    content_hash: str | None
+    changed: bool
+    record: bool
 
-    project_name = config.get("project", project_path.name)
-    project_id = _slugify(project_name)
-    branch_name = config.get("branch_prefix", "")
-    description = config.get("description", "")
 
-    # Upsert project
-    await db.conn.execute(
-        """INSERT INTO projects (id, name, path, branch_name, description, last_synced)
-           VALUES (?, ?, ?, ?, ?, ?)
-           ON CONFLICT(id) DO UPDATE SET
-             name=excluded.name, path=excluded.path, branch_name=excluded.branch_name,
-             description=excluded.description, last_synced=excluded.last_synced""",
-        (project_id, project_name, str(project_path), branch_name, description, _now()),
+class ProgressCursor(NamedTuple):
+    """How far progress.jsonl has been read: byte offset, the inode seen then, and a hash of the bytes before it."""
+
+    byte_offset: int
+    inode: int
+    tail_hash: str
+
+
+@dataclass
+class ParsedProject:
+    """Everything read from a project's files, ready to be written to SQLite.
+
+    Fields are None when the corresponding file is missing or unchanged.
+    """
+
+    project_id: str
+    project: tuple[str, str, str, str] | None = None  # name, path, branch_name, description
+    tasks: dict[str, tuple[Any, ...]] | None = None
+    story_counts: tuple[int, int] | None = None
+    activity: list[tuple[Any, ...]] | None = None
+    progress_cursor: ProgressCursor | None = None
+    rescan: bool = False
+    checks: list[_FileCheck] = field(default_factory=list)
+
+    @property
+    def row_count(self) -> int:
+        """Roughly how many rows writing this project touches (the project row plus tasks and activity)."""
+        return 1 + len(self.tasks or ()) + len(self.activity or ())
+
+
+# Per-project locks so the same project is never parsed and written by two ingests at once
+_project_locks: WeakValueDictionary[str, asyncio.Lock] = WeakValueDictionary()
+
+
+def make_parse_executor(kind: str = "thread", workers: int = 4) -> Executor:
+    """Create the pool that project files are parsed in ("thread" or "process")."""
+    if kind == "process":
+        return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mimir-parse")
+
+
+async def ingest_project(db: Database, project_path: Path, executor: Executor | None = None) -> IngestResult:
+    """Read a single Ullr project's files and upsert into the database.
+
+    Files whose fingerprint (mtime_ns, size, content hash) matches the manifest in
+    `file_fingerprints` are skipped; only changed files are parsed and written.
+    Reading and parsing run in `executor` (the loop's default executor if None), so
+    only the SQLite writes happen on the event loop. The writes go through
+    `db.writes`, committed together with other projects' writes, and this returns
+    once they have committed.
+    """
+    if not (project_path / "ullr.yaml").exists():
+        return IngestResult()
+
+    lock = _project_locks.get(str(project_path))
+    if lock is None:
+        lock = _project_locks[str(project_path)] = asyncio.Lock()
+
+    async with lock:
+        # Announced before parsing, so a batch being collected waits for this write rather than committing without it
+        with db.writes.preparing() as write:
+            # From a reader: this project's last write has committed (under its lock), and the writer stays free
+            async with db.reader() as conn:
+                known = await _load_fingerprints(conn, project_path)
+                previous = known.get(str(project_path / "ullr.yaml"))
+                progress_cursor = await _load_progress_cursor(conn, previous.project_id) if previous else None
+
+            loop = asyncio.get_running_loop()
+            parsed = await loop.run_in_executor(executor, parse_project, project_path, known, progress_cursor)
+            if parsed is None:
+                return IngestResult()
+
+            changes = await write.submit(lambda: _write_project(db, project_path, parsed), parsed.row_count)
+
+    result = IngestResult(project_id=parsed.project_id, changes=changes)
+    for check in parsed.checks:
+        if check.changed:
+            result.files_read += 1
+        else:
+            result.files_skipped += 1
+    # Re-reading files that hold what is already stored leaves caches and the board valid
+    if not changes.is_empty:
+        db.generations.bump(parsed.project_id)
+        await db.board.refresh(parsed.project_id, parsed.tasks is not None or parsed.project is not None)
+    return result
+
+
+async def _load_fingerprints(conn: aiosqlite.Connection, project_path: Path) -> dict[str, _Fingerprint]:
+    """Fetch stored fingerprints for a project's watched files, keyed by path."""
+    paths = [str(project_path / name) for name in PROJECT_FILES]
+    cursor = await conn.execute(
+        f"""SELECT path, project_id, mtime_ns, size, content_hash FROM file_fingerprints
+            WHERE path IN ({", ".join("?" * len(paths))})""",
+        paths,
     )
+    return {row["path"]: _Fingerprint(*tuple(row)[1:]) for row in await cursor.fetchall()}
 
-    # Ingest taskboard
-    await _ingest_taskboard(db, project_id, project_path)
 
-    # Ingest PRD for story counts
-    await _ingest_prd_counts(db, project_id, project_path)
+async def _load_progress_cursor(conn: aiosqlite.Connection, project_id: str) -> ProgressCursor | None:
+    """Fetch the stored progress.jsonl read cursor for a project."""
+    cursor = await conn.execute(
+        "SELECT byte_offset, inode, tail_hash FROM progress_cursors WHERE project_id = ?",
+        (project_id,),
+    )
+    row = await cursor.fetchone()
+    return ProgressCursor(*row) if row else None
 
-    # Ingest progress as activity
-    await _ingest_progress(db, project_id, project_path)
 
-    await db.conn.commit()
+# -- Parsing (runs in the parse executor; no database access) --
 
 
-async def _ingest_taskboard(db: Database, project_id: str, project_path: Path) -> None:
-    """Read taskboard.json and upsert tasks."""
-    taskboard_path = project_path / "taskboard.json"
-    if not taskboard_path.exists():
-        return
+def parse_project(
+    project_path: Path, known: dict[str, _Fingerprint], progress_cursor: ProgressCursor | None
+) -> ParsedProject | None:
+    """Check a project's files against their fingerprints and parse the ones that changed.
 
-    with open(taskboard_path) as f:
-        board = json.load(f)
-
-    # Clear existing tasks for this project, then re-insert
-    await db.conn.execute("DELETE FROM tasks WHERE project_id = ?", (project_id,))
-
-    for status, column_key in [
-        ("backlog", "backlog"),
-        ("in_progress", "in_progress"),
-        ("done", "done"),
-        ("blocked", "blocked"),
-    ]:
-        tasks = board.get(column_key, [])
-        for task in tasks:
-            await db.conn.execute(
-                """INSERT INTO tasks (id, project_id, story_id, title, description,
-                   status, domain, complexity, blocked_reason, assigned_agent, priority, updated_at)
-                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                (
-                    task.get("id", ""),
-                    project_id,
-                    task.get("story_id", ""),
-                    task.get("title", ""),
-                    task.get("description", ""),
-                    status,
-                    task.get("domain", ""),
-                    task.get("complexity", ""),
-                    task.get("blocked_reason", ""),
-                    task.get("assigned_agent", ""),
-                    task.get("priority", 2),
-                    _now(),
-                ),
-            )
+    `progress_cursor` belongs to the project id recorded for ullr.yaml; it is ignored if
+    the project id has since changed. Returns None if ullr.yaml has disappeared.
+    """
+    config_path = project_path / "ullr.yaml"
+    checked = _check_file(config_path, known, None)
+    if checked is None:
+        return None
+    config_check, content = checked
+
+    if config_check.changed:
+        # Read project config for name/description
+        import yaml
+
+        config = yaml.safe_load(content or b"") or {}
+        project_name = config.get("project", project_path.name)
+        parsed = ParsedProject(project_id=_slugify(project_name))
+        parsed.project = (
+            project_name,
+            str(project_path),
+            config.get("branch_prefix", ""),
+            config.get("description", ""),
+        )
+    else:
+        parsed = ParsedProject(project_id=known[str(config_path)].project_id)
+    parsed.checks.append(config_check)
+    project_id = parsed.project_id
 
+    taskboard_path = project_path / "taskboard.json"
+    checked = _check_file(taskboard_path, known, project_id, stream_large=True)
+    if checked is not None:
+        check, content = checked
+        parsed.checks.append(check)
+        if check.changed:
+            parsed.tasks = _parse_taskboard(content) if content is not None else _stream_taskboard(taskboard_path)
 
-async def _ingest_prd_counts(db: Database, project_id: str, project_path: Path) -> None:
-    """Read prd.json and update story counts on the project."""
     prd_path = project_path / "prd.json"
-    if not prd_path.exists():
-        return
+    checked = _check_file(prd_path, known, project_id, stream_large=True)
+    if checked is not None:
+        check, content = checked
+        parsed.checks.append(check)
+        if check.changed:
+            parsed.story_counts = _parse_prd_counts(content) if content is not None else _stream_prd_counts(prd_path)
+
+    # The read cursor makes hashing the whole progress log unnecessary
+    progress_path = project_path / "progress.jsonl"
+    checked = _check_file(progress_path, known, project_id, hash_content=False)
+    if checked is not None:
+        check, _ = checked
+        parsed.checks.append(check)
+        if check.changed:
+            previous = known.get(str(config_path))
+            if previous is None or previous.project_id != project_id:
+                progress_cursor = None
+            _tail_progress(parsed, progress_path, progress_cursor)
+
+    return parsed
+
+
+def _check_file(
+    path: Path,
+    known: dict[str, _Fingerprint],
+    project_id: str | None,
+    *,
+    hash_content: bool = True,
+    stream_large: bool = False,
+) -> tuple[_FileCheck, bytes | None] | None:
+    """Compare a file against its stored fingerprint, returning None if the file is missing.
+
+    A matching mtime_ns and size short-circuits without reading the file. Otherwise the
+    content is read and hashed, and the file only counts as changed if the hash differs
+    or the file now belongs to a different project. With `hash_content=False` any stat
+    difference counts as a change and the content is not read. With `stream_large=True`
+    a file of at least STREAM_PARSE_BYTES is hashed in chunks rather than read whole,
+    and the caller parses it from disk. The content is returned alongside the check
+    whenever it was read whole.
+    """
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+
+    stored = known.get(str(path))
+    same_project = stored is not None and (project_id is None or stored.project_id == project_id)
+    if stored is not None and same_project and stored.mtime_ns == stat.st_mtime_ns and stored.size == stat.st_size:
+        return _FileCheck(str(path), stat.st_mtime_ns, stat.st_size, stored.content_hash, False, False), None
+    if not hash_content:
+        return _FileCheck(str(path), stat.st_mtime_ns, stat.st_size, None, True, True), None
+
+    content: bytes | None
+    if stream_large and stat.st_size >= STREAM_PARSE_BYTES:
+        with open(path, "rb") as f:
+            content_hash = hashlib.file_digest(f, _content_digest).hexdigest()
+            size = f.tell()
+        content = None
+    else:
+        content = path.read_bytes()
+        content_hash = _content_digest(content).hexdigest()
+        size = len(content)
+    changed = stored is None or not same_project or stored.content_hash != content_hash
+    return _FileCheck(str(path), stat.st_mtime_ns, size, content_hash, changed, True), content
+
+
+def _content_digest(content: bytes = b"") -> hashlib.blake2b:
+    return hashlib.blake2b(content, digest_size=16)
+
+
+# JSON files at least this large are hashed in chunks and parsed incrementally with a
+# JsonStream instead of being read whole; smaller ones are cheaper to json.loads
+STREAM_PARSE_BYTES = 4 * 1024 * 1024
+
+# Taskboard column keys, in the order tasks are read from taskboard.json
+TASK_COLUMNS = ("backlog", "in_progress", "done", "blocked")
+
+# Task columns compared when diffing taskboard.json against stored rows
+_TASK_FIELDS = (
+    "story_id",
+    "title",
+    "description",
+    "status",
+    "domain",
+    "complexity",
+    "blocked_reason",
+    "assigned_agent",
+    "priority",
+)
+
+
+def _parse_taskboard(content: bytes) -> dict[str, tuple[Any, ...]]:
+    """Parse taskboard.json into task id -> (*_TASK_FIELDS, updated_at from the board or None)."""
+    board = json.loads(content)
+
+    tasks: dict[str, tuple[Any, ...]] = {}
+    for status in TASK_COLUMNS:
+        for task in board.get(status, []):
+            tasks[str(task.get("id", ""))] = _task_fields(task, status)
+    return tasks
+
+
+def _stream_taskboard(path: Path) -> dict[str, tuple[Any, ...]]:
+    """Like `_parse_taskboard`, but decodes one task at a time from disk."""
+    tasks: dict[str, tuple[Any, ...]] = {}
+    # A task id listed in two columns resolves to the later column in TASK_COLUMNS, as in _parse_taskboard
+    ranks: dict[str, int] = {}
+    with open(path, "rb") as f:
+        stream = JsonStream(f)
+        for key in stream.members():
+            if key not in TASK_COLUMNS or stream.peek() != "[":
+                stream.skip()
+                continue
+            rank = TASK_COLUMNS.index(key)
+            for task in stream.items():
+                task_id = str(task.get("id", ""))
+                if ranks.get(task_id, -1) <= rank:
+                    tasks[task_id] = _task_fields(task, key)
+                    ranks[task_id] = rank
+    return tasks
+
+
+def _task_fields(task: dict[str, Any], status: str) -> tuple[Any, ...]:
+    """A task's `_TASK_FIELDS` and board `updated_at`, as the tasks columns store them.
+
+    Values are converted to the column types the way SQLite would, so a stored row
+    compares equal to the card it came from and an unchanged card is not re-written.
+    """
+    return (
+        _text(task.get("story_id", "")),
+        _text(task.get("title", "")),
+        _text(task.get("description", "")),
+        status,
+        _text(task.get("domain", "")),
+        _text(task.get("complexity", "")),
+        _text(task.get("blocked_reason", "")),
+        _text(task.get("assigned_agent", "")),
+        _priority(task.get("priority", 2)),
+        task.get("updated_at"),
+    )
+
+
+def _text(value: Any) -> str | None:
+    return None if value is None else str(value)
 
-    with open(prd_path) as f:
-        prd = json.load(f)
+
+def _priority(value: Any) -> int:
+    """A card's priority as an integer; 2, the column default, when it isn't one."""
+    try:
+        return int(value)
+    except (TypeError, ValueError, OverflowError):
+        return 2
+
+
+def _parse_prd_counts(content: bytes) -> tuple[int, int]:
+    """Parse prd.json into (total stories, stories that pass)."""
+    prd = json.loads(content)
 
     stories = prd.get("userStories", [])
     total = len(stories)
     done = sum(1 for s in stories if s.get("passes") is True)
+    return total, done
 
-    await db.conn.execute(
-        "UPDATE projects SET total_stories = ?, done_stories = ? WHERE id = ?",
-        (total, done, project_id),
-    )
+
+def _stream_prd_counts(path: Path) -> tuple[int, int]:
+    """Like `_parse_prd_counts`, but decodes one story at a time from disk."""
+    total = done = 0
+    with open(path, "rb") as f:
+        stream = JsonStream(f)
+        for key in stream.members():
+            if key != "userStories" or stream.peek() != "[":
+                stream.skip()
+                continue
+            # A repeated key replaces the earlier value, as with json.loads
+            total = done = 0
+            for story in stream.items():
+                total += 1
+                done += story.get("passes") is True
+    return total, done
 
 
-async def _ingest_progress(db: Database, project_id: str, project_path: Path) -> None:
-    """Read progress.jsonl and append new activity entries."""
-    progress_path = project_path / "progress.jsonl"
-    if not progress_path.exists():
+# Bytes before the read cursor that are hashed to detect progress.jsonl being rewritten in place
+CURSOR_CHECK_BYTES = 4096
+
+
+def _tail_progress(parsed: ParsedProject, progress_path: Path, progress_cursor: ProgressCursor | None) -> None:
+    """Read progress.jsonl from the read cursor into new activity rows.
+
+    The cursor records the byte offset and inode seen on the previous pass, plus a hash of
+    the `CURSOR_CHECK_BYTES` before the offset, so only newly appended bytes are read. A
+    missing cursor, a changed inode (rotation), a file shorter than the cursor
+    (truncation) or changed bytes before the cursor (truncated and rewritten past it)
+    falls back to a full rescan; the writer then skips entries that are already stored.
+    """
+    try:
+        stat = progress_path.stat()
+    except FileNotFoundError:
         return
 
-    # Get latest known timestamp for this project to avoid duplicates
-    cursor = await db.conn.execute(
-        "SELECT MAX(timestamp) FROM activity WHERE project_id = ?",
+    rescan = (
+        progress_cursor is None or progress_cursor.inode != stat.st_ino or stat.st_size < progress_cursor.byte_offset
+    )
+    offset = 0 if rescan or progress_cursor is None else progress_cursor.byte_offset
+
+    entries: list[dict[str, Any]] = []
+    with open(progress_path, "rb") as f:
+        if not rescan and progress_cursor is not None and _tail_hash(f, offset) != progress_cursor.tail_hash:
+            rescan = True
+            offset = 0
+        if not rescan and stat.st_size == offset:
+            return
+        f.seek(offset)
+        for raw in f:
+            if not raw.endswith(b"\n"):
+                # Trailing line without a newline may still be mid-write; only take it if it parses.
+                entry = _parse_progress_line(raw)
+                if entry is not None:
+                    entries.append(entry)
+                    offset += len(raw)
+                break
+            offset += len(raw)
+            entry = _parse_progress_line(raw)
+            if entry is not None:
+                entries.append(entry)
+        tail_hash = _tail_hash(f, offset)
+
+    parsed.activity = [
+        (
+            parsed.project_id,
+            entry.get("event_type", "progress"),
+            entry.get("story_id", ""),
+            entry.get("agent", ""),
+            entry.get("summary", ""),
+            json.dumps(entry.get("metadata", {})),
+            entry.get("timestamp", ""),
+        )
+        for entry in entries
+    ]
+    parsed.progress_cursor = ProgressCursor(offset, stat.st_ino, tail_hash)
+    parsed.rescan = rescan
+
+
+def _tail_hash(f: BinaryIO, offset: int) -> str:
+    """Hash of the `CURSOR_CHECK_BYTES` of `f` before `offset`."""
+    start = max(0, offset - CURSOR_CHECK_BYTES)
+    f.seek(start)
+    return _content_digest(f.read(offset - start)).hexdigest()
+
+
+def _parse_progress_line(raw: bytes) -> dict[str, Any] | None:
+    """Decode one progress.jsonl line, returning None for blank or malformed lines."""
+    line = raw.strip()
+    if not line:
+        return None
+    try:
+        entry = json.loads(line)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None
+    return entry if isinstance(entry, dict) else None
+
+
+# -- Writing (on the event loop, inside a db.writes batch transaction) --
+
+
+async def _write_project(db: Database, project_path: Path, parsed: ParsedProject) -> ProjectChanges:
+    """Apply a parsed project to the database within the caller's transaction, returning what changed."""
+    project_id = parsed.project_id
+    changes = ProjectChanges()
+
+    if parsed.project is not None:
+        changes.refetch = True
+        # Upsert project
+        await db.writer.execute(
+            """INSERT INTO projects (id, name, path, branch_name, description, last_synced)
+               VALUES (?, ?, ?, ?, ?, ?)
+               ON CONFLICT(id) DO UPDATE SET
+                 name=excluded.name, path=excluded.path, branch_name=excluded.branch_name,
+                 description=excluded.description, last_synced=excluded.last_synced""",
+            (project_id, *parsed.project, _now()),
+        )
+
+    if parsed.tasks is not None:
+        await _write_tasks(db, project_id, parsed.tasks, changes)
+
+    if parsed.story_counts is not None:
+        cursor = await db.writer.execute(
+            "SELECT total_stories, done_stories FROM projects WHERE id = ?",
+            (project_id,),
+        )
+        if tuple(await cursor.fetchone() or ()) != parsed.story_counts:
+            changes.story_counts = parsed.story_counts
+        await db.writer.execute(
+            "UPDATE projects SET total_stories = ?, done_stories = ? WHERE id = ?",
+            (*parsed.story_counts, project_id),
+        )
+
+    if parsed.activity is not None and parsed.progress_cursor is not None:
+        await _write_activity(db, project_id, parsed.activity, parsed.progress_cursor, changes, rescan=parsed.rescan)
+
+    # A burndown point is recorded on days the counts may have moved, not on every re-read
+    if (parsed.tasks is not None or parsed.story_counts is not None) and not changes.is_empty:
+        await snapshot_burndown(db, project_id, _now()[:10])
+
+    await _record_fingerprints(db, project_path, project_id, parsed.checks)
+    return changes
+
+
+async def _write_tasks(
+    db: Database,
+    project_id: str,
+    incoming: dict[str, tuple[Any, ...]],
+    changes: ProjectChanges,
+) -> None:
+    """Apply only the task rows that changed, recording them in `changes`.
+
+    Tasks are diffed against stored rows by (project_id, id). Unchanged rows are left
+    alone so their `updated_at` survives; changed or new rows take the task's own
+    `updated_at` when the board provides one, otherwise the ingestion time. A changed
+    task counts as moved when its status differs, otherwise as edited. Status changes
+    are logged as transitions, except on the project's first taskboard.
+    """
+    cursor = await db.writer.execute(
+        f"SELECT id, {', '.join(_TASK_FIELDS)}, updated_at FROM tasks WHERE project_id = ?",
         (project_id,),
     )
+    stored = {row[0]: tuple(row[1:]) for row in await cursor.fetchall()}
+
+    now = _now()
+    inserts: list[tuple[Any, ...]] = []
+    updates: list[tuple[Any, ...]] = []
+    for task_id, (*fields, updated_at) in incoming.items():
+        previous = stored.get(task_id)
+        if previous is None:
+            inserts.append((task_id, project_id, *fields, updated_at or now))
+        elif tuple(fields) != previous[:-1] or (updated_at and updated_at != previous[-1]):
+            updates.append((*fields, updated_at or now, project_id, task_id))
+    deletes = [(project_id, task_id) for task_id in stored.keys() - incoming.keys()]
+
+    if deletes:
+        await db.writer.executemany("DELETE FROM tasks WHERE project_id = ? AND id = ?", deletes)
+    if inserts:
+        await db.writer.executemany(
+            f"""INSERT INTO tasks (id, project_id, {", ".join(_TASK_FIELDS)}, updated_at)
+                VALUES ({", ".join("?" * (len(_TASK_FIELDS) + 3))})""",
+            inserts,
+        )
+    if updates:
+        await db.writer.executemany(
+            f"""UPDATE tasks SET {", ".join(f"{field} = ?" for field in _TASK_FIELDS)}, updated_at = ?
+                WHERE project_id = ? AND id = ?""",
+            updates,
+        )
+    if stored:
+        await _record_transitions(db, project_id, stored, incoming, now)
+
+    if len(inserts) + len(updates) + len(deletes) > DELTA_LIMIT:
+        changes.refetch = True
+    if changes.refetch or not (inserts or updates or deletes):
+        return
+
+    cursor = await db.writer.execute("SELECT name FROM projects WHERE id = ?", (project_id,))
     row = await cursor.fetchone()
-    last_ts = row[0] if row and row[0] else ""
+    project_name = row["name"] if row else ""
+    status_index = _TASK_FIELDS.index("status")
+    for task_id, _, *fields, updated_at in inserts:
+        changes.tasks_added.append(_task_row(task_id, project_id, project_name, fields, updated_at))
+    for *fields, updated_at, _, task_id in updates:
+        task = _task_row(task_id, project_id, project_name, fields, updated_at)
+        if fields[status_index] != stored[task_id][status_index]:
+            changes.tasks_moved.append(task)
+        else:
+            changes.tasks_edited.append(task)
+    changes.tasks_removed.extend(task_id for _, task_id in deletes)
+
+
+async def _record_transitions(
+    db: Database,
+    project_id: str,
+    stored: dict[str, tuple[Any, ...]],
+    incoming: dict[str, tuple[Any, ...]],
+    now: str,
+) -> None:
+    """Log the status changes between stored and incoming tasks (see `rollups.record_transitions`)."""
+    story_index = _TASK_FIELDS.index("story_id")
+    status_index = _TASK_FIELDS.index("status")
+    agent_index = _TASK_FIELDS.index("assigned_agent")
+
+    transitions: list[Transition] = []
+    for task_id, task in incoming.items():
+        previous = stored.get(task_id)
+        from_status = previous[status_index] if previous is not None else None
+        if task[status_index] != from_status:
+            transitions.append(
+                Transition(
+                    task_id,
+                    task[story_index],
+                    from_status,
+                    task[status_index],
+                    task[agent_index],
+                    task[-1] or now,
+                )
+            )
+    for task_id in stored.keys() - incoming.keys():
+        previous = stored[task_id]
+        transitions.append(
+            Transition(task_id, previous[story_index], previous[status_index], None, previous[agent_index], now)
+        )
+    if not transitions:
+        return
 
-    with open(progress_path) as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                entry = json.loads(line)
-            except json.JSONDecodeError:
-                continue
+    touched = {transition.story_id for transition in transitions}
+    story_statuses: dict[str, list[str]] = {}
+    for task in incoming.values():
+        if task[story_index] in touched:
+            story_statuses.setdefault(task[story_index], []).append(task[status_index])
+    await record_transitions(db, project_id, transitions, story_statuses)
+
+
+def _task_row(task_id: str, project_id: str, project_name: str, fields: list[Any], updated_at: str) -> dict[str, Any]:
+    """A task in the shape `/api/board` returns it."""
+    return {
+        "id": task_id,
+        "project_id": project_id,
+        **dict(zip(_TASK_FIELDS, fields, strict=True)),
+        "updated_at": updated_at,
+        "project_name": project_name,
+    }
+
+
+async def _write_activity(
+    db: Database,
+    project_id: str,
+    rows: list[tuple[Any, ...]],
+    progress_cursor: ProgressCursor,
+    changes: ProjectChanges,
+    *,
+    rescan: bool,
+) -> None:
+    """Append new activity rows, recording them in `changes`, and advance the progress.jsonl read cursor."""
+    if rescan and rows:
+        rows = await _drop_known_activity(db, project_id, rows)
+
+    cursor = await db.writer.execute("SELECT COALESCE(MAX(id), 0) FROM activity")
+    (last_id,) = await cursor.fetchone() or (0,)
+    await db.writer.executemany(
+        """INSERT INTO activity (project_id, event_type, story_id, agent_name, summary, metadata, timestamp)
+           VALUES (?, ?, ?, ?, ?, ?, ?)""",
+        rows,
+    )
+    if rows:
+        await record_activity(db, project_id, last_id)
+    await db.writer.execute(
+        """INSERT INTO progress_cursors (project_id, byte_offset, inode, tail_hash, updated_at)
+           VALUES (?, ?, ?, ?, ?)
+           ON CONFLICT(project_id) DO UPDATE SET
+             byte_offset=excluded.byte_offset, inode=excluded.inode, tail_hash=excluded.tail_hash,
+             updated_at=excluded.updated_at""",
+        (project_id, *progress_cursor, _now()),
+    )
 
-            ts = entry.get("timestamp", "")
-            if ts <= last_ts:
-                continue
+    if len(rows) > DELTA_LIMIT:
+        changes.refetch = True
+    elif rows and not changes.refetch:
+        cursor = await db.writer.execute(
+            """SELECT a.*, p.name as project_name
+               FROM activity a
+               JOIN projects p ON a.project_id = p.id
+               WHERE a.id > ? AND a.project_id = ?
+               ORDER BY a.id""",
+            (last_id, project_id),
+        )
+        changes.activity = [dict(row) for row in await cursor.fetchall()]
+
+
+async def _drop_known_activity(db: Database, project_id: str, rows: list[tuple[Any, ...]]) -> list[tuple[Any, ...]]:
+    """Filter rescanned progress rows down to those not already stored for the project.
+
+    Matching is by (event_type, story_id, agent_name, summary, timestamp) and counts
+    duplicates, so repeated identical entries in the file are kept once each. Only
+    stored rows within the batch's timestamp range are looked up, not the project's
+    whole history.
+    """
+    timestamps = sorted((row[6] for row in rows), key=_sqlite_order)
+    cursor = await db.writer.execute(
+        """SELECT event_type, story_id, agent_name, summary, timestamp FROM activity
+           WHERE project_id = ? AND timestamp BETWEEN ? AND ?""",
+        (project_id, timestamps[0], timestamps[-1]),
+    )
+    known = Counter(tuple(row) for row in await cursor.fetchall())
+
+    fresh: list[tuple[Any, ...]] = []
+    for row in rows:
+        key = (row[1], row[2], row[3], row[4], row[6])
+        if known[key] > 0:
+            known[key] -= 1
+            continue
+        fresh.append(row)
+    return fresh
 
-            await db.conn.execute(
-                """INSERT INTO activity (project_id, event_type, story_id, agent_name, summary, metadata, timestamp)
-                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
-                (
-                    project_id,
-                    entry.get("event_type", "progress"),
-                    entry.get("story_id", ""),
-                    entry.get("agent", ""),
-                    entry.get("summary", ""),
-                    json.dumps(entry.get("metadata", {})),
-                    ts,
-                ),
-            )
 
+def _sqlite_order(value: Any) -> tuple[int, Any]:
+    """Sort key matching SQLite's ordering of values of mixed types (NULL, then numbers, then text)."""
+    if value is None:
+        return 0, 0
+    if isinstance(value, int | float):
+        return 1, value
+    return 2, value
 
-async def ingest_all(db: Database, watch_paths: list[Path], max_depth: int = 3) -> int:
-    """Discover and ingest all Ullr projects. Returns count of projects found."""
-    projects = await discover_projects(watch_paths, max_depth)
-    for project_info in projects:
-        await ingest_project(db, Path(project_info["path"]))
+
+async def _record_fingerprints(db: Database, project_path: Path, project_id: str, checks: list[_FileCheck]) -> None:
+    """Persist fingerprints for checked files and forget those that no longer exist."""
+    await db.writer.executemany(
+        """INSERT INTO file_fingerprints (path, project_id, mtime_ns, size, content_hash, updated_at)
+           VALUES (?, ?, ?, ?, ?, ?)
+           ON CONFLICT(path) DO UPDATE SET
+             project_id=excluded.project_id, mtime_ns=excluded.mtime_ns, size=excluded.size,
+             content_hash=excluded.content_hash, updated_at=excluded.updated_at""",
+        [
+            (check.path, project_id, check.mtime_ns, check.size, check.content_hash, _now())
+            for check in checks
+            if check.record
+        ],
+    )
+    present = {check.path for check in checks}
+    missing = [(str(project_path / name),) for name in PROJECT_FILES if str(project_path / name) not in present]
+    await db.writer.executemany("DELETE FROM file_fingerprints WHERE path = ?", missing)
+
+
+@dataclass
+class IngestProgress:
+    """Progress of a full discovery and ingestion pass, as reported by the readiness endpoint."""
+
+    status: str = "pending"  # pending | discovering | ingesting | ready | failed
+    projects_total: int = 0
+    projects_done: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+    finished_at: float | None = None
+
+    @property
+    def eta_seconds(self) -> float | None:
+        """Remaining time extrapolated from the average time per project so far."""
+        if self.status == "ready":
+            return 0.0
+        if self.status != "ingesting" or self.projects_done == 0:
+            return None
+        elapsed = time.monotonic() - self.started_at
+        return elapsed / self.projects_done * (self.projects_total - self.projects_done)
+
+    def as_dict(self) -> dict[str, Any]:
+        end = self.finished_at if self.finished_at is not None else time.monotonic()
+        eta = self.eta_seconds
+        return {
+            "status": self.status,
+            "ready": self.status == "ready",
+            "projects_done": self.projects_done,
+            "projects_total": self.projects_total,
+            "elapsed_seconds": round(end - self.started_at, 3),
+            "eta_seconds": None if eta is None else round(eta, 3),
+        }
+
+
+async def ingest_all(
+    db: Database,
+    watch_paths: list[Path],
+    max_depth: int = 3,
+    *,
+    ignore: Iterable[str] = DEFAULT_IGNORE,
+    workers: int = 8,
+    executor: Executor | None = None,
+    progress: IngestProgress | None = None,
+    on_project: Callable[[IngestProgress, IngestResult], Awaitable[None]] | None = None,
+    on_discovered: Callable[[Discovery], None] | None = None,
+    concurrency: int = 4,
+) -> int:
+    """Discover and ingest all Ullr projects. Returns count of projects found.
+
+    `on_discovered` is called with the discovery result before any project is
+    ingested, `progress` is updated as the pass advances, and `on_project` is awaited
+    after each project lands. Up to `concurrency` projects are ingested at once, so
+    their writes share commits. A project that fails to ingest is logged and skipped.
+    """
+    if progress is None:
+        progress = IngestProgress()
+    progress.status = "discovering"
+    discovery = await discover(watch_paths, max_depth, db=db, ignore=ignore, workers=workers)
+    if on_discovered is not None:
+        on_discovered(discovery)
+    projects = discovery.projects
+    progress.projects_total = len(projects)
+    progress.status = "ingesting"
+
+    projects_skipped = files_read = files_skipped = 0
+    pending = iter(projects)
+
+    async def ingest_next() -> None:
+        nonlocal projects_skipped, files_read, files_skipped
+        for project_info in pending:
+            try:
+                result = await ingest_project(db, Path(project_info["path"]), executor)
+            except Exception:
+                logger.exception("Failed to ingest %s", project_info["path"])
+                result = IngestResult()
+            files_read += result.files_read
+            files_skipped += result.files_skipped
+            if result.files_read == 0:
+                projects_skipped += 1
+            progress.projects_done += 1
+            if on_project is not None:
+                await on_project(progress, result)
+
+    await asyncio.gather(*(ingest_next() for _ in range(max(1, min(concurrency, len(projects))))))
+
+    progress.status = "ready"
+    progress.finished_at = time.monotonic()
+    logger.info(
+        "Ingested %d projects: %d re-read, %d skipped as unchanged; %d files re-read, %d skipped",
+        len(projects),
+        len(projects) - projects_skipped,
+        projects_skipped,
+        files_read,
+        files_skipped,
+    )
     return len(projects)
 
 
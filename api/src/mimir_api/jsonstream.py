@@ -0,0 +1,151 @@
+"""Incremental JSON reading, for project files too large to parse in one go."""
+
+from __future__ import annotations
+
+import codecs
+import json
+import re
+from typing import TYPE_CHECKING, Any, BinaryIO
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = " \t\n\r"
+
+# Characters that may continue a number, up to the end of the buffer
+_NUMBER_TAIL = re.compile(r"[0-9eE.+\-]*\Z")
+
+
+class JsonStream:
+    """Pull-based reader over a JSON document in a binary file, one value at a time.
+
+    Containers are walked with `members` (objects) and `elements` / `items`
+    (arrays); every other value is decoded whole with `value` or passed over with
+    `skip`. Memory is bounded by the largest single value decoded plus a chunk, not
+    by the document, so a caller that only decodes array elements never holds more
+    than one element at a time.
+
+    Values are decoded with `json.JSONDecoder.raw_decode` on a sliding text buffer.
+    A decode that fails, or a number that runs to the end of the buffer (it may
+    continue in the next chunk), is retried after reading more, with reads doubling
+    so a large value costs a bounded number of retries.
+    """
+
+    def __init__(self, file: BinaryIO, chunk_size: int = CHUNK_SIZE) -> None:
+        self._file = file
+        self._chunk_size = chunk_size
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def peek(self) -> str:
+        """The next non-whitespace character, or "" at the end of the document."""
+        while True:
+            buffer = self._buffer
+            pos = self._pos
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            self._pos = pos
+            if pos < len(buffer):
+                return buffer[pos]
+            if not self._fill(self._chunk_size):
+                return ""
+
+    def value(self) -> Any:
+        """Decode the next value whole."""
+        self.peek()
+        size = self._chunk_size
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if self._fill(size):
+                    size *= 2
+                    continue
+                raise
+            # A number cut off by the end of the buffer still decodes ("-0." as -0)
+            if _NUMBER_TAIL.match(self._buffer, end) and isinstance(value, int | float) and self._fill(size):
+                size *= 2
+                continue
+            self._pos = end
+            return value
+
+    def members(self) -> Iterator[str]:
+        """Walk an object, yielding each key with the stream positioned at its value.
+
+        The caller must consume each value (`value`, `skip`, `members`, `elements` or
+        `items`) before advancing.
+        """
+        self._expect("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self.value()
+            if not isinstance(key, str):
+                raise self._error("Expecting property name enclosed in double quotes")
+            self._expect(":")
+            yield key
+            if self._separator("}"):
+                return
+
+    def elements(self) -> Iterator[None]:
+        """Walk an array, positioned at each element in turn; the caller must consume each one."""
+        self._expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield
+            if self._separator("]"):
+                return
+
+    def items(self) -> Iterator[Any]:
+        """Walk an array, decoding one element at a time."""
+        for _ in self.elements():
+            yield self.value()
+
+    def skip(self) -> None:
+        """Pass over the next value, walking containers rather than building them."""
+        char = self.peek()
+        if char == "{":
+            for _ in self.members():
+                self.skip()
+        elif char == "[":
+            for _ in self.elements():
+                self.skip()
+        else:
+            self.value()
+
+    def _fill(self, size: int) -> bool:
+        """Read up to `size` more bytes, dropping what has been consumed; False at end of file."""
+        if self._eof:
+            return False
+        chunk = self._file.read(size)
+        self._eof = not chunk
+        self._buffer = self._buffer[self._pos :] + self._text.decode(chunk, final=self._eof)
+        self._pos = 0
+        return not self._eof
+
+    def _expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise self._error(f"Expecting {char!r}")
+        self._pos += 1
+
+    def _separator(self, close: str) -> bool:
+        """Consume a ',' (False) or the container's closing character (True)."""
+        char = self.peek()
+        if char == ",":
+            self._pos += 1
+            return False
+        if char == close:
+            self._pos += 1
+            return True
+        raise self._error(f"Expecting ',' or {close!r}")
+
+    def _error(self, message: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(message, self._buffer, self._pos)
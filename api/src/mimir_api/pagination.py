@@ -0,0 +1,28 @@
+"""Opaque keyset cursors for paginated endpoints."""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from typing import Any
+
+
+def encode_cursor(*values: Any) -> str:
+    """Pack a row's sort key into a URL-safe opaque token."""
+    raw = json.dumps(list(values), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(token: str, arity: int) -> list[Any]:
+    """Unpack a token made by `encode_cursor`, raising ValueError if it is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        values = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as exc:
+        msg = "Invalid cursor"
+        raise ValueError(msg) from exc
+    if not isinstance(values, list) or len(values) != arity:
+        msg = "Invalid cursor"
+        raise ValueError(msg)
+    return values
@@ -0,0 +1,315 @@
+"""Live agent registry: agents announce themselves with heartbeats and drop out after a TTL."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import heapq
+import itertools
+import json
+import logging
+import os
+import re
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+# Agent names double as heartbeat file names
+AGENT_NAME = re.compile(r"^[\w@-][\w.@-]{0,127}$")
+
+# Heartbeat fields an agent may report, besides its name
+FIELDS = ("project_id", "story_id", "current_task")
+
+
+class Agent:
+    """A live agent and what it last reported."""
+
+    def __init__(self, name: str, at: float) -> None:
+        self.name = name
+        self.project_id: str | None = None
+        self.story_id: str | None = None
+        self.current_task: str | None = None
+        # Wall-clock seconds: when it came online, its latest heartbeat, and when it expires
+        self.since = at
+        self.last_seen = at
+        self.expires = at
+        # Whether its heartbeat file has been seen, and when this process last wrote it
+        self.from_file = False
+        self.persisted = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "project_id": self.project_id,
+            "story_id": self.story_id,
+            "current_task": self.current_task,
+            "since": _iso(self.since),
+            "last_seen": _iso(self.last_seen),
+        }
+
+
+class AgentRegistry:
+    """In-memory table of live agents, fed by heartbeat files and `heartbeat` calls.
+
+    An agent is live from its first heartbeat until `ttl_seconds` after its latest
+    one. Heartbeats arrive two ways: as files `<name>.json` in `directory`, whose
+    mtime is the heartbeat time (an agent refreshes it by rewriting or touching it,
+    and goes offline at once by deleting it), or through `heartbeat` (the POST
+    endpoint). Heartbeats passed to `heartbeat` are written through to the file at
+    most every quarter TTL, so every worker process, scanning the same directory,
+    sees the same agents.
+
+    A heartbeat is a dict update: expiry runs off a min-heap holding one entry per
+    live agent, and an entry popped before its agent's refreshed expiry is pushed
+    back rather than every heartbeat pushing a new one. Agents coming online and
+    going offline are passed to `on_change` from the registry's own task, in order.
+    `version` moves on every change to what `agents` returns, for response caching.
+
+    At most `max_agents` agents are live at once; heartbeats from further agents are
+    refused until some expire. An agent that expires has its heartbeat file deleted,
+    unless the file was touched again since, so stale files don't pile up.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        *,
+        ttl_seconds: float = 30,
+        scan_seconds: float = 2,
+        max_agents: int = 1000,
+        on_change: Callable[[str, Agent], Awaitable[None]] | None = None,
+    ) -> None:
+        self.directory = directory.expanduser()
+        self._ttl = ttl_seconds
+        self._max_agents = max_agents
+        self._scan_seconds = scan_seconds
+        self._on_change = on_change
+        self._agents: dict[str, Agent] = {}
+        self._expiry: list[tuple[float, int, Agent]] = []
+        self._sequence = itertools.count()
+        # Online/offline changes not yet passed to on_change, and a wakeup for the registry task
+        self._changes: list[tuple[str, Agent]] = []
+        self._wakeup = asyncio.Event()
+        # Heartbeat file mtimes (ns) as of the last scan
+        self._mtimes: dict[str, int] = {}
+        self._tasks: list[asyncio.Task[None]] = []
+        self.version = 0
+        self.heartbeats = 0
+        self.online = 0
+        self.offline = 0
+        self.scans = 0
+        self.refused = 0
+
+    def start(self) -> None:
+        """Start expiring agents and scanning the heartbeat directory."""
+        if not self._tasks:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._tasks = [
+                asyncio.create_task(self._run(), name="mimir-agent-expiry"),
+                asyncio.create_task(self._scan_forever(), name="mimir-agent-scan"),
+            ]
+
+    async def close(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        self._tasks = []
+
+    def agents(self) -> list[Agent]:
+        """Live agents, most recently heard from first."""
+        return sorted(self._agents.values(), key=lambda agent: agent.last_seen, reverse=True)
+
+    def heartbeat(self, name: str, info: dict[str, Any] | None = None, at: float | None = None) -> Agent | None:
+        """Record a heartbeat from `name` at `at` (default now), with any of its `FIELDS`.
+
+        Returns None, recording nothing, for a new agent while `max_agents` are live.
+        """
+        now = time.time()
+        at = now if at is None else min(at, now)
+        agent = self._agents.get(name)
+        if agent is None:
+            if len(self._agents) >= self._max_agents:
+                self.refused += 1
+                return None
+            agent = self._agents[name] = Agent(name, at)
+            agent.expires = at + self._ttl
+            self._schedule(agent)
+            self._changes.append(("agent_online", agent))
+            self._wakeup.set()
+            self.online += 1
+            self.version += 1
+        elif at > agent.last_seen:
+            agent.last_seen = at
+            agent.expires = at + self._ttl
+            self.version += 1
+        if info:
+            for field in FIELDS:
+                if field in info:
+                    value = None if info[field] is None else str(info[field])
+                    if getattr(agent, field) != value:
+                        setattr(agent, field, value)
+                        self.version += 1
+        self.heartbeats += 1
+        return agent
+
+    def remove(self, name: str) -> None:
+        """Take an agent offline now; its heap entry is skipped when it comes up."""
+        agent = self._agents.pop(name, None)
+        if agent is not None:
+            self._went_offline(agent)
+
+    async def persist(self, agent: Agent) -> None:
+        """Write an agent's heartbeat file if this process hasn't for a quarter TTL."""
+        now = time.time()
+        if now - agent.persisted < self._ttl / 4:
+            return
+        agent.persisted = now
+        content = {"name": agent.name, **{field: getattr(agent, field) for field in FIELDS}}
+        await asyncio.to_thread(_write_heartbeat, self.directory / f"{agent.name}.json", content)
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """Live agents and heartbeat/online/offline counters."""
+        return {
+            "agents": len(self._agents),
+            "heartbeats": self.heartbeats,
+            "online": self.online,
+            "offline": self.offline,
+            "scans": self.scans,
+            "refused": self.refused,
+            "version": self.version,
+            "ttl_seconds": self._ttl,
+        }
+
+    def _schedule(self, agent: Agent) -> None:
+        heapq.heappush(self._expiry, (agent.expires, next(self._sequence), agent))
+        if self._expiry[0][2] is agent:
+            self._wakeup.set()
+
+    def _expire(self, now: float) -> list[str]:
+        """Take agents whose TTL has run out offline, returning their names."""
+        expired: list[str] = []
+        while self._expiry and self._expiry[0][0] <= now:
+            _, _, agent = heapq.heappop(self._expiry)
+            if self._agents.get(agent.name) is not agent:
+                continue
+            if agent.expires > now:
+                self._schedule(agent)
+                continue
+            del self._agents[agent.name]
+            self._went_offline(agent)
+            expired.append(agent.name)
+        return expired
+
+    def _went_offline(self, agent: Agent) -> None:
+        self._changes.append(("agent_offline", agent))
+        self._wakeup.set()
+        self.offline += 1
+        self.version += 1
+
+    async def _run(self) -> None:
+        """Expire agents as their TTLs run out and pass online/offline changes to `on_change`."""
+        while True:
+            now = time.time()
+            expired = self._expire(now)
+            if expired:
+                try:
+                    await asyncio.to_thread(_remove_heartbeats, self.directory, expired, now - self._ttl)
+                except OSError:
+                    logger.exception("Failed to remove expired heartbeat files in %s", self.directory)
+            changes, self._changes = self._changes, []
+            for event, agent in changes:
+                if self._on_change is not None:
+                    try:
+                        await self._on_change(event, agent)
+                    except Exception:
+                        logger.exception("Failed to announce %s for agent %s", event, agent.name)
+            if self._changes:
+                continue
+            self._wakeup.clear()
+            timeout = max(0.0, self._expiry[0][0] - time.time()) if self._expiry else None
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+
+    async def _scan_forever(self) -> None:
+        while True:
+            try:
+                await self.scan()
+            except Exception:
+                logger.exception("Failed to scan agent heartbeats in %s", self.directory)
+            await asyncio.sleep(self._scan_seconds)
+
+    async def scan(self) -> None:
+        """Apply heartbeat files written, touched or deleted since the last scan."""
+        present, changed = await asyncio.to_thread(_scan_heartbeats, self.directory, dict(self._mtimes))
+        self.scans += 1
+        cutoff = time.time() - self._ttl
+        for name, mtime, info in changed:
+            if mtime > cutoff:
+                agent = self.heartbeat(name, info, at=mtime)
+                if agent is not None:
+                    agent.from_file = True
+        for name in self._mtimes.keys() - present.keys():
+            agent = self._agents.get(name)
+            if agent is not None and agent.from_file:
+                self.remove(name)
+        self._mtimes = present
+
+
+def _scan_heartbeats(
+    directory: Path, known: dict[str, int]
+) -> tuple[dict[str, int], list[tuple[str, float, dict[str, Any]]]]:
+    """Heartbeat file mtimes in `directory`, and the contents of files whose mtime differs from `known`."""
+    present: dict[str, int] = {}
+    changed: list[tuple[str, float, dict[str, Any]]] = []
+    try:
+        entries = list(os.scandir(directory))
+    except FileNotFoundError:
+        return present, changed
+    for entry in entries:
+        name, suffix = os.path.splitext(entry.name)
+        if suffix != ".json" or not AGENT_NAME.match(name):
+            continue
+        try:
+            mtime = entry.stat().st_mtime_ns
+        except FileNotFoundError:
+            continue
+        present[name] = mtime
+        if known.get(name) == mtime:
+            continue
+        # An empty or unreadable file is still a heartbeat, just without details
+        info: dict[str, Any] = {}
+        with contextlib.suppress(OSError, ValueError):
+            content = json.loads(Path(entry.path).read_bytes() or b"{}")
+            if isinstance(content, dict):
+                info = content
+        changed.append((name, mtime / 1e9, info))
+    return present, changed
+
+
+def _write_heartbeat(path: Path, content: dict[str, Any]) -> None:
+    """Replace a heartbeat file atomically, so a scan never reads it half-written."""
+    temporary = path.with_name(f".{path.name}.tmp")
+    temporary.write_text(json.dumps(content))
+    os.replace(temporary, path)
+
+
+def _remove_heartbeats(directory: Path, names: list[str], cutoff: float) -> None:
+    """Delete the named agents' heartbeat files, unless touched after `cutoff` (by an agent or another worker)."""
+    for name in names:
+        path = directory / f"{name}.json"
+        with contextlib.suppress(FileNotFoundError):
+            if path.stat().st_mtime <= cutoff:
+                path.unlink()
+
+
+def _iso(at: float) -> str:
+    return datetime.fromtimestamp(at, UTC).isoformat()
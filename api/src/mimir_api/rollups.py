@@ -0,0 +1,115 @@
+"""Analytics rollups maintained during ingestion, so `/api/stats` never scans raw history.
+
+Every function here runs inside an ingest's write, in a `db.writes` batch transaction:
+
+- `activity_rollup` counts activity per project, UTC hour, agent and event type,
+  folded in from the rows an ingest appended.
+- `task_transitions` logs every task status change seen when a taskboard diff is
+  applied; `transition_rollup` counts them per project, hour, agent and new status.
+- `story_cycles` tracks when each story's first task left the backlog and when its
+  last task reached done.
+- `burndown` keeps one task/story count snapshot per project per UTC day.
+
+Transitions can only be observed from the first ingest on, so a project's first
+taskboard is taken as its starting state rather than logged as transitions.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    from mimir_api.db import Database
+
+# UTC hour of a timestamp column, 'YYYY-MM-DDTHH'; timestamps SQLite can't parse land in ''
+BUCKET = "COALESCE(strftime('%Y-%m-%dT%H', {column}), '')"
+
+ACTIVITY_ROLLUP = f"""INSERT INTO activity_rollup (project_id, bucket, agent_name, event_type, events)
+    SELECT project_id, {BUCKET.format(column="timestamp")}, COALESCE(agent_name, ''), event_type, COUNT(*)
+    FROM activity
+    WHERE {{where}}
+    GROUP BY 1, 2, 3, 4
+    ON CONFLICT (project_id, bucket, agent_name, event_type) DO UPDATE SET events = events + excluded.events"""
+
+TRANSITION_ROLLUP = f"""INSERT INTO transition_rollup (project_id, bucket, agent_name, to_status, transitions)
+    SELECT project_id, {BUCKET.format(column="at")}, COALESCE(agent_name, ''), to_status, COUNT(*)
+    FROM task_transitions
+    WHERE to_status IS NOT NULL AND {{where}}
+    GROUP BY 1, 2, 3, 4
+    ON CONFLICT (project_id, bucket, agent_name, to_status)
+    DO UPDATE SET transitions = transitions + excluded.transitions"""
+
+BURNDOWN_SNAPSHOT = """INSERT INTO burndown (project_id, day, tasks_total, tasks_done, stories_total, stories_done)
+    SELECT p.id, {day},
+           (SELECT COUNT(*) FROM tasks t WHERE t.project_id = p.id),
+           (SELECT COUNT(*) FROM tasks t WHERE t.project_id = p.id AND t.status = 'done'),
+           p.total_stories, p.done_stories
+    FROM projects p
+    WHERE {where}
+    ON CONFLICT (project_id, day) DO UPDATE SET
+      tasks_total=excluded.tasks_total, tasks_done=excluded.tasks_done,
+      stories_total=excluded.stories_total, stories_done=excluded.stories_done"""
+
+
+class Transition(NamedTuple):
+    """One task status change; `from_status` is None for a new task, `to_status` None for a removed one."""
+
+    task_id: str
+    story_id: str
+    from_status: str | None
+    to_status: str | None
+    agent_name: str
+    at: str
+
+
+async def record_activity(db: Database, project_id: str, after_id: int) -> None:
+    """Fold the project's activity rows with id above `after_id` into `activity_rollup`."""
+    await db.writer.execute(ACTIVITY_ROLLUP.format(where="id > ? AND project_id = ?"), (after_id, project_id))
+
+
+async def record_transitions(
+    db: Database,
+    project_id: str,
+    transitions: list[Transition],
+    story_statuses: dict[str, list[str]],
+) -> None:
+    """Log task transitions, fold them into `transition_rollup`, and update the stories they touch.
+
+    `story_statuses` holds the current status of every task in each touched story.
+    A story starts at its first transition out of the backlog and finishes at the
+    transition that leaves all of its tasks done; moving a task out of done reopens it.
+    """
+    if not transitions:
+        return
+    cursor = await db.writer.execute("SELECT COALESCE(MAX(id), 0) FROM task_transitions")
+    (last_id,) = await cursor.fetchone() or (0,)
+    await db.writer.executemany(
+        """INSERT INTO task_transitions (project_id, task_id, story_id, from_status, to_status, agent_name, at)
+           VALUES (?, ?, ?, ?, ?, ?, ?)""",
+        [(project_id, *transition) for transition in transitions],
+    )
+    await db.writer.execute(TRANSITION_ROLLUP.format(where="id > ?"), (last_id,))
+
+    stories: dict[str, list[Transition]] = {}
+    for transition in transitions:
+        if transition.story_id:
+            stories.setdefault(transition.story_id, []).append(transition)
+    cycles = []
+    for story_id, moves in stories.items():
+        started = min((move.at for move in moves if move.to_status not in (None, "backlog")), default=None)
+        statuses = story_statuses.get(story_id, [])
+        finished = max(move.at for move in moves) if statuses and all(s == "done" for s in statuses) else None
+        cycles.append((project_id, story_id, started, finished))
+    await db.writer.executemany(
+        """INSERT INTO story_cycles (project_id, story_id, started_at, finished_at)
+           VALUES (?, ?, ?, ?)
+           ON CONFLICT (project_id, story_id) DO UPDATE SET
+             started_at=COALESCE(story_cycles.started_at, excluded.started_at),
+             finished_at=excluded.finished_at""",
+        cycles,
+    )
+
+
+async def snapshot_burndown(db: Database, project_id: str, day: str) -> None:
+    """Record the project's current task and story counts as its burndown point for `day`."""
+    await db.writer.execute(BURNDOWN_SNAPSHOT.format(day="?", where="p.id = ?"), (day, project_id))
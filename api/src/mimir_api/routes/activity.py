@@ -4,44 +4,106 @@ from __future__ import annotations
 
 from typing import Any
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, HTTPException, Query, Response
 
-from mimir_api.dependencies import get_db
+from mimir_api.dependencies import Reader  # noqa: TC001 — FastAPI resolves it at runtime
+from mimir_api.pagination import decode_cursor, encode_cursor
 
 router = APIRouter(prefix="/api", tags=["activity"])
 
 
 @router.get("/activity")
 async def list_activity(
+    conn: Reader,
+    response: Response,
     project: str = Query("all", description="Project ID or 'all'"),
+    agent: str | None = Query(None, description="Filter by agent name"),
+    story_id: str | None = Query(None, description="Filter by story ID"),
+    event_type: str | None = Query(None, description="Filter by event type"),
     limit: int = Query(50, ge=1, le=200),
-    after: str | None = Query(None, description="ISO timestamp cursor for pagination"),
+    before: str | None = Query(None, description="Page cursor: events older than this (from X-Next-Cursor)"),
+    after: str | None = Query(None, description="Page cursor: events newer than this (from X-Prev-Cursor)"),
 ) -> list[dict[str, Any]]:
-    """Get recent activity events, newest first."""
-    db = get_db()
+    """Get activity events, newest first, with stable (timestamp, id) keyset paging.
 
+    A page sets `X-Next-Cursor` (pass as `before` for older events) and
+    `X-Prev-Cursor` (pass as `after` for newer events). The cursor in the paging
+    direction is left out when the page is short, as it is the last one: a
+    `before` (or first) page shorter than `limit` has no `X-Next-Cursor`, an
+    `after` page shorter than `limit` no `X-Prev-Cursor`. Every filter
+    combination is served by one of the activity composite indexes.
+    """
+    if before and after:
+        raise HTTPException(status_code=400, detail="Pass only one of 'before' or 'after'")
+
+    try:
+        sql, params = activity_query(project, agent, story_id, event_type, before=before, after=after, limit=limit)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    cursor = await conn.execute(sql, params)
+    rows = [dict(row) for row in await cursor.fetchall()]
+    if after:
+        rows.reverse()
+
+    if rows:
+        full = len(rows) == limit
+        if full or not after:
+            response.headers["X-Prev-Cursor"] = encode_cursor(rows[0]["timestamp"], rows[0]["id"])
+        if full or after:
+            response.headers["X-Next-Cursor"] = encode_cursor(rows[-1]["timestamp"], rows[-1]["id"])
+    return rows
+
+
+def activity_query(
+    project: str = "all",
+    agent: str | None = None,
+    story_id: str | None = None,
+    event_type: str | None = None,
+    *,
+    before: str | None = None,
+    after: str | None = None,
+    limit: int = 50,
+) -> tuple[str, list[str | int]]:
+    """The SQL and parameters for one `/api/activity` page, raising ValueError for a malformed cursor.
+
+    `after` pages are selected oldest-first; the caller reverses them.
+    """
     conditions: list[str] = []
     params: list[str | int] = []
 
     if project != "all":
         conditions.append("a.project_id = ?")
         params.append(project)
-    if after:
-        conditions.append("a.timestamp > ?")
-        params.append(after)
+    if agent:
+        conditions.append("a.agent_name = ?")
+        params.append(agent)
+    if story_id:
+        conditions.append("a.story_id = ?")
+        params.append(story_id)
+    if event_type:
+        conditions.append("a.event_type = ?")
+        params.append(event_type)
+
+    cursor_token = before or after
+    if cursor_token:
+        timestamp, row_id = decode_cursor(cursor_token, 2)
+        if not isinstance(timestamp, str) or not isinstance(row_id, int) or isinstance(row_id, bool):
+            msg = "Invalid cursor"
+            raise ValueError(msg)
+        conditions.append("(a.timestamp, a.id) > (?, ?)" if after else "(a.timestamp, a.id) < (?, ?)")
+        params.extend([timestamp, row_id])
 
     where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    # Newer pages walk the index forwards, then are flipped back to newest-first
+    order = "ASC" if after else "DESC"
 
     params.append(limit)
 
-    cursor = await db.conn.execute(
-        f"""SELECT a.*, p.name as project_name
-            FROM activity a
-            JOIN projects p ON a.project_id = p.id
-            {where}
-            ORDER BY a.timestamp DESC
-            LIMIT ?""",
-        params,
-    )
-    rows = await cursor.fetchall()
-    return [dict(row) for row in rows]
+    # CROSS JOIN keeps activity as the outer loop so ORDER BY walks an index instead of sorting
+    sql = f"""SELECT a.*, p.name as project_name
+        FROM activity a
+        CROSS JOIN projects p ON a.project_id = p.id
+        {where}
+        ORDER BY a.timestamp {order}, a.id {order}
+        LIMIT ?"""
+    return sql, params
@@ -2,37 +2,115 @@
 
 from __future__ import annotations
 
-from typing import Any
+import ipaddress
+import secrets
+from typing import TYPE_CHECKING, Any
 
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException, Request, Response
+from pydantic import BaseModel, Field
 
-from mimir_api.dependencies import get_db
+from mimir_api.cache import cached_json
+from mimir_api.dependencies import Db  # noqa: TC001 — FastAPI resolves it at runtime
+from mimir_api.registry import AGENT_NAME
+
+if TYPE_CHECKING:
+    from mimir_api.db import Database
+    from mimir_api.registry import AgentRegistry
 
 router = APIRouter(prefix="/api", tags=["agents"])
 
 
+class Heartbeat(BaseModel):
+    """A heartbeat from an agent, with what it is working on."""
+
+    name: str = Field(pattern=AGENT_NAME.pattern, description="Agent name")
+    project_id: str | None = None
+    story_id: str | None = None
+    current_task: str | None = None
+
+
 @router.get("/agents")
-async def list_agents() -> list[dict[str, Any]]:
-    """List active agents (inferred from in_progress tasks).
+async def list_agents(request: Request, db: Db) -> Response:
+    """List live agents.
+
+    Agents sending heartbeats (`POST /api/agents/heartbeat`, or a file
+    `<name>.json` in `agents_dir`) are listed from the registry, most recently
+    heard from first, with `source: "heartbeat"`. Agents assigned to an
+    in_progress task that send no heartbeats follow with `source: "task"` and no
+    `last_seen`.
+    """
+    registry: AgentRegistry = request.app.state.agent_registry
+
+    async def build() -> list[dict[str, Any]]:
+        assigned, project_names = await _assigned_agents(request, db)
+        live = [
+            {**agent.as_dict(), "project_name": project_names.get(agent.project_id or ""), "source": "heartbeat"}
+            for agent in registry.agents()
+        ]
+        names = {agent["name"] for agent in live}
+        return live + [agent for agent in assigned if agent["name"] not in names]
 
-    MVP: An agent is considered active if it's assigned to an in_progress task.
-    Future: heartbeat-based tracking via ~/.mimir/agents/ directory.
+    # Both counters only grow, so their sum moves whenever either the data or the registry does
+    return await cached_json(request, db.generations, build, generation=db.generations.total + registry.version)
+
+
+@router.post("/agents/heartbeat", status_code=204)
+async def agent_heartbeat(request: Request, heartbeat: Heartbeat) -> Response:
+    """Mark an agent live for another `agent_ttl_seconds`.
+
+    An agent's first heartbeat (or its first after expiring) publishes
+    `agent_online`; missing heartbeats for the TTL publishes `agent_offline`.
+    Accepted from loopback, or with `Authorization: Bearer <agent_heartbeat_token>`
+    when that is configured. A new agent is refused with 429 while `max_agents`
+    are live.
     """
-    db = get_db()
-    cursor = await db.conn.execute(
-        """SELECT DISTINCT
-             t.assigned_agent as name,
-             t.project_id,
-             p.name as project_name,
-             t.story_id,
-             t.title as current_task,
-             t.updated_at as since
-           FROM tasks t
-           JOIN projects p ON t.project_id = p.id
-           WHERE t.status = 'in_progress'
-             AND t.assigned_agent IS NOT NULL
-             AND t.assigned_agent != ''
-           ORDER BY t.updated_at DESC"""
-    )
-    rows = await cursor.fetchall()
-    return [dict(row) for row in rows]
+    if not _may_heartbeat(request):
+        raise HTTPException(status_code=403, detail="Heartbeats are accepted from loopback or with the heartbeat token")
+    registry: AgentRegistry = request.app.state.agent_registry
+    agent = registry.heartbeat(heartbeat.name, heartbeat.model_dump(exclude_unset=True))
+    if agent is None:
+        raise HTTPException(status_code=429, detail="Too many live agents")
+    await registry.persist(agent)
+    return Response(status_code=204)
+
+
+def _may_heartbeat(request: Request) -> bool:
+    """Whether the request comes from loopback or carries the configured heartbeat token."""
+    token: str | None = getattr(request.app.state, "heartbeat_token", None)
+    if token:
+        expected = f"Bearer {token}".encode()
+        if secrets.compare_digest(request.headers.get("authorization", "").encode(), expected):
+            return True
+    try:
+        return request.client is not None and ipaddress.ip_address(request.client.host).is_loopback
+    except ValueError:  # Not an IP address, e.g. a Unix socket peer
+        return False
+
+
+async def _assigned_agents(request: Request, db: Database) -> tuple[list[dict[str, Any]], dict[str, str]]:
+    """Agents inferred from in_progress tasks, and project names, re-read only when the data generation moves."""
+    generation = db.generations.get(None)
+    memo = getattr(request.app.state, "assigned_agents", None)
+    if memo is not None and memo[0] == generation:
+        return memo[1], memo[2]
+    async with db.reader() as conn:
+        cursor = await conn.execute(
+            """SELECT DISTINCT
+                 t.assigned_agent as name,
+                 t.project_id,
+                 p.name as project_name,
+                 t.story_id,
+                 t.title as current_task,
+                 t.updated_at as since
+               FROM tasks t
+               JOIN projects p ON t.project_id = p.id
+               WHERE t.status = 'in_progress'
+                 AND t.assigned_agent IS NOT NULL
+                 AND t.assigned_agent != ''
+               ORDER BY t.updated_at DESC"""
+        )
+        assigned = [{**dict(row), "last_seen": None, "source": "task"} for row in await cursor.fetchall()]
+        cursor = await conn.execute("SELECT id, name FROM projects")
+        project_names = {row["id"]: row["name"] for row in await cursor.fetchall()}
+    request.app.state.assigned_agents = (generation, assigned, project_names)
+    return assigned, project_names
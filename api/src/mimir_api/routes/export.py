@@ -0,0 +1,191 @@
+"""Bulk NDJSON export API routes."""
+
+from __future__ import annotations
+
+import zlib
+from typing import TYPE_CHECKING, Any
+
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+
+from mimir_api.boardview import TASK_COLUMNS
+from mimir_api.dependencies import Db  # noqa: TC001 — FastAPI resolves it at runtime
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+    from mimir_api.db import Database
+
+router = APIRouter(prefix="/api/export", tags=["export"])
+
+# Rows read per query; each batch borrows a reader only while it runs
+EXPORT_BATCH = 1000
+
+# gzip level: the ratio gained above this is small next to the CPU spent on the event loop
+GZIP_LEVEL = 5
+
+_ProjectQuery = Query("all", description="Project ID or 'all'")
+
+# Exported columns, in the order of their `/api/activity` rows (tasks use the board's TASK_COLUMNS)
+_ACTIVITY_COLUMNS = ("id", "project_id", "event_type", "story_id", "agent_name", "summary", "metadata", "timestamp")
+
+
+@router.get("/activity")
+async def export_activity(
+    request: Request,
+    db: Db,
+    project: str = _ProjectQuery,
+    since: str | None = Query(None, description="Only events at or after this ISO timestamp"),
+    until: str | None = Query(None, description="Only events before this ISO timestamp"),
+    after: int | None = Query(None, description="Resume after the event with this id (the last one received)"),
+) -> StreamingResponse:
+    """Stream activity events as NDJSON, oldest first in (timestamp, id) order.
+
+    Rows are shaped like `/api/activity` rows. To resume an interrupted export,
+    repeat the request with `after` set to the `id` of the last line received.
+    Sent gzip-compressed when the client accepts it.
+    """
+    conditions: list[str] = []
+    params: list[Any] = []
+    if project != "all":
+        conditions.append("a.project_id = ?")
+        params.append(project)
+    if since:
+        conditions.append("a.timestamp >= ?")
+        params.append(since)
+    if until:
+        conditions.append("a.timestamp < ?")
+        params.append(until)
+
+    position: tuple[Any, ...] | None = None
+    if after is not None:
+        async with db.reader() as conn:
+            cursor = await conn.execute("SELECT timestamp FROM activity WHERE id = ?", (after,))
+            row = await cursor.fetchone()
+        if row is None:
+            raise HTTPException(status_code=400, detail=f"No activity event {after} to resume after")
+        position = (row["timestamp"], after)
+
+    # CROSS JOIN keeps activity as the outer loop so each batch walks an index range
+    source = "activity a CROSS JOIN projects p ON a.project_id = p.id"
+    lines = _batches(db, source, _line("a", _ACTIVITY_COLUMNS), conditions, params, ("a.timestamp", "a.id"), position)
+    return _ndjson_response(request, lines)
+
+
+@router.get("/tasks")
+async def export_tasks(
+    request: Request,
+    db: Db,
+    project: str = _ProjectQuery,
+    status: str | None = Query(None, description="Filter by status"),
+    since: str | None = Query(None, description="Only tasks updated at or after this ISO timestamp"),
+    until: str | None = Query(None, description="Only tasks updated before this ISO timestamp"),
+    after: str | None = Query(
+        None, description="Resume after this task, as 'project_id/task_id' of the last one received"
+    ),
+) -> StreamingResponse:
+    """Stream tasks as NDJSON in (project_id, id) order.
+
+    Rows are shaped like `/api/board` tasks. To resume an interrupted export,
+    repeat the request with `after` set to the last line's `project_id/id`.
+    Sent gzip-compressed when the client accepts it.
+    """
+    conditions: list[str] = []
+    params: list[Any] = []
+    if project != "all":
+        conditions.append("t.project_id = ?")
+        params.append(project)
+    if status:
+        conditions.append("t.status = ?")
+        params.append(status)
+    if since:
+        conditions.append("t.updated_at >= ?")
+        params.append(since)
+    if until:
+        conditions.append("t.updated_at < ?")
+        params.append(until)
+
+    position: tuple[Any, ...] | None = None
+    if after is not None:
+        # Project IDs are slugs, so the first '/' separates them from the task ID
+        project_id, separator, task_id = after.partition("/")
+        if not separator:
+            raise HTTPException(status_code=400, detail="'after' must be 'project_id/task_id'")
+        position = (project_id, task_id)
+
+    source = "tasks t CROSS JOIN projects p ON t.project_id = p.id"
+    lines = _batches(db, source, _line("t", TASK_COLUMNS), conditions, params, ("t.project_id", "t.id"), position)
+    return _ndjson_response(request, lines)
+
+
+def _line(alias: str, columns: tuple[str, ...]) -> str:
+    """SQL rendering a row as its JSON line, plus the project name, as the JSON routes would return it."""
+    pairs = ", ".join(f"'{column}', {alias}.{column}" for column in columns)
+    return f"json_object({pairs}, 'project_name', p.name)"
+
+
+async def _batches(
+    db: Database,
+    source: str,
+    line: str,
+    conditions: list[str],
+    params: list[Any],
+    key: tuple[str, str],
+    position: tuple[Any, ...] | None,
+) -> AsyncIterator[bytes]:
+    """Page through `source` in `key` order, yielding each batch of `line`s as NDJSON bytes.
+
+    Each batch is its own short keyset query, so a slow client never holds a pool
+    connection or a read transaction open between batches, and memory is bounded
+    by one batch. Lines are rendered by SQLite (`json_object`) on the connection's
+    thread rather than built as dicts and serialized on the event loop. Starts
+    after `position`, a value for each `key` column, if given.
+    """
+    order = ", ".join(key)
+    while True:
+        where = list(conditions)
+        args = list(params)
+        if position is not None:
+            where.append(f"({order}) > (?, ?)")
+            args.extend(position)
+        clause = f"WHERE {' AND '.join(where)}" if where else ""
+        async with db.reader() as conn:
+            cursor = await conn.execute(
+                f"SELECT {order}, {line} FROM {source} {clause} ORDER BY {order} LIMIT ?", [*args, EXPORT_BATCH]
+            )
+            rows = list(await cursor.fetchall())
+        if rows:
+            yield ("\n".join(row[2] for row in rows) + "\n").encode()
+        if len(rows) < EXPORT_BATCH:
+            return
+        position = (rows[-1][0], rows[-1][1])
+
+
+def _ndjson_response(request: Request, chunks: AsyncIterator[bytes]) -> StreamingResponse:
+    """Stream NDJSON chunks, gzip-compressed when the request's Accept-Encoding allows it."""
+    headers = {"Vary": "Accept-Encoding", "Cache-Control": "no-store"}
+    if _accepts_gzip(request.headers.get("accept-encoding", "")):
+        headers["Content-Encoding"] = "gzip"
+        chunks = _gzip(chunks)
+    return StreamingResponse(chunks, media_type="application/x-ndjson", headers=headers)
+
+
+async def _gzip(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    compressor = zlib.compressobj(GZIP_LEVEL, wbits=31)
+    async for chunk in chunks:
+        # Flush each batch so the client receives whole rows as they are produced
+        yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """Whether an Accept-Encoding header allows gzip, by name or as '*', with a non-zero q."""
+    for coding in accept_encoding.split(","):
+        name, *params = (part.strip() for part in coding.split(";"))
+        if name.lower() in ("gzip", "*"):
+            q = next((param[2:] for param in params if param.startswith("q=")), "1")
+            try:
+                return float(q) > 0
+            except ValueError:
+                return False
+    return False
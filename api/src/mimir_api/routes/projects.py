@@ -2,51 +2,68 @@
 
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Literal
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 
-from mimir_api.dependencies import get_db
+from mimir_api.boardview import decode_position
+from mimir_api.cache import cached_body, cached_json
+from mimir_api.dependencies import Db  # noqa: TC001 — FastAPI resolves it at runtime
 
 router = APIRouter(prefix="/api", tags=["projects"])
 
 
 @router.get("/projects")
-async def list_projects() -> list[dict[str, Any]]:
+async def list_projects(request: Request, db: Db) -> Response:
     """List all discovered Ullr projects with story counts."""
-    db = get_db()
-    cursor = await db.conn.execute(
-        "SELECT id, name, path, branch_name, description, total_stories, done_stories, last_synced "
-        "FROM projects ORDER BY name"
-    )
-    rows = await cursor.fetchall()
-    return [dict(row) for row in rows]
+
+    async def build() -> list[dict[str, Any]]:
+        async with db.reader() as conn:
+            cursor = await conn.execute(
+                "SELECT id, name, path, branch_name, description, total_stories, done_stories, last_synced "
+                "FROM projects ORDER BY name"
+            )
+            rows = await cursor.fetchall()
+        return [dict(row) for row in rows]
+
+    return await cached_json(request, db.generations, build)
 
 
 @router.get("/projects/{project_id}")
-async def get_project(project_id: str) -> dict[str, Any]:
+async def get_project(request: Request, db: Db, project_id: str) -> Response:
     """Get a single project's details."""
-    db = get_db()
-    cursor = await db.conn.execute(
-        "SELECT id, name, path, branch_name, description, total_stories, done_stories, last_synced "
-        "FROM projects WHERE id = ?",
-        (project_id,),
-    )
-    row = await cursor.fetchone()
-    if row is None:
-        from fastapi import HTTPException
 
-        raise HTTPException(status_code=404, detail=f"Project {project_id} not found")
-    return dict(row)
+    async def build() -> dict[str, Any]:
+        async with db.reader() as conn:
+            cursor = await conn.execute(
+                "SELECT id, name, path, branch_name, description, total_stories, done_stories, last_synced "
+                "FROM projects WHERE id = ?",
+                (project_id,),
+            )
+            row = await cursor.fetchone()
+        if row is None:
+            raise HTTPException(status_code=404, detail=f"Project {project_id} not found")
+        return dict(row)
+
+    return await cached_json(request, db.generations, build, project_id)
 
 
 @router.get("/board")
 async def get_board(
+    request: Request,
+    db: Db,
     project: str = Query("all", description="Project ID or 'all'"),
     status: str | None = Query(None, description="Filter by status"),
-) -> dict[str, Any]:
+    limit: int | None = Query(
+        None, ge=1, le=500, description="Summary mode: only the first N tasks of each column, plus counts and cursors"
+    ),
+) -> Response:
     """Get the Kanban board: tasks grouped by status column.
 
+    Served from the in-memory board view (`db.board`), without querying SQLite
+    unless a project changed since the view last synced. Tasks within a column are
+    ordered by priority, then most recently updated, then project and task ID.
+
     Returns:
         {
             "columns": {
@@ -58,45 +75,45 @@ async def get_board(
             "total": int,
             "done_count": int
         }
+
+    With `limit` (summary mode), each column holds only its first `limit` tasks,
+    and the response adds `counts` (every column's full task count) and `cursors`
+    (per column, the `after` cursor for `/api/board/column` to load the rest, or
+    null when the column is complete).
+    """
+
+    async def build() -> bytes:
+        await db.board.sync()
+        project_id = None if project == "all" else project
+        if limit is None:
+            return db.board.render(project_id, status)
+        return db.board.summary(project_id, status, limit)
+
+    return await cached_body(request, db.generations, build, None if project == "all" else project)
+
+
+@router.get("/board/column")
+async def get_board_column(
+    db: Db,
+    status: Literal["backlog", "in_progress", "blocked", "done"] = Query(description="Column"),
+    project: str = Query("all", description="Project ID or 'all'"),
+    limit: int = Query(50, ge=1, le=500),
+    after: str | None = Query(None, description="Page cursor: tasks after this one (from X-Next-Cursor or `cursors`)"),
+) -> Response:
+    """Get one board column's tasks, a page at a time, in board order.
+
+    Pages come from the in-memory board view with a keyset cursor, so a page
+    costs a bisect however deep into the column it is. `X-Next-Cursor` is set
+    while more tasks follow; pass it as `after`.
     """
-    db = get_db()
-
-    conditions: list[str] = []
-    params: list[str] = []
-
-    if project != "all":
-        conditions.append("t.project_id = ?")
-        params.append(project)
-    if status:
-        conditions.append("t.status = ?")
-        params.append(status)
-
-    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
-
-    cursor = await db.conn.execute(
-        f"""SELECT t.*, p.name as project_name
-            FROM tasks t
-            JOIN projects p ON t.project_id = p.id
-            {where}
-            ORDER BY t.priority ASC, t.updated_at DESC""",
-        params,
-    )
-    rows = await cursor.fetchall()
-
-    columns: dict[str, list[dict[str, Any]]] = {
-        "backlog": [],
-        "in_progress": [],
-        "blocked": [],
-        "done": [],
-    }
-
-    for row in rows:
-        task = dict(row)
-        col = task.get("status", "backlog")
-        if col in columns:
-            columns[col].append(task)
-
-    total = sum(len(tasks) for tasks in columns.values())
-    done_count = len(columns["done"])
-
-    return {"columns": columns, "total": total, "done_count": done_count}
+    position = None
+    if after is not None:
+        try:
+            position = decode_position(after)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    await db.board.sync()
+    body, next_cursor = db.board.page(None if project == "all" else project, status, position, limit)
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,170 @@
+"""Full-text search API routes."""
+
+from __future__ import annotations
+
+from typing import Any, Literal, NamedTuple
+
+from fastapi import APIRouter, HTTPException, Query, Response
+
+from mimir_api.dependencies import Reader  # noqa: TC001 — FastAPI resolves it at runtime
+from mimir_api.pagination import decode_cursor, encode_cursor
+
+router = APIRouter(prefix="/api", tags=["search"])
+
+
+class _Source(NamedTuple):
+    fts: str
+    join: str
+    project_column: str
+    time_column: str
+    columns: str
+
+
+_SOURCES = {
+    "activity": _Source(
+        "activity_fts",
+        "activity a ON a.id = activity_fts.rowid",
+        "a.project_id",
+        "a.timestamp",
+        """a.id, a.project_id, p.name AS project_name, a.story_id, a.agent_name, a.event_type,
+           NULL AS status, a.summary AS title, a.timestamp""",
+    ),
+    "task": _Source(
+        "tasks_fts",
+        "tasks t ON t.seq = tasks_fts.rowid",
+        "t.project_id",
+        "t.updated_at",
+        """t.id, t.project_id, p.name AS project_name, t.story_id, t.assigned_agent AS agent_name,
+           NULL AS event_type, t.status, t.title, t.updated_at AS timestamp""",
+    ),
+}
+
+
+@router.get("/search")
+async def search(
+    conn: Reader,
+    response: Response,
+    q: str = Query(
+        ...,
+        min_length=1,
+        description="Search terms, all of which must match; end a term with * to match it as a prefix",
+    ),
+    kind: Literal["all", "activity", "task"] = Query("all", description="Search activity, tasks, or both"),
+    project: str = Query("all", description="Project ID or 'all'"),
+    since: str | None = Query(None, description="Only results at or after this ISO timestamp"),
+    until: str | None = Query(None, description="Only results before this ISO timestamp"),
+    limit: int = Query(20, ge=1, le=100),
+    after: str | None = Query(None, description="Page cursor: results ranked after this (from X-Next-Cursor)"),
+) -> list[dict[str, Any]]:
+    """Full-text search over activity summaries/metadata and task titles/descriptions, best match first.
+
+    Results are ranked by bm25 and carry a `snippet` with matches wrapped in
+    `<mark>`…`</mark>` (the rest of the snippet is unescaped text). Time filters
+    apply to an activity event's `timestamp` and a task's `updated_at`. Pages are
+    keyset-paged on (rank, kind, row); pass `X-Next-Cursor` back as `after`.
+    """
+    match = _match_expression(q)
+    if not match:
+        raise HTTPException(status_code=400, detail="Query has no search terms")
+
+    position: list[Any] | None = None
+    if after:
+        try:
+            position = _position(after)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    sources = {name: source for name, source in _SOURCES.items() if kind in ("all", name)}
+    filtered = project != "all" or since or until
+
+    # Rank from the FTS index alone: the base table is only joined when a filter needs
+    # it, and CROSS JOIN keeps the MATCH as the outer loop (otherwise SQLite may walk a
+    # project's rows and probe the index once per row). Title weighs 4x the body.
+    branches: list[str] = []
+    params: list[Any] = []
+    for name, source in sources.items():
+        fts = source.fts
+        rank = f"bm25({fts}, 4.0, 1.0)"
+        conditions = [f"{fts} MATCH ?"]
+        params.append(match)
+        if project != "all":
+            conditions.append(f"{source.project_column} = ?")
+            params.append(project)
+        if since:
+            conditions.append(f"{source.time_column} >= ?")
+            params.append(since)
+        if until:
+            conditions.append(f"{source.time_column} < ?")
+            params.append(until)
+        if position is not None:
+            conditions.append(f"({rank}, '{name}', {fts}.rowid) > (?, ?, ?)")
+            params.extend(position)
+        join = f" CROSS JOIN {source.join}" if filtered else ""
+        branches.append(
+            f"SELECT '{name}' AS kind, {fts}.rowid AS key, {rank} AS rank FROM {fts}{join} WHERE "
+            + " AND ".join(conditions)
+        )
+    params.append(limit)
+    cursor = await conn.execute(
+        f"SELECT * FROM ({' UNION ALL '.join(branches)}) ORDER BY rank, kind, key LIMIT ?",
+        params,
+    )
+    page = list(await cursor.fetchall())
+    if not page:
+        return []
+
+    # Then fetch rows and snippets for the page only (snippet() needs the MATCH in the same query)
+    details: dict[tuple[str, int], dict[str, Any]] = {}
+    for name, source in sources.items():
+        keys = [row["key"] for row in page if row["kind"] == name]
+        if not keys:
+            continue
+        fts = source.fts
+        cursor = await conn.execute(
+            f"""SELECT {fts}.rowid AS key, {source.columns},
+                       snippet({fts}, -1, '<mark>', '</mark>', '…', 16) AS snippet
+                FROM {fts}
+                CROSS JOIN {source.join}
+                JOIN projects p ON p.id = {source.project_column}
+                WHERE {fts} MATCH ? AND {fts}.rowid IN ({", ".join("?" * len(keys))})""",
+            [match, *keys],
+        )
+        for row in await cursor.fetchall():
+            detail = dict(row)
+            details[(name, detail.pop("key"))] = detail
+
+    results = []
+    for row in page:
+        found = details.get((row["kind"], row["key"]))
+        if found is not None:  # Removed between the two queries
+            results.append({"kind": row["kind"], **found, "rank": row["rank"]})
+    last = page[-1]
+    response.headers["X-Next-Cursor"] = encode_cursor(last["rank"], last["kind"], last["key"])
+    return results
+
+
+def _position(after: str) -> list[Any]:
+    """Decode a search cursor, raising ValueError unless it holds a numeric rank, a known kind and a row ID."""
+    rank, kind, key = position = decode_cursor(after, 3)
+    if (
+        not isinstance(rank, int | float)
+        or isinstance(rank, bool)
+        or not isinstance(kind, str)
+        or kind not in _SOURCES
+        or not isinstance(key, int)
+        or isinstance(key, bool)
+    ):
+        msg = "Invalid cursor"
+        raise ValueError(msg)
+    return position
+
+
+def _match_expression(q: str) -> str:
+    """Turn free text into an FTS5 query: each term quoted (so punctuation can't be syntax), all required."""
+    terms = []
+    for term in q.split():
+        prefix = term.endswith("*")
+        term = term.rstrip("*")
+        if term:
+            terms.append('"' + term.replace('"', '""') + '"' + ("*" if prefix else ""))
+    return " ".join(terms)
@@ -0,0 +1,257 @@
+"""Analytics API routes, served from the rollup tables ingestion maintains (see rollups.py)."""
+
+from __future__ import annotations
+
+from typing import Any, Literal
+
+from fastapi import APIRouter, Query, Request, Response
+
+from mimir_api.cache import cached_json
+from mimir_api.dependencies import Db  # noqa: TC001 — FastAPI resolves it at runtime
+
+router = APIRouter(prefix="/api/stats", tags=["stats"])
+
+# Bucket expressions by interval; rollup buckets are UTC hours 'YYYY-MM-DDTHH'
+_INTERVALS = {"hour": "bucket", "day": "substr(bucket, 1, 10)"}
+
+# A story's cycle time in seconds; NULL while it is open
+_CYCLE_SECONDS = "(julianday(finished_at) - julianday(started_at)) * 86400"
+
+_ProjectQuery = Query("all", description="Project ID or 'all'")
+_SinceQuery = Query(None, description="Start of the range (inclusive), ISO timestamp")
+_UntilQuery = Query(None, description="End of the range (exclusive), ISO timestamp")
+_IntervalQuery = Query("day", description="Bucket size")
+
+
+@router.get("/activity")
+async def activity_stats(
+    request: Request,
+    db: Db,
+    project: str = _ProjectQuery,
+    agent: str | None = Query(None, description="Only this agent's events"),
+    since: str | None = _SinceQuery,
+    until: str | None = _UntilQuery,
+    interval: Literal["hour", "day"] = _IntervalQuery,
+) -> Response:
+    """Activity event counts per time bucket and event type.
+
+    Buckets are UTC hours or days; range bounds are compared against bucket starts.
+    """
+
+    async def build() -> list[dict[str, Any]]:
+        where, params = _rollup_filters(project, since, until, agent)
+        async with db.reader() as conn:
+            cursor = await conn.execute(
+                f"""SELECT {_INTERVALS[interval]} AS bucket, event_type, SUM(events) AS events
+                    FROM activity_rollup {where}
+                    GROUP BY 1, 2
+                    ORDER BY 1, 2""",
+                params,
+            )
+            rows = await cursor.fetchall()
+        return [dict(row) for row in rows]
+
+    return await cached_json(request, db.generations, build, None if project == "all" else project)
+
+
+@router.get("/throughput")
+async def agent_throughput(
+    request: Request,
+    db: Db,
+    project: str = _ProjectQuery,
+    since: str | None = _SinceQuery,
+    until: str | None = _UntilQuery,
+    interval: Literal["hour", "day"] = _IntervalQuery,
+) -> Response:
+    """Per-agent throughput per time bucket: activity events, tasks started and tasks done.
+
+    Tasks started and done count transitions into in_progress and done, attributed
+    to the task's assigned agent at the time.
+    """
+
+    async def build() -> list[dict[str, Any]]:
+        where, params = _rollup_filters(project, since, until)
+        bucket = _INTERVALS[interval]
+        async with db.reader() as conn:
+            cursor = await conn.execute(
+                f"""SELECT {bucket} AS bucket, agent_name, SUM(events) AS events
+                    FROM activity_rollup {where}
+                    GROUP BY 1, 2""",
+                params,
+            )
+            events = await cursor.fetchall()
+            cursor = await conn.execute(
+                f"""SELECT {bucket} AS bucket, agent_name,
+                           SUM(CASE WHEN to_status = 'in_progress' THEN transitions ELSE 0 END) AS started,
+                           SUM(CASE WHEN to_status = 'done' THEN transitions ELSE 0 END) AS done
+                    FROM transition_rollup {where}
+                    GROUP BY 1, 2""",
+                params,
+            )
+            moves = await cursor.fetchall()
+
+        merged: dict[tuple[str, str], dict[str, Any]] = {}
+        for row in events:
+            key = (row["bucket"], row["agent_name"])
+            merged[key] = {"bucket": key[0], "agent_name": key[1], "events": row["events"], "started": 0, "done": 0}
+        for row in moves:
+            key = (row["bucket"], row["agent_name"])
+            entry = merged.setdefault(key, {"bucket": key[0], "agent_name": key[1], "events": 0})
+            entry["started"] = row["started"]
+            entry["done"] = row["done"]
+        return [merged[key] for key in sorted(merged)]
+
+    return await cached_json(request, db.generations, build, None if project == "all" else project)
+
+
+@router.get("/cycle-time")
+async def cycle_time(
+    request: Request,
+    db: Db,
+    project: str = _ProjectQuery,
+    since: str | None = Query(None, description="Only stories finished at or after this ISO timestamp"),
+    until: str | None = Query(None, description="Only stories finished before this ISO timestamp"),
+    limit: int = Query(100, ge=1, le=1000, description="Most recently finished stories to list"),
+) -> Response:
+    """Story cycle time: from a story's first task leaving the backlog to its last task reaching done.
+
+    Returns summary statistics over every story finished in the range, plus the
+    most recently finished `limit` stories. Stories still open are not included.
+    """
+
+    async def build() -> dict[str, Any]:
+        # Timestamps julianday() can't parse give no cycle time, and are left out like open stories
+        conditions = ["finished_at IS NOT NULL", f"{_CYCLE_SECONDS} IS NOT NULL"]
+        params: list[Any] = []
+        if project != "all":
+            conditions.append("project_id = ?")
+            params.append(project)
+        if since:
+            conditions.append("finished_at >= ?")
+            params.append(since)
+        if until:
+            conditions.append("finished_at < ?")
+            params.append(until)
+        where = " AND ".join(conditions)
+        async with db.reader() as conn:
+            # Summarized in SQL, so only the listed stories and one row per percentile reach Python
+            cursor = await conn.execute(
+                f"SELECT COUNT(*), ROUND(AVG({_CYCLE_SECONDS}), 3) FROM story_cycles WHERE {where}", params
+            )
+            count, mean = await cursor.fetchone() or (0, None)
+            percentiles: dict[str, float | None] = {"p50_seconds": None, "p90_seconds": None}
+            for name, fraction in (("p50_seconds", 0.5), ("p90_seconds", 0.9)):
+                if not count:
+                    break
+                # Nearest rank: the story at that offset in cycle time order
+                cursor = await conn.execute(
+                    f"""SELECT ROUND({_CYCLE_SECONDS}, 3) FROM story_cycles WHERE {where}
+                        ORDER BY {_CYCLE_SECONDS} LIMIT 1 OFFSET ?""",
+                    [*params, min(count - 1, int(fraction * count))],
+                )
+                row = await cursor.fetchone()
+                percentiles[name] = row[0] if row else None
+            cursor = await conn.execute(
+                f"""SELECT project_id, story_id, started_at, finished_at,
+                           ROUND({_CYCLE_SECONDS}, 3) AS cycle_seconds
+                    FROM story_cycles
+                    WHERE {where}
+                    ORDER BY finished_at DESC
+                    LIMIT ?""",
+                [*params, limit],
+            )
+            stories = [dict(row) for row in await cursor.fetchall()]
+
+        return {"count": count, "mean_seconds": mean, **percentiles, "stories": stories}
+
+    return await cached_json(request, db.generations, build, None if project == "all" else project)
+
+
+@router.get("/burndown")
+async def burndown(
+    request: Request,
+    db: Db,
+    project: str = _ProjectQuery,
+    since: str | None = Query(None, description="First day (YYYY-MM-DD, UTC)"),
+    until: str | None = Query(None, description="Day to stop before (YYYY-MM-DD, UTC)"),
+) -> Response:
+    """Daily burndown: task and story totals and done counts at the end of each UTC day.
+
+    A point is recorded on each day a project's taskboard or PRD changed. For
+    `project=all`, each project's latest earlier point carries forward into days on
+    which it did not change, so the sums stay continuous.
+    """
+
+    async def build() -> list[dict[str, Any]]:
+        scope, scope_params = (["project_id = ?"], [project]) if project != "all" else ([], [])
+        conditions, params = list(scope), list(scope_params)
+        if since:
+            conditions.append("day >= ?")
+            params.append(since)
+        if until:
+            conditions.append("day < ?")
+            params.append(until)
+        columns = "day, project_id, tasks_total, tasks_done, stories_total, stories_done"
+        async with db.reader() as conn:
+            cursor = await conn.execute(f"SELECT {columns} FROM burndown {_where(conditions)} ORDER BY day", params)
+            rows = await cursor.fetchall()
+            carried: list[Any] = []
+            if since:
+                # Each project's last point before the range is where its line starts
+                cursor = await conn.execute(
+                    f"""SELECT {columns} FROM burndown
+                        JOIN (SELECT project_id, MAX(day) AS day FROM burndown
+                              {_where([*scope, "day < ?"])} GROUP BY project_id) USING (project_id, day)""",
+                    [*scope_params, since],
+                )
+                carried = list(await cursor.fetchall())
+
+        latest: dict[str, tuple[int, ...]] = {row["project_id"]: tuple(row)[2:] for row in carried}
+        totals = [sum(column) for column in zip(*latest.values(), strict=True)] or [0, 0, 0, 0]
+        points: list[dict[str, Any]] = []
+        for row in rows:
+            counts = tuple(row)[2:]
+            previous = latest.get(row["project_id"], (0, 0, 0, 0))
+            totals = [total - old + new for total, old, new in zip(totals, previous, counts, strict=True)]
+            latest[row["project_id"]] = counts
+            tasks_total, tasks_done, stories_total, stories_done = totals
+            point = {
+                "day": row["day"],
+                "tasks_total": tasks_total,
+                "tasks_done": tasks_done,
+                "tasks_remaining": tasks_total - tasks_done,
+                "stories_total": stories_total,
+                "stories_done": stories_done,
+            }
+            if points and points[-1]["day"] == row["day"]:
+                points[-1] = point
+            else:
+                points.append(point)
+        return points
+
+    return await cached_json(request, db.generations, build, None if project == "all" else project)
+
+
+def _rollup_filters(
+    project: str, since: str | None, until: str | None, agent: str | None = None
+) -> tuple[str, list[Any]]:
+    """WHERE clause and params shared by the bucketed rollup queries."""
+    conditions: list[str] = []
+    params: list[Any] = []
+    if project != "all":
+        conditions.append("project_id = ?")
+        params.append(project)
+    if agent is not None:
+        conditions.append("agent_name = ?")
+        params.append(agent)
+    if since:
+        conditions.append("bucket >= ?")
+        params.append(since[:13])
+    if until:
+        conditions.append("bucket < ?")
+        params.append(until[:13])
+    return _where(conditions), params
+
+
+def _where(conditions: list[str]) -> str:
+    return f"WHERE {' AND '.join(conditions)}" if conditions else ""
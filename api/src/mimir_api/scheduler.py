@@ -0,0 +1,117 @@
+"""Coalescing, single-flight scheduler for project re-ingestion."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+    from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+class IngestScheduler:
+    """Debounces change notifications per project and runs at most one ingest per project.
+
+    Watcher threads call `notify_threadsafe`; everything else runs on the event loop.
+    A notification starts (or restarts) a per-project debounce timer. When the timer
+    fires the project is ingested, unless it is already being ingested, in which case
+    the project is marked dirty and a single follow-up run starts once the current one
+    finishes. A semaphore bounds how many projects ingest concurrently.
+    """
+
+    def __init__(
+        self,
+        runner: Callable[[Path], Awaitable[None]],
+        debounce_seconds: float = 0.5,
+        max_concurrency: int = 4,
+    ) -> None:
+        self._runner = runner
+        self._debounce_seconds = debounce_seconds
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._timers: dict[Path, asyncio.TimerHandle] = {}
+        self._running: dict[Path, asyncio.Task[None]] = {}
+        self._dirty: set[Path] = set()
+        self._closed = False
+
+        self.events = 0
+        self.coalesced = 0
+        self.runs = 0
+
+    def start(self) -> None:
+        """Bind the scheduler to the running event loop."""
+        self._loop = asyncio.get_running_loop()
+
+    def notify_threadsafe(self, project_path: Path) -> None:
+        """Schedule a re-ingest from a non-loop thread (e.g. a watchdog observer)."""
+        if self._loop is None or self._loop.is_closed():
+            return
+        self._loop.call_soon_threadsafe(self.notify, project_path)
+
+    def notify(self, project_path: Path) -> None:
+        """Record a change to a project and (re)start its debounce timer."""
+        if self._closed or self._loop is None:
+            return
+        self.events += 1
+
+        if project_path in self._running:
+            if project_path in self._dirty:
+                self.coalesced += 1
+            self._dirty.add(project_path)
+            return
+
+        timer = self._timers.pop(project_path, None)
+        if timer is not None:
+            timer.cancel()
+            self.coalesced += 1
+        self._timers[project_path] = self._loop.call_later(self._debounce_seconds, self._fire, project_path)
+
+    async def close(self) -> None:
+        """Cancel pending timers and wait for in-flight ingests to finish."""
+        self._closed = True
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+        self._dirty.clear()
+        if self._running:
+            await asyncio.gather(*self._running.values(), return_exceptions=True)
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Counters for events received, events coalesced, and ingest runs."""
+        return {
+            "events": self.events,
+            "coalesced": self.coalesced,
+            "runs": self.runs,
+            "pending": len(self._timers),
+            "running": len(self._running),
+        }
+
+    def _fire(self, project_path: Path) -> None:
+        self._timers.pop(project_path, None)
+        if project_path in self._running:
+            self._dirty.add(project_path)
+            return
+        self._start(project_path)
+
+    def _start(self, project_path: Path) -> None:
+        self._running[project_path] = asyncio.get_running_loop().create_task(self._execute(project_path))
+
+    async def _execute(self, project_path: Path) -> None:
+        try:
+            async with self._semaphore:
+                while True:
+                    self._dirty.discard(project_path)
+                    self.runs += 1
+                    try:
+                        await self._runner(project_path)
+                    except Exception:
+                        logger.exception("Failed to re-ingest %s", project_path)
+                    if project_path not in self._dirty or self._closed:
+                        break
+        finally:
+            self._running.pop(project_path, None)
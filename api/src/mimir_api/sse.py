@@ -3,57 +3,367 @@
 from __future__ import annotations
 
 import asyncio
+import itertools
 import json
 import logging
-from typing import TYPE_CHECKING, Any
+import time
+from collections import OrderedDict, deque
+from typing import TYPE_CHECKING, Any, NamedTuple
 
 if TYPE_CHECKING:
-    from collections.abc import AsyncGenerator
+    from collections.abc import AsyncGenerator, Awaitable, Callable, Iterable
 
 logger = logging.getLogger(__name__)
 
 
+class Event(NamedTuple):
+    """A published event, encoded once to its SSE wire bytes and shared by every subscriber."""
+
+    id: int
+    event: str
+    topic: str
+    project: str | None
+    wire: bytes
+    published_at: float
+
+
+class EventRecord(NamedTuple):
+    """An event as handed to a `persist_with` store: type, data and whether it conflates."""
+
+    event: str
+    data: dict[str, Any]
+    conflate: bool
+
+
+def encode_event(event_id: int, event_type: str, data: dict[str, Any], topic: str) -> Event:
+    """Serialize an event to its `id:`/`event:`/`data:` lines, once."""
+    wire = f"id: {event_id}\nevent: {event_type}\ndata: {json.dumps(data)}\n\n".encode()
+    return Event(event_id, event_type, topic, data.get("project_id"), wire, time.monotonic())
+
+
+class Subscriber:
+    """One SSE client's read position in the bus, conflating by topic while it lags.
+
+    Subscribers do not get a copy of each event. They keep a cursor (the last event
+    ID taken from the bus) and, when woken, pull everything newer from the bus's
+    shared buffer. Pulled events are keyed by topic (event type plus project): a
+    newer event replaces an undelivered one on the same topic, so a slow client only
+    ever holds the latest state per topic. A client that falls behind the buffer
+    entirely gets a single `resync` event, and so does one whose undelivered events
+    (deltas, which never conflate) outgrow the buffer's own count or byte bound.
+
+    With `projects` set, events about other projects are skipped; events that are
+    not about a single project are always delivered.
+    """
+
+    def __init__(
+        self,
+        bus: EventBus,
+        subscriber_id: int,
+        cursor: int,
+        projects: frozenset[str] | None = None,
+    ) -> None:
+        self.id = subscriber_id
+        self.connected_at = time.time()
+        self.delivered = 0
+        self.conflated = 0
+        self.resyncs = 0
+        self.last_event_id: int | None = None
+        self._bus = bus
+        self._cursor = cursor
+        self._projects = projects
+        self._pending: OrderedDict[str, Event] = OrderedDict()
+        self._pending_bytes = 0
+
+    def offer(self, event: Event) -> None:
+        """Queue an event, replacing any undelivered event on the same topic."""
+        replaced = self._pending.pop(event.topic, None)
+        if replaced is not None:
+            self._pending_bytes -= len(replaced.wire)
+            self.conflated += 1
+        # Re-append so events stay in ID order
+        self._pending[event.topic] = event
+        self._pending_bytes += len(event.wire)
+
+    async def next(self, timeout: float | None = None) -> Event | None:
+        """Wait for the next event, or return None after `timeout` seconds with nothing pending."""
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        while True:
+            self._pull()
+            if self._pending:
+                _, event = self._pending.popitem(last=False)
+                self._pending_bytes -= len(event.wire)
+                self.delivered += 1
+                self.last_event_id = event.id
+                return event
+            # Woken by an event for another project: keep waiting out the remaining time
+            remaining = None if deadline is None else deadline - loop.time()
+            if (remaining is not None and remaining <= 0) or not await self._bus.wait(self._cursor, remaining):
+                return None
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """Delivery counters and how far behind this client is."""
+        oldest = next(iter(self._pending.values()), None) or self._bus.after(self._cursor)
+        return {
+            "id": self.id,
+            "connected_seconds": round(time.time() - self.connected_at, 1),
+            "delivered": self.delivered,
+            "conflated": self.conflated,
+            "resyncs": self.resyncs,
+            "pending": len(self._pending) + self._bus.last_id - self._cursor,
+            "lag_seconds": round(time.monotonic() - oldest.published_at, 3) if oldest is not None else 0.0,
+            "last_event_id": self.last_event_id,
+        }
+
+    def _pull(self) -> None:
+        """Take every event published since the cursor from the bus."""
+        if self._cursor == self._bus.last_id:
+            return
+        missed = self._bus.replay(self._cursor)
+        if missed is None:
+            self._resync()
+        else:
+            for event in missed:
+                if self._projects is None or event.project is None or event.project in self._projects:
+                    self.offer(event)
+            if self._bus.overflows(len(self._pending), self._pending_bytes):
+                self._resync()
+        self._cursor = self._bus.last_id
+
+    def _resync(self) -> None:
+        """Drop everything undelivered for a single `resync` event."""
+        self._pending.clear()
+        self._pending_bytes = 0
+        self.resyncs += 1
+        self.offer(self._bus.resync_event())
+
+
 class EventBus:
     """Simple in-process pub/sub for SSE events.
 
     The watcher publishes events here; SSE endpoint subscribers receive them.
+
+    Every event gets a monotonically increasing ID and is encoded to SSE bytes once.
+    The most recent events are kept in a buffer bounded by both count and bytes; it
+    is both the log subscribers read from (see `Subscriber`) and the replay buffer
+    for clients reconnecting with `Last-Event-ID`. Publishing appends to the buffer
+    and sets one shared `asyncio.Event`; it never touches subscriber state, so a
+    slow client cannot slow it down.
+
+    IDs are seeded from the wall clock at startup, so IDs handed out by an earlier
+    process always fall before the buffer and trigger a resync rather than a wrong
+    replay. With several workers, IDs come from the shared event log instead (see
+    `persist_with`, `seek` and `deliver`).
     """
 
-    def __init__(self) -> None:
-        self._subscribers: list[asyncio.Queue[dict[str, Any]]] = []
+    def __init__(self, replay_events: int = 1000, replay_bytes: int = 1_048_576) -> None:
+        self._subscribers: dict[int, Subscriber] = {}
+        self._subscriber_ids = itertools.count(1)
+        self.published = 0
+        self._replay: deque[Event] = deque()
+        self._replay_events = replay_events
+        self._replay_bytes = replay_bytes
+        self._buffered_bytes = 0
+        self._next_id = time.time_ns() // 1_000_000
+        self._wakeup = asyncio.Event()
+        self._store: Callable[[list[EventRecord]], Awaitable[list[int]]] | None = None
+        self._store_lock = asyncio.Lock()
+        # Published events waiting for the store, each with the future its publisher awaits
+        self._unstored: list[tuple[EventRecord, asyncio.Future[None]]] = []
 
-    def subscribe(self) -> asyncio.Queue[dict[str, Any]]:
-        """Create a new subscriber queue."""
-        queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(maxsize=100)
-        self._subscribers.append(queue)
-        return queue
+    def configure(self, replay_events: int, replay_bytes: int) -> None:
+        """Resize the replay buffer (called from the app lifespan once config is loaded)."""
+        self._replay_events = replay_events
+        self._replay_bytes = replay_bytes
+        self._trim()
 
-    def unsubscribe(self, queue: asyncio.Queue[dict[str, Any]]) -> None:
-        """Remove a subscriber queue."""
-        self._subscribers = [q for q in self._subscribers if q is not queue]
+    @property
+    def last_id(self) -> int:
+        """ID of the most recently published event."""
+        return self._next_id - 1
 
-    async def publish(self, event_type: str, data: dict[str, Any] | None = None) -> None:
-        """Push an event to all subscribers."""
-        event = {"event": event_type, "data": data or {}}
-        dead: list[asyncio.Queue[dict[str, Any]]] = []
+    def subscribe(self, last_event_id: str | None = None, projects: Iterable[str] | None = None) -> Subscriber:
+        """Create a new subscriber, starting after the latest event.
 
-        for queue in self._subscribers:
-            try:
-                queue.put_nowait(event)
-            except asyncio.QueueFull:
-                dead.append(queue)
-                logger.warning("Dropping slow SSE subscriber")
+        A reconnecting client that passes its `Last-Event-ID` starts from there instead
+        and is sent what it missed, or a single `resync` event if that is no longer
+        buffered. `projects` limits project events to those project IDs.
+        """
+        subscriber = Subscriber(
+            self,
+            next(self._subscriber_ids),
+            self.last_id,
+            frozenset(projects) if projects is not None else None,
+        )
+        if last_event_id is not None:
+            if last_event_id.isdigit() and self.replay(int(last_event_id)) is not None:
+                subscriber._cursor = int(last_event_id)
+            else:
+                subscriber.offer(self.resync_event())
+        self._subscribers[subscriber.id] = subscriber
+        return subscriber
 
-        for queue in dead:
-            self.unsubscribe(queue)
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        """Remove a subscriber."""
+        self._subscribers.pop(subscriber.id, None)
 
-    async def stream(self, queue: asyncio.Queue[dict[str, Any]]) -> AsyncGenerator[str, None]:
-        """Yield SSE-formatted strings from a subscriber queue."""
+    def replay(self, last_event_id: int) -> list[Event] | None:
+        """Events published after `last_event_id`, or None if some are no longer buffered."""
+        if last_event_id == self.last_id:
+            return []
+        if last_event_id > self.last_id or not self._replay:
+            return None
+        # IDs in the buffer are contiguous, so the first missed event is at a known offset
+        start = last_event_id + 1 - self._replay[0].id
+        if start < 0:
+            return None
+        return list(itertools.islice(self._replay, start, None))
+
+    def after(self, last_event_id: int) -> Event | None:
+        """The oldest buffered event after `last_event_id`, if any."""
+        if not self._replay or last_event_id >= self.last_id:
+            return None
+        return self._replay[max(0, last_event_id + 1 - self._replay[0].id)]
+
+    def overflows(self, events: int, size: int) -> bool:
+        """Whether `events` events of `size` bytes in total exceed the replay buffer's bounds."""
+        return events > self._replay_events or size > self._replay_bytes
+
+    def resync_event(self) -> Event:
+        """A `resync` event carrying the latest ID, for clients whose gap is no longer buffered."""
+        return encode_event(self.last_id, "resync", {}, "resync")
+
+    async def wait(self, last_event_id: int, timeout: float | None = None) -> bool:
+        """Wait until an event newer than `last_event_id` is published; False on timeout."""
+        if self.last_id > last_event_id:
+            return True
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout)
+        except TimeoutError:
+            return False
+        return True
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """Bus-wide counters plus per-subscriber lag and conflation."""
+        return {
+            "published": self.published,
+            "last_event_id": self.last_id,
+            "replay_buffered": len(self._replay),
+            "replay_bytes": self._buffered_bytes,
+            "subscribers": [subscriber.stats for subscriber in self._subscribers.values()],
+        }
+
+    def persist_with(self, store: Callable[[list[EventRecord]], Awaitable[list[int]]] | None) -> None:
+        """Persist every published event through `store` first, which returns the events' IDs.
+
+        Used by the leader worker to write events to the shared event log, so that
+        follower workers publish them under the same IDs. Events published while a
+        store is in flight are stored together by the next call, so a burst costs
+        one write rather than one per event.
+        """
+        self._store = store
+
+    def seek(self, last_event_id: int) -> None:
+        """Continue numbering after `last_event_id` (the end of the shared event log)."""
+        self._replay.clear()
+        self._buffered_bytes = 0
+        self._next_id = last_event_id + 1
+
+    async def publish(self, event_type: str, data: dict[str, Any] | None = None, *, conflate: bool = True) -> None:
+        """Push an event to all subscribers.
+
+        State events about a project (`project_id` or `project_path` in `data`)
+        conflate per project; other state events conflate per event type. Pass
+        `conflate=False` for deltas, which are only meaningful if every one arrives.
+        """
+        await self.publish_many([EventRecord(event_type, data or {}, conflate)])
+
+    async def publish_many(self, records: Iterable[EventRecord]) -> None:
+        """Push several events in order, storing them together when persisting (see `publish`)."""
+        store = self._store
+        if store is None:
+            for record in records:
+                self.deliver(self._next_id, record.event, record.data, conflate=record.conflate)
+            return
+        loop = asyncio.get_running_loop()
+        pending = [(record, loop.create_future()) for record in records]
+        self._unstored.extend(pending)
+        # Held across the store so events reach the buffer in ID order; whoever holds it
+        # stores every event queued so far, which may already include these
+        async with self._store_lock:
+            if self._unstored:
+                await self._store_unstored(store)
+        for _, stored in pending:
+            await stored
+
+    async def _store_unstored(self, store: Callable[[list[EventRecord]], Awaitable[list[int]]]) -> None:
+        batch, self._unstored = self._unstored, []
         try:
-            while True:
-                event = await queue.get()
-                event_type = event.get("event", "message")
-                data = json.dumps(event.get("data", {}))
-                yield f"event: {event_type}\ndata: {data}\n\n"
-        except asyncio.CancelledError:
+            event_ids = await store([record for record, _ in batch])
+        except Exception as exc:
+            for _, stored in batch:
+                if not stored.done():
+                    stored.set_exception(exc)
+            return
+        except BaseException:
+            for _, stored in batch:
+                stored.cancel()
+            raise
+        for (record, stored), event_id in zip(batch, event_ids, strict=True):
+            self.deliver(event_id, record.event, record.data, conflate=record.conflate)
+            if not stored.done():
+                stored.set_result(None)
+
+    def deliver(self, event_id: int, event_type: str, data: dict[str, Any], *, conflate: bool = True) -> None:
+        """Buffer an event under a given ID and wake subscribers.
+
+        IDs at or below the last one are ignored. A gap in IDs empties the buffer, since
+        replay relies on buffered IDs being contiguous; clients behind it get a resync.
+        """
+        if event_id <= self.last_id:
             return
+        if event_id != self._next_id:
+            self.seek(event_id - 1)
+        project = data.get("project_id") or data.get("project_path")
+        if not conflate:
+            topic = f"{event_type}#{event_id}"
+        elif project:
+            topic = f"{event_type}:{project}"
+        else:
+            topic = event_type
+        event = encode_event(event_id, event_type, data, topic)
+        self._next_id = event_id + 1
+        self.published += 1
+        self._replay.append(event)
+        self._buffered_bytes += len(event.wire)
+        self._trim()
+
+        # Wake every waiting subscriber at once; later waiters block on a fresh Event
+        wakeup, self._wakeup = self._wakeup, asyncio.Event()
+        wakeup.set()
+
+    async def stream(
+        self,
+        subscriber: Subscriber,
+        is_disconnected: Callable[[], Awaitable[bool]],
+        poll_seconds: float,
+    ) -> AsyncGenerator[bytes, None]:
+        """Yield a subscriber's SSE wire bytes until the client goes away, then unsubscribe it.
+
+        `is_disconnected` is checked between events and at least every `poll_seconds`
+        while idle, so dead connections are torn down even when nothing is published.
+        """
+        try:
+            while not await is_disconnected():
+                event = await subscriber.next(timeout=poll_seconds)
+                if event is not None:
+                    yield event.wire
+        finally:
+            self.unsubscribe(subscriber)
+
+    def _trim(self) -> None:
+        while self._replay and (len(self._replay) > self._replay_events or self._buffered_bytes > self._replay_bytes):
+            self._buffered_bytes -= len(self._replay.popleft().wire)
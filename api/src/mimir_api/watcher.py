@@ -2,16 +2,29 @@
 
 from __future__ import annotations
 
+import ctypes
+import errno
 import logging
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, NamedTuple
 
 from watchdog.events import FileSystemEvent, FileSystemEventHandler
 from watchdog.observers import Observer
 
+from mimir_api.discovery import DEFAULT_IGNORE, scan_directory
+
 if TYPE_CHECKING:
-    import asyncio
-    from collections.abc import Callable
+    from collections.abc import Callable, Iterable
+
+    from watchdog.observers.api import ObservedWatch
 
 logger = logging.getLogger(__name__)
 
@@ -19,47 +32,529 @@ logger = logging.getLogger(__name__)
 WATCHED_FILES = {"taskboard.json", "prd.json", "progress.jsonl", "ullr.yaml"}
 
 
-class UllrFileHandler(FileSystemEventHandler):
-    """Watchdog handler that fires a callback when Ullr files change."""
+# Backends report (kind, path, is_directory) for entries directly inside a watched
+# directory; kind is "created", "deleted", "modified", "moved_from", "moved_to", or
+# "overflow" (events were lost; path is empty)
+_GONE = ("deleted", "moved_from")
+_APPEARED = ("created", "moved_to")
 
-    def __init__(self, callback: Callable[[Path], None]) -> None:
-        self._callback = callback
-        self._debounce_tasks: dict[str, asyncio.TimerHandle] = {}
 
-    def on_modified(self, event: FileSystemEvent) -> None:
-        if event.is_directory:
-            return
-        path = Path(str(event.src_path))
-        if path.name in WATCHED_FILES:
-            self._callback(path)
+class _InotifyBackend:
+    """Linux: one inotify descriptor holding a non-recursive watch per directory, read by one thread.
 
-    def on_created(self, event: FileSystemEvent) -> None:
-        self.on_modified(event)
+    watchdog's observer opens a separate inotify instance and emitter thread for
+    every scheduled path, and `fs.inotify.max_user_instances` defaults to 128, so it
+    cannot hold one watch per project directory. Here every directory is a watch on
+    the same descriptor, bounded only by `max_user_watches`.
 
+    The libc bindings come from watchdog's private `inotify_c` module, which is why
+    watchdog is pinned to an exact version. If that module no longer provides them,
+    this raises ImportError or AttributeError and the watcher uses `_ObserverBackend`.
+    """
 
-class ProjectWatcher:
-    """Watches configured directories for Ullr project file changes."""
+    name = "inotify"
 
-    def __init__(self, watch_paths: list[Path], on_change: Callable[[Path], None]) -> None:
-        self._watch_paths = watch_paths
-        self._on_change = on_change
-        self._observer: Observer | None = None
+    def __init__(self, dispatch: Callable[[str, str, bool], None]) -> None:
+        # Imported here: the module loads libc's inotify functions and fails elsewhere
+        from watchdog.observers.inotify_c import InotifyConstants, inotify_add_watch, inotify_init, inotify_rm_watch
+
+        self._constants = InotifyConstants
+        self._add_watch = inotify_add_watch
+        self._rm_watch = inotify_rm_watch
+        self._mask = (
+            InotifyConstants.IN_CREATE
+            | InotifyConstants.IN_DELETE
+            | InotifyConstants.IN_MODIFY
+            | InotifyConstants.IN_MOVED_FROM
+            | InotifyConstants.IN_MOVED_TO
+            | InotifyConstants.IN_ONLYDIR
+        )
+        self._dispatch = dispatch
+        self._fd = inotify_init()
+        if self._fd == -1:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        self._wakeup_r, self._wakeup_w = os.pipe()
+        self._paths: dict[int, str] = {}  # watch descriptor -> directory
+        self._wds: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def add(self, path: str) -> None:
+        wd = self._add_watch(self._fd, os.fsencode(path), self._mask)
+        if wd == -1:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), path)
+        with self._lock:
+            self._paths[wd] = path
+            self._wds[path] = wd
+
+    def remove(self, path: str) -> None:
+        with self._lock:
+            wd = self._wds.pop(path, None)
+            if wd is None:
+                return
+            self._paths.pop(wd, None)
+        # Fails harmlessly if the directory is already gone (the kernel dropped the watch)
+        self._rm_watch(self._fd, wd)
 
     def start(self) -> None:
-        """Start watching directories for changes."""
+        self._thread = threading.Thread(target=self._run, name="mimir-inotify", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        os.write(self._wakeup_w, b"\0")
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        for fd in (self._fd, self._wakeup_r, self._wakeup_w):
+            os.close(fd)
+
+    def _run(self) -> None:
+        c = self._constants
+        poller = select.poll()
+        poller.register(self._fd, select.POLLIN)
+        poller.register(self._wakeup_r, select.POLLIN)
+        while True:
+            ready = {fd for fd, _ in poller.poll()}
+            if self._wakeup_r in ready:
+                return
+            try:
+                buffer = os.read(self._fd, 65536)
+            except InterruptedError:
+                continue
+            offset = 0
+            while offset < len(buffer):
+                wd, mask, _cookie, length = _INOTIFY_EVENT.unpack_from(buffer, offset)
+                name = buffer[offset + _INOTIFY_EVENT.size : offset + _INOTIFY_EVENT.size + length].rstrip(b"\0")
+                offset += _INOTIFY_EVENT.size + length
+
+                if mask & c.IN_Q_OVERFLOW:
+                    self._dispatch("overflow", "", False)
+                    continue
+                with self._lock:
+                    if mask & c.IN_IGNORED:
+                        # Watch removed, or its directory deleted
+                        path = self._paths.pop(wd, None)
+                        if path is not None and self._wds.get(path) == wd:
+                            del self._wds[path]
+                        continue
+                    parent = self._paths.get(wd)
+                if parent is None or not name:
+                    continue
+                if mask & c.IN_CREATE:
+                    kind = "created"
+                elif mask & c.IN_DELETE:
+                    kind = "deleted"
+                elif mask & c.IN_MOVED_FROM:
+                    kind = "moved_from"
+                elif mask & c.IN_MOVED_TO:
+                    kind = "moved_to"
+                else:
+                    kind = "modified"
+                self._dispatch(kind, os.path.join(parent, os.fsdecode(name)), bool(mask & c.IN_ISDIR))
+
+
+# struct inotify_event: wd, mask, cookie, len, then `len` bytes of NUL-padded name
+_INOTIFY_EVENT = struct.Struct("iIII")
+
+
+class _ObserverBackend(FileSystemEventHandler):
+    """Other platforms: a watchdog observer with one non-recursive schedule per directory."""
+
+    name = "observer"
+
+    def __init__(self, dispatch: Callable[[str, str, bool], None]) -> None:
+        self._dispatch = dispatch
         self._observer = Observer()
-        handler = UllrFileHandler(self._on_change)
+        self._watches: dict[str, ObservedWatch] = {}
 
-        for watch_path in self._watch_paths:
-            if watch_path.exists():
-                self._observer.schedule(handler, str(watch_path), recursive=True)
-                logger.info("Watching %s for Ullr project changes", watch_path)
+    def add(self, path: str) -> None:
+        self._watches[path] = self._observer.schedule(self, path, recursive=False)
 
+    def remove(self, path: str) -> None:
+        watch = self._watches.pop(path, None)
+        if watch is not None:
+            with suppress(KeyError, OSError):
+                self._observer.unschedule(watch)
+
+    def start(self) -> None:
         self._observer.start()
 
+    def stop(self) -> None:
+        self._observer.stop()
+        self._observer.join(timeout=5)
+
+    def on_any_event(self, event: FileSystemEvent) -> None:
+        if event.event_type == "moved":
+            self._dispatch("moved_from", os.fsdecode(event.src_path), event.is_directory)
+            self._dispatch("moved_to", os.fsdecode(event.dest_path), event.is_directory)
+        elif event.event_type in ("created", "deleted", "modified"):
+            self._dispatch(event.event_type, os.fsdecode(event.src_path), event.is_directory)
+
+
+# Filesystem timestamps can trail the clock slightly; files this close to a project's
+# registration are re-reported (a no-op ingest) rather than risk missing a write
+_MTIME_SLACK_NS = 2_000_000_000
+
+
+class _FileStat(NamedTuple):
+    mtime_ns: int
+    size: int
+    inode: int
+
+
+def _stat_projects(projects: list[str]) -> dict[str, _FileStat | None]:
+    """Stat the watched files of a batch of projects (runs in a poller thread)."""
+    stats: dict[str, _FileStat | None] = {}
+    for project in projects:
+        for name in WATCHED_FILES:
+            path = os.path.join(project, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                stats[path] = None
+            else:
+                stats[path] = _FileStat(st.st_mtime_ns, st.st_size, st.st_ino)
+    return stats
+
+
+class StatPoller:
+    """Polling watcher: stats only the watched files of known projects, once per interval.
+
+    Each cycle splits the projects into one batch per worker and stats them in a thread
+    pool. A file whose (mtime_ns, size, inode) differs from the previous cycle, or that
+    appeared or disappeared, marks its project changed, and each changed project is
+    reported once through the same callback as the native backends. On a project's
+    first cycle, only files modified since it was registered
+    are reported; anything older was seen by the ingest that registered it.
+    """
+
+    def __init__(self, on_change: Callable[[Path], None], interval_seconds: float = 30, workers: int = 4) -> None:
+        self._on_change = on_change
+        self._interval = interval_seconds
+        self._workers = workers
+        self._projects: dict[str, int] = {}  # project path -> registered at (ns)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._previous: dict[str, _FileStat | None] = {}
+
+        self.cycles = 0
+        self.changes = 0
+        self.last_cycle_ms = 0.0
+
+    def track(self, project_path: Path) -> None:
+        """Add a project to the set polled each cycle."""
+        with self._lock:
+            self._projects.setdefault(str(project_path), time.time_ns() - _MTIME_SLACK_NS)
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="mimir-poller", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def poll(self, pool: ThreadPoolExecutor) -> list[Path]:
+        """Run one polling cycle and return the files that changed since the last one."""
+        with self._lock:
+            registered = dict(self._projects)
+        projects = list(registered)
+        size = max(1, -(-len(projects) // self._workers))
+        current: dict[str, _FileStat | None] = {}
+        for batch in pool.map(_stat_projects, [projects[i : i + size] for i in range(0, len(projects), size)]):
+            current.update(batch)
+
+        changed: list[Path] = []
+        for path, stat in current.items():
+            if path in self._previous:
+                if self._previous[path] != stat:
+                    changed.append(Path(path))
+            elif stat is not None and stat.mtime_ns >= registered[os.path.dirname(path)]:
+                changed.append(Path(path))
+        self._previous = current
+        return changed
+
+    def _run(self) -> None:
+        with ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="mimir-poll") as pool:
+            while not self._stop.wait(self._interval):
+                started = time.perf_counter()
+                try:
+                    changed = self.poll(pool)
+                except Exception:
+                    logger.exception("Polling cycle failed")
+                    continue
+                self.cycles += 1
+                self.last_cycle_ms = (time.perf_counter() - started) * 1000
+                self.changes += len(changed)
+                for project_path in sorted({path.parent for path in changed}):
+                    self._on_change(project_path)
+
+
+class ProjectWatcher:
+    """Watches Ullr project directories for file changes, and their surroundings for new projects.
+
+    `mode` selects the backend: "native" uses inotify on Linux and a watchdog observer
+    elsewhere, "poll" uses a `StatPoller`, and "auto" tries native first and falls
+    back to polling if it cannot start.
+
+    Natively, nothing is watched recursively. Each project directory registered with
+    `track` gets a non-recursive watch, reporting changes to its `WATCHED_FILES`.
+    Each directory registered with `watch_dirs` (the non-project directories
+    discovery searched) gets a shallow watch that only looks for new subdirectories
+    and `ullr.yaml` files: a new subdirectory is scanned down to `max_depth` and
+    watched the same way, a new `ullr.yaml` promotes its directory to a project, and
+    removing one demotes it again. Deleted directories drop their watches. Events
+    map to projects through these in-memory indexes, so `on_change` is called with
+    the project directory directly. Polling only covers tracked projects.
+
+    A project directory the native backend cannot watch, typically because
+    `fs.inotify.max_user_watches` is exhausted (ENOSPC), is polled by a `StatPoller`
+    alongside it instead, and `stats` reports the watcher as degraded.
+    """
+
+    def __init__(
+        self,
+        watch_paths: list[Path],
+        on_change: Callable[[Path], None],
+        *,
+        mode: str = "auto",
+        max_depth: int = 3,
+        ignore: Iterable[str] = DEFAULT_IGNORE,
+        poll_interval_seconds: float = 30,
+        poll_workers: int = 4,
+    ) -> None:
+        self._watch_paths = [str(path) for path in watch_paths]
+        self._on_change = on_change
+        self._mode = mode
+        self._max_depth = max_depth
+        self._ignore = tuple(ignore)
+        self._backend: _InotifyBackend | _ObserverBackend | None = None
+        self._poller: StatPoller | None = None
+        self._poll_interval = poll_interval_seconds
+        self._poll_workers = poll_workers
+        self._lock = threading.RLock()
+        self._projects: set[str] = set()
+        self._dirs: dict[str, int] = {}  # shallow-watched directory -> depth below its watch path
+        self._watched: set[str] = set()
+        # Projects polled because the native backend could not watch them
+        self._polled: set[str] = set()
+        self.watch_errors = 0
+
+    @property
+    def backend(self) -> str | None:
+        """The backend in use once started: "inotify", "observer" or "poll"."""
+        if self._backend is not None:
+            return self._backend.name
+        if self._poller is not None:
+            return "poll"
+        return None
+
+    def start(self) -> None:
+        """Start the backend and watch everything registered so far."""
+        if self._mode != "poll":
+            try:
+                self._start_native()
+                return
+            except Exception:
+                if self._backend is not None:
+                    with suppress(Exception):
+                        self._backend.stop()
+                    self._backend = None
+                if self._poller is not None:
+                    self._poller.stop()
+                    self._poller = None
+                    self._polled.clear()
+                if self._mode == "native":
+                    raise
+                logger.warning(
+                    "Native file watching unavailable; polling every %ss instead",
+                    self._poll_interval,
+                    exc_info=True,
+                )
+        self._poller = StatPoller(self._on_change, self._poll_interval, self._poll_workers)
+        with self._lock:
+            for project in self._projects:
+                self._poller.track(Path(project))
+        self._poller.start()
+
+    def track(self, projects: Iterable[Path]) -> None:
+        """Watch project directories for changes to their Ullr files."""
+        with self._lock:
+            for project_path in projects:
+                self._add_project(str(project_path))
+
+    def watch_dirs(self, dirs: Iterable[str]) -> None:
+        """Shallow-watch directories under the watch paths for new projects (native backends only)."""
+        with self._lock:
+            for path in dirs:
+                depth = self._depth(path)
+                if depth is not None and path not in self._projects:
+                    self._dirs[path] = depth
+                    self._watch(path)
+
     def stop(self) -> None:
         """Stop the filesystem watcher."""
-        if self._observer:
-            self._observer.stop()
-            self._observer.join(timeout=5)
-            self._observer = None
+        if self._backend:
+            self._backend.stop()
+            self._backend = None
+        if self._poller:
+            self._poller.stop()
+            self._poller = None
+        self._watched.clear()
+        self._polled.clear()
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """Backend in use and watch counts, plus polling cycle counters when polling."""
+        stats: dict[str, Any] = {
+            "backend": self.backend,
+            "projects": len(self._projects),
+            "dirs": len(self._dirs),
+            "watches": len(self._watched),
+            "watch_errors": self.watch_errors,
+            "polled_projects": len(self._polled),
+            "degraded": bool(self._polled),
+        }
+        if self._poller is not None:
+            stats.update(
+                cycles=self._poller.cycles,
+                changes=self._poller.changes,
+                last_cycle_ms=round(self._poller.last_cycle_ms, 3),
+            )
+        return stats
+
+    def _start_native(self) -> None:
+        backend = self._native_backend()
+        self._backend = backend
+        with self._lock:
+            for path in (*self._projects, *self._dirs):
+                self._watch(path)
+        backend.start()
+        logger.info("Watching %d projects and %d directories for Ullr changes", len(self._projects), len(self._dirs))
+
+    def _native_backend(self) -> _InotifyBackend | _ObserverBackend:
+        if sys.platform.startswith("linux"):
+            try:
+                return _InotifyBackend(self._dispatch)
+            except (ImportError, AttributeError):
+                logger.warning(
+                    "watchdog's inotify bindings are unavailable; using its observer, one inotify instance per watch",
+                    exc_info=True,
+                )
+        return _ObserverBackend(self._dispatch)
+
+    def _dispatch(self, kind: str, path: str, is_directory: bool) -> None:
+        """Map a backend event to the project it affects (runs on the backend's thread)."""
+        changed: list[str] = []
+        with self._lock:
+            if kind == "overflow":
+                logger.warning("File watch events were dropped; re-ingesting every project")
+                changed.extend(self._projects)
+            else:
+                parent, name = os.path.split(path)
+                if parent in self._projects:
+                    if not is_directory and name in WATCHED_FILES:
+                        changed.append(parent)
+                        if name == "ullr.yaml" and kind in _GONE:
+                            self._demote(parent)
+                elif parent in self._dirs:
+                    if is_directory and kind in _APPEARED:
+                        changed.extend(self._scan(path, self._dirs[parent] + 1))
+                    elif is_directory and kind in _GONE:
+                        self._forget(path)
+                    elif name == "ullr.yaml" and kind not in _GONE:
+                        del self._dirs[parent]
+                        self._add_project(parent)
+                        changed.append(parent)
+        for project in changed:
+            self._on_change(Path(project))
+
+    def _add_project(self, path: str) -> None:
+        if path in self._projects:
+            return
+        self._projects.add(path)
+        self._dirs.pop(path, None)
+        self._watch(path)
+        if self._backend is None and self._poller is not None:
+            self._poller.track(Path(path))
+
+    def _demote(self, path: str) -> None:
+        """A project lost its ullr.yaml: keep watching it shallowly in case it comes back."""
+        self._projects.discard(path)
+        depth = self._depth(path)
+        if depth is None:
+            self._unwatch(path)
+        else:
+            self._dirs[path] = depth
+
+    def _scan(self, path: str, depth: int) -> list[str]:
+        """Watch a directory that appeared under a shallow watch; returns projects found in it."""
+        if depth > self._max_depth:
+            return []
+        projects, dirs = scan_directory(path, depth, self._max_depth, self._ignore)
+        for directory in dirs:
+            self._dirs[directory] = depth if directory == path else depth + directory[len(path) + 1 :].count(os.sep) + 1
+            self._watch(directory)
+        for project in projects:
+            self._add_project(project)
+        return projects
+
+    def _forget(self, path: str) -> None:
+        """Drop every watch at or below a directory that was deleted or moved away."""
+        prefix = path + os.sep
+        for directory in [d for d in self._watched if d == path or d.startswith(prefix)]:
+            self._projects.discard(directory)
+            self._dirs.pop(directory, None)
+            self._unwatch(directory)
+
+    def _depth(self, path: str) -> int | None:
+        """Depth of a directory below the watch path containing it, or None if outside them all."""
+        for root in self._watch_paths:
+            if path == root:
+                return 0
+            if path.startswith(root + os.sep):
+                return path[len(root) + 1 :].count(os.sep) + 1
+        return None
+
+    def _watch(self, path: str) -> None:
+        if self._backend is None or path in self._watched:
+            return
+        try:
+            self._backend.add(path)
+        except OSError as exc:
+            self.watch_errors += 1
+            # ENOENT: gone before we got to it; ENOSPC: fs.inotify.max_user_watches reached
+            if exc.errno == errno.ENOENT:
+                logger.debug("Cannot watch %s: %s", path, exc)
+            elif path in self._projects:
+                self._poll_instead(path, exc)
+            else:
+                logger.warning("Cannot watch %s for new projects: %s", path, exc)
+            return
+        self._watched.add(path)
+
+    def _poll_instead(self, path: str, exc: OSError) -> None:
+        """Poll a project the native backend cannot watch, starting the poller on first use."""
+        if self._poller is None:
+            logger.warning(
+                "Cannot watch %s (%s); polling projects that cannot be watched every %ss",
+                path,
+                exc,
+                self._poll_interval,
+            )
+            self._poller = StatPoller(self._on_change, self._poll_interval, self._poll_workers)
+            self._poller.start()
+        self._polled.add(path)
+        self._poller.track(Path(path))
+
+    def _unwatch(self, path: str) -> None:
+        if path in self._watched:
+            self._watched.discard(path)
+            if self._backend is not None:
+                self._backend.remove(path)
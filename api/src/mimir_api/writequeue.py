@@ -0,0 +1,239 @@
+"""Group commit: ingestion writes from many projects batched into shared transactions."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, NamedTuple, TypeVar
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Iterator
+
+    from mimir_api.db import Database
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Commit times kept for the transactions-per-second rate
+_RATE_WINDOW_SECONDS = 10.0
+
+
+class _Job(NamedTuple):
+    write: Callable[[], Awaitable[Any]]
+    rows: int
+    future: asyncio.Future[Any]
+
+
+class WriteQueue:
+    """A single writer task that runs queued writes in batched transactions (group commit).
+
+    `submit` queues a write and waits until the transaction it ran in has committed,
+    so callers publish notifications only for committed data. The writer takes every
+    queued write, up to `max_rows` rows, and commits them together: one fsync and
+    one hold of `db.write_lock` per batch instead of per write.
+
+    A caller that will submit a write once it has done some work (parsing files)
+    announces it first with `preparing()`. While announced writes are outstanding
+    the writer holds its batch open for them, for at most `max_delay` seconds after
+    the first write arrived; with none outstanding it commits at once, so a lone
+    writer never waits.
+
+    Each write runs in its own savepoint, so one that raises is rolled back alone
+    and its caller gets the exception while the rest of the batch commits.
+    """
+
+    def __init__(self, db: Database, *, max_rows: int = 5000, max_delay: float = 0.05) -> None:
+        self._db = db
+        self._max_rows = max_rows
+        self._max_delay = max_delay
+        self._queue: asyncio.Queue[_Job | None] = asyncio.Queue()
+        # Writes announced with preparing() but not yet submitted, and a wakeup when that or the queue changes
+        self._preparing = 0
+        self._changed = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+        self._commits: deque[float] = deque()
+        self.transactions = 0
+        self.writes = 0
+        self.rows = 0
+        self.failed = 0
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="mimir-write-queue")
+
+    async def close(self) -> None:
+        """Commit everything already queued, then stop the writer."""
+        if self._task is None:
+            return
+        self._queue.put_nowait(None)
+        await self._task
+        self._task = None
+
+    @contextmanager
+    def preparing(self) -> Iterator[_Preparing]:
+        """Announce a write that is on its way; submit it through the yielded handle."""
+        handle = _Preparing(self)
+        self._preparing += 1
+        try:
+            yield handle
+        finally:
+            handle.settle()
+
+    async def submit(self, write: Callable[[], Awaitable[T]], rows: int = 1) -> T:
+        """Run `write()` on `db.writer` in the next batch and return its result once committed.
+
+        `write` must only issue statements, never commit or roll back. `rows` is
+        roughly how many rows it writes, counted against the batch's row bound.
+        """
+        if self._task is None:
+            msg = "Write queue not started. Call Database.connect() first."
+            raise RuntimeError(msg)
+        if self._task.done():
+            msg = "Write queue has stopped"
+            raise RuntimeError(msg)
+        future: asyncio.Future[T] = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait(_Job(write, rows, future))
+        self._changed.set()
+        return await future
+
+    async def _run(self) -> None:
+        try:
+            while True:
+                batch, stop = await self._collect()
+                if batch:
+                    await self._commit(batch)
+                if stop:
+                    return
+        finally:
+            # Writes queued behind the close, or left when the writer was cancelled, would wait forever
+            while not self._queue.empty():
+                job = self._queue.get_nowait()
+                if job is not None and not job.future.done():
+                    job.future.set_exception(RuntimeError("Write queue has stopped"))
+
+    async def _collect(self) -> tuple[list[_Job], bool]:
+        """Wait for a write, then gather more until the row or latency bound; True once closing."""
+        first = await self._queue.get()
+        if first is None:
+            return [], True
+        batch = [first]
+        rows = first.rows
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._max_delay
+        while rows < self._max_rows:
+            try:
+                job = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                remaining = deadline - loop.time()
+                if remaining <= 0 or self._preparing == 0:
+                    break
+                self._changed.clear()
+                try:
+                    await asyncio.wait_for(self._changed.wait(), remaining)
+                except TimeoutError:
+                    break
+                continue
+            if job is None:
+                return batch, True
+            batch.append(job)
+            rows += job.rows
+        return batch, False
+
+    async def _commit(self, batch: list[_Job]) -> None:
+        db = self._db
+        conn = db.writer
+        results: list[tuple[_Job, Any, BaseException | None]] = []
+        async with db.write_lock:
+            try:
+                if not conn.in_transaction:
+                    await conn.execute("BEGIN")
+                for job in batch:
+                    if job.future.cancelled():  # The caller has gone (shutdown); nothing waits on it
+                        continue
+                    await conn.execute("SAVEPOINT write_job")
+                    try:
+                        result = await job.write()
+                    except Exception as exc:
+                        await conn.execute("ROLLBACK TO write_job")
+                        await conn.execute("RELEASE write_job")
+                        results.append((job, None, exc))
+                    else:
+                        await conn.execute("RELEASE write_job")
+                        results.append((job, result, None))
+                await conn.commit()
+            except Exception as exc:
+                logger.exception("Write batch of %d failed; rolling it back", len(batch))
+                self.failed += len(batch)
+                for job in batch:
+                    if not job.future.done():
+                        job.future.set_exception(exc)
+                # The batch's callers already have their answer, and the writer carries on with the next batch
+                await self._rollback()
+                return
+            except asyncio.CancelledError:
+                for job in batch:
+                    job.future.cancel()
+                await self._rollback()
+                raise
+
+        now = time.monotonic()
+        self._commits.append(now)
+        while self._commits[0] < now - _RATE_WINDOW_SECONDS:
+            self._commits.popleft()
+        self.transactions += 1
+        for job, result, error in results:
+            self.writes += 1
+            if error is not None:
+                self.failed += 1
+                if not job.future.done():
+                    job.future.set_exception(error)
+                continue
+            self.rows += job.rows
+            if not job.future.done():
+                job.future.set_result(result)
+
+    async def _rollback(self) -> None:
+        try:
+            await self._db.writer.rollback()
+        except Exception:
+            logger.exception("Rolling back a failed write batch failed")
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """Committed transactions, writes and rows, plus the batching they achieved."""
+        now = time.monotonic()
+        recent = sum(1 for at in self._commits if at >= now - _RATE_WINDOW_SECONDS)
+        return {
+            "transactions": self.transactions,
+            "writes": self.writes,
+            "rows": self.rows,
+            "failed": self.failed,
+            "queued": self._queue.qsize(),
+            "transactions_per_second": round(recent / _RATE_WINDOW_SECONDS, 2),
+            "rows_per_transaction": round(self.rows / self.transactions, 1) if self.transactions else 0.0,
+            "writes_per_transaction": round(self.writes / self.transactions, 2) if self.transactions else 0.0,
+        }
+
+
+class _Preparing:
+    """Handle for a write announced with `WriteQueue.preparing`."""
+
+    def __init__(self, queue: WriteQueue) -> None:
+        self._queue = queue
+        self._pending = True
+
+    async def submit(self, write: Callable[[], Awaitable[T]], rows: int = 1) -> T:
+        """Submit the announced write (see `WriteQueue.submit`)."""
+        self.settle()
+        return await self._queue.submit(write, rows)
+
+    def settle(self) -> None:
+        """Stop counting this write as on its way, whether or not it was submitted."""
+        if self._pending:
+            self._pending = False
+            self._queue._preparing -= 1
+            self._queue._changed.set()
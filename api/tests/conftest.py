@@ -0,0 +1,28 @@
+"""Shared fixtures: a connected database in a temporary directory."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from mimir_api.db import Database
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+    from pathlib import Path
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+@pytest.fixture
+async def db(tmp_path: Path) -> AsyncIterator[Database]:
+    database = Database(tmp_path / "mimir.db", readers=2)
+    await database.connect()
+    try:
+        yield database
+    finally:
+        await database.close()
@@ -0,0 +1,54 @@
+"""Activity feed: keyset pages carry a cursor onwards only while there may be more."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import httpx
+import pytest
+
+from mimir_api.app import create_app
+from mimir_api.cache import ResponseCache
+from mimir_api.pagination import encode_cursor
+
+if TYPE_CHECKING:
+    from mimir_api.db import Database
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_the_last_page_in_either_direction_has_no_cursor_onwards(db: Database) -> None:
+    await db.writer.execute("INSERT INTO projects (id, name, path) VALUES ('p', 'P', '/p')")
+    await db.writer.executemany(
+        "INSERT INTO activity (project_id, event_type, summary, timestamp) VALUES ('p', 'progress', ?, ?)",
+        [(str(i), f"2026-01-01T00:00:{i:02d}") for i in range(1, 8)],
+    )
+    await db.writer.commit()
+    app = create_app()
+    app.state.db = db
+    app.state.response_cache = ResponseCache()
+
+    async def page(**params: Any) -> tuple[list[str], httpx.Headers]:
+        response = await client.get("/api/activity", params={"limit": 4, **params})
+        assert response.status_code == 200
+        return [event["summary"] for event in response.json()], response.headers
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://mimir") as client:
+        first, headers = await page()
+        assert first == ["7", "6", "5", "4"]
+        assert "X-Next-Cursor" in headers
+        # Newer events may still arrive, so the newest page always offers a way forwards
+        assert "X-Prev-Cursor" in headers
+
+        last, headers = await page(before=headers["X-Next-Cursor"])
+        assert last == ["3", "2", "1"]
+        assert "X-Next-Cursor" not in headers
+
+        newer, headers = await page(after=headers["X-Prev-Cursor"])
+        assert newer == ["7", "6", "5", "4"]
+        assert "X-Prev-Cursor" in headers
+
+        newest, headers = await page(after=encode_cursor("2026-01-01T00:00:05", 5))
+        assert newest == ["7", "6"]
+        assert "X-Prev-Cursor" not in headers
+        assert "X-Next-Cursor" in headers
@@ -0,0 +1,116 @@
+"""Agents: the live agent list is ETag-cached, and heartbeats are restricted, capped and cleaned up."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+import httpx
+import pytest
+
+from mimir_api.app import create_app
+from mimir_api.cache import ResponseCache
+from mimir_api.registry import AgentRegistry
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from fastapi import FastAPI
+
+    from mimir_api.db import Database
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_agents_answer_304_until_a_heartbeat_changes_them(db: Database, tmp_path: Path) -> None:
+    app = create_app()
+    app.state.db = db
+    app.state.response_cache = ResponseCache()
+    registry = app.state.agent_registry = AgentRegistry(tmp_path / "agents")
+    registry.directory.mkdir()
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://mimir") as client:
+        await client.post("/api/agents/heartbeat", json={"name": "builder", "story_id": "US-001"})
+        first = await client.get("/api/agents")
+        assert first.status_code == 200
+        assert [agent["name"] for agent in first.json()] == ["builder"]
+        etag = first.headers["ETag"]
+
+        unchanged = await client.get("/api/agents", headers={"If-None-Match": etag})
+        assert unchanged.status_code == 304
+
+        await client.post("/api/agents/heartbeat", json={"name": "builder", "story_id": "US-002"})
+        changed = await client.get("/api/agents", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["ETag"] != etag
+        assert changed.json()[0]["story_id"] == "US-002"
+
+        registry.remove("builder")
+        gone = await client.get("/api/agents", headers={"If-None-Match": changed.headers["ETag"]})
+        assert gone.status_code == 200
+        assert gone.json() == []
+
+
+def _app(db: Database, registry: AgentRegistry, token: str | None = None) -> FastAPI:
+    app = create_app()
+    app.state.db = db
+    app.state.response_cache = ResponseCache()
+    app.state.agent_registry = registry
+    app.state.heartbeat_token = token
+    return app
+
+
+async def test_heartbeats_from_elsewhere_need_the_token(db: Database, tmp_path: Path) -> None:
+    registry = AgentRegistry(tmp_path / "agents")
+    registry.directory.mkdir()
+    transport = httpx.ASGITransport(app=_app(db, registry, token="s3cret"), client=("203.0.113.5", 4711))
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://mimir") as client:
+        anonymous = await client.post("/api/agents/heartbeat", json={"name": "intruder"})
+        wrong = await client.post(
+            "/api/agents/heartbeat", json={"name": "intruder"}, headers={"Authorization": "Bearer guess"}
+        )
+        assert (anonymous.status_code, wrong.status_code) == (403, 403)
+        assert registry.agents() == []
+        assert not (registry.directory / "intruder.json").exists()
+
+        allowed = await client.post(
+            "/api/agents/heartbeat", json={"name": "builder"}, headers={"Authorization": "Bearer s3cret"}
+        )
+        assert allowed.status_code == 204
+        assert [agent.name for agent in registry.agents()] == ["builder"]
+
+
+async def test_new_agents_past_the_cap_are_refused(db: Database, tmp_path: Path) -> None:
+    registry = AgentRegistry(tmp_path / "agents", max_agents=2)
+    registry.directory.mkdir()
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=_app(db, registry)), base_url="http://mimir"
+    ) as client:
+        statuses = [
+            (await client.post("/api/agents/heartbeat", json={"name": name})).status_code
+            for name in ("a", "b", "c", "a")
+        ]
+
+    assert statuses == [204, 204, 429, 204]
+    assert sorted(agent.name for agent in registry.agents()) == ["a", "b"]
+    assert sorted(path.name for path in registry.directory.iterdir()) == ["a.json", "b.json"]
+    assert registry.stats["refused"] == 1
+
+
+async def test_expired_agents_have_their_heartbeat_files_removed(tmp_path: Path) -> None:
+    registry = AgentRegistry(tmp_path / "agents", ttl_seconds=0.2, scan_seconds=0.05)
+    registry.start()
+    try:
+        agent = registry.heartbeat("builder")
+        assert agent is not None
+        await registry.persist(agent)
+        assert (registry.directory / "builder.json").exists()
+
+        await asyncio.sleep(0.5)
+
+        assert registry.agents() == []
+        assert not (registry.directory / "builder.json").exists()
+    finally:
+        await registry.close()
@@ -0,0 +1,124 @@
+"""Board view: the in-memory board serves exactly what `BOARD_QUERY` returns, through ingest changes."""
+
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from mimir_api.boardview import BOARD_QUERY, COLUMNS, decode_position
+from mimir_api.ingestion import ingest_project
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from mimir_api.db import Database
+
+pytestmark = pytest.mark.anyio
+
+# Shared by tasks in both projects, so project_id and id have to break the ties
+TIE = "2026-01-01T00:00:00"
+
+
+def _task(task_id: str, priority: int | None = 2, updated_at: str | None = TIE) -> dict[str, Any]:
+    task: dict[str, Any] = {"id": task_id, "title": f"Task {task_id}", "priority": priority}
+    if updated_at is not None:
+        task["updated_at"] = updated_at
+    return task
+
+
+def _write_board(project: Path, board: dict[str, list[dict[str, Any]]]) -> None:
+    (project / "taskboard.json").write_text(json.dumps(board))
+
+
+@pytest.fixture
+def projects(tmp_path: Path) -> list[Path]:
+    paths = []
+    for name in ("alpha", "beta"):
+        path = tmp_path / name
+        path.mkdir()
+        (path / "ullr.yaml").write_text(f"project: {name}\n")
+        _write_board(
+            path,
+            {
+                "backlog": [_task("T-1"), _task("T-2"), _task("T-3", 1), _task("T-4", None), _task("T-5", 3, None)],
+                "in_progress": [_task("T-6"), _task("T-7", 2, "2026-01-02T00:00:00")],
+                "blocked": [_task("T-8")],
+                "done": [_task(f"T-{i}", i % 3) for i in range(9, 20)],
+            },
+        )
+        paths.append(path)
+    return paths
+
+
+async def _expected(db: Database, project_id: str | None) -> dict[str, list[dict[str, Any]]]:
+    where, params = ("WHERE t.project_id = ?", [project_id]) if project_id else ("", [])
+    async with db.reader() as conn:
+        cursor = await conn.execute(BOARD_QUERY.format(where=where), params)
+        rows = [dict(row) for row in await cursor.fetchall()]
+    return {column: [row for row in rows if row["status"] == column] for column in COLUMNS}
+
+
+def _paged(db: Database, project_id: str | None, column: str, cursor: str | None, limit: int) -> list[dict[str, Any]]:
+    tasks: list[dict[str, Any]] = []
+    while cursor is not None:
+        body, cursor = db.board.page(project_id, column, decode_position(cursor), limit)
+        tasks.extend(json.loads(body))
+    return tasks
+
+
+async def _assert_matches_query(db: Database) -> None:
+    for project_id in (None, "alpha", "beta"):
+        expected = await _expected(db, project_id)
+        total = sum(len(tasks) for tasks in expected.values())
+
+        assert json.loads(db.board.render(project_id)) == {
+            "columns": expected,
+            "total": total,
+            "done_count": len(expected["done"]),
+        }
+        for status in COLUMNS:
+            board = json.loads(db.board.render(project_id, status))
+            assert board["columns"][status] == expected[status]
+            assert board["total"] == len(expected[status])
+
+        for limit in (1, 2, 5):
+            summary = json.loads(db.board.summary(project_id, None, limit))
+            assert summary["counts"] == {column: len(tasks) for column, tasks in expected.items()}
+            assert summary["total"] == total
+            for column, tasks in expected.items():
+                assert summary["columns"][column] == tasks[:limit]
+                assert (summary["cursors"][column] is not None) == (len(tasks) > limit)
+                # Paging on from the summary's cursor walks the rest of the column in query order
+                rest = _paged(db, project_id, column, summary["cursors"][column], limit)
+                assert summary["columns"][column] + rest == tasks
+
+
+async def test_board_view_matches_the_board_query_through_changes(db: Database, projects: list[Path]) -> None:
+    alpha, beta = projects
+    for project in projects:
+        await ingest_project(db, project)
+    await db.board.sync()
+    await _assert_matches_query(db)
+
+    # Moves, a delete, priority and updated_at changes (some onto existing ties); re-ingested via refresh()
+    _write_board(
+        alpha,
+        {
+            "backlog": [_task("T-2"), _task("T-3", 2), _task("T-5", 3, None), _task("T-20", 0)],
+            "in_progress": [_task("T-1"), _task("T-6", 0), _task("T-7", 2, TIE)],
+            "blocked": [_task("T-4", None), _task("T-8", 1, "2026-01-03T00:00:00")],
+            "done": [_task(f"T-{i}", 2) for i in range(9, 18)],
+        },
+    )
+    await ingest_project(db, alpha)
+    await _assert_matches_query(db)
+
+    # A project emptied of tasks leaves the all-project columns entirely
+    _write_board(beta, {"backlog": [], "in_progress": [], "blocked": [], "done": []})
+    await ingest_project(db, beta)
+    await _assert_matches_query(db)
+
+    await db.board.sync()
+    await _assert_matches_query(db)
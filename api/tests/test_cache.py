@@ -0,0 +1,50 @@
+"""Response cache: revalidation is answered from the generation, without building the body."""
+
+from __future__ import annotations
+
+import httpx
+import pytest
+from fastapi import FastAPI, Request, Response
+
+from mimir_api.cache import Generations, ResponseCache, cached_json
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_matching_if_none_match_gets_a_304_without_building() -> None:
+    app = FastAPI()
+    app.state.response_cache = cache = ResponseCache(max_entries=1)
+    generations = Generations()
+    builds = 0
+
+    @app.get("/things")
+    async def things(request: Request) -> Response:
+        async def build() -> dict[str, int]:
+            nonlocal builds
+            builds += 1
+            return {"generation": generations.get("demo")}
+
+        return await cached_json(request, generations, build, "demo")
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://mimir") as client:
+        first = await client.get("/things")
+        etag = first.headers["ETag"]
+        # Another query evicts the entry, so revalidating is a cache miss
+        await client.get("/things", params={"page": "2"})
+        assert builds == 2
+
+        unchanged = await client.get("/things", headers={"If-None-Match": etag})
+        assert unchanged.status_code == 304
+        assert unchanged.headers["ETag"] == etag
+        assert builds == 2
+
+        generations.bump("demo")
+        changed = await client.get("/things", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["ETag"] != etag
+        assert changed.json() == {"generation": 1}
+        assert builds == 3
+
+    assert cache.stats["not_modified"] == 1
+    # A restarted server's generations start over, but its ETags don't match the old ones
+    assert ResponseCache().etag(("/things",), 0) != cache.etag(("/things",), 0)
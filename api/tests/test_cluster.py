@@ -0,0 +1,91 @@
+"""Cluster: the event log is written in batches through the write queue, and a server without the lock follows."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from mimir_api import app as app_module
+from mimir_api.cluster import EventLog, LeaderLock
+from mimir_api.config import MimirConfig
+from mimir_api.ingestion import IngestProgress
+from mimir_api.sse import EventBus, EventRecord
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from mimir_api.db import Database
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_leader_events_go_through_the_write_queue_and_reach_followers(db: Database) -> None:
+    leader_bus, follower_bus = EventBus(), EventBus()
+    leader, follower = EventLog(db, leader_bus), EventLog(db, follower_bus)
+    await leader.start()
+    await follower.start()
+    leader_bus.persist_with(leader.store)
+
+    for i in range(3):
+        await leader_bus.publish("ingest_progress", {"n": i})
+    assert db.writes.stats["writes"] == 3
+
+    subscriber = follower_bus.subscribe(str(follower_bus.last_id))
+    assert await follower.follow() == 3
+    assert follower_bus.last_id == leader_bus.last_id
+    event = await subscriber.next(timeout=0)
+    assert event is not None
+    assert event.id == leader_bus.last_id
+
+
+async def test_a_burst_of_events_is_stored_in_one_write(db: Database) -> None:
+    leader_bus, follower_bus = EventBus(), EventBus()
+    leader, follower = EventLog(db, leader_bus), EventLog(db, follower_bus)
+    await leader.start()
+    await follower.start()
+    leader_bus.persist_with(leader.store)
+
+    await leader_bus.publish_many([EventRecord("tasks_delta", {"n": i}, conflate=False) for i in range(5)])
+    assert db.writes.stats["writes"] == 1
+    # Published while the first is being stored: the rest go in together after it
+    await asyncio.gather(*(leader_bus.publish("agent_online", {"n": i}, conflate=False) for i in range(5)))
+    assert db.writes.stats["writes"] == 3
+    assert leader.stats["stored"] == 10
+
+    assert await follower.follow() == 10
+    assert follower_bus.last_id == leader_bus.last_id
+
+
+async def test_a_second_server_on_the_database_follows_instead_of_ingesting(
+    db: Database, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(app_module, "event_bus", EventBus())
+    ingested = asyncio.Event()
+
+    async def initial_ingest(*args: Any) -> None:
+        ingested.set()
+
+    monkeypatch.setattr(app_module, "_initial_ingest", initial_ingest)
+    first = LeaderLock(tmp_path / "mimir.db.leader")
+    assert first.acquire()
+
+    second = LeaderLock(tmp_path / "mimir.db.leader")
+    config = MimirConfig(api_workers=1, leader_poll_seconds=0.01)
+    event_log = EventLog(db, app_module.event_bus)
+    task = asyncio.create_task(
+        app_module._lead_or_follow(db, config, None, None, IngestProgress(), second, event_log)  # type: ignore[arg-type]
+    )
+    try:
+        await asyncio.sleep(0.1)
+        assert not ingested.is_set()
+        assert not second.held
+
+        first.release()
+        await asyncio.wait_for(ingested.wait(), 1)
+        assert second.held
+        await task
+    finally:
+        task.cancel()
+        second.release()
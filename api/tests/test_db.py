@@ -0,0 +1,79 @@
+"""Database: the read-only reader pool alongside the writer, and schema setup shared by workers."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+import pytest
+
+from mimir_api.db import Database
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+pytestmark = pytest.mark.anyio
+
+# How long a read may take while a write batch is held open; reads never wait on the writer
+READ_BOUND_SECONDS = 1.0
+
+
+async def _count_tasks(db: Database) -> int:
+    async with db.reader() as conn:
+        cursor = await conn.execute("SELECT count(*) FROM tasks")
+        row = await cursor.fetchone()
+    assert row is not None
+    return int(row[0])
+
+
+async def test_reads_are_not_blocked_by_an_open_write_batch(db: Database) -> None:
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def long_write() -> None:
+        await db.writer.execute("INSERT INTO projects (id, name, path) VALUES ('p', 'P', '/p')")
+        await db.writer.executemany(
+            "INSERT INTO tasks (id, project_id, title) VALUES (?, 'p', 'Task')", [(f"t{i}",) for i in range(5000)]
+        )
+        started.set()
+        await release.wait()
+
+    write = asyncio.create_task(db.writes.submit(long_write, rows=5001))
+    try:
+        await asyncio.wait_for(started.wait(), READ_BOUND_SECONDS)
+        assert db.write_lock.locked()
+
+        # Readers see the last committed state, without waiting for the batch
+        counts = await asyncio.wait_for(asyncio.gather(*(_count_tasks(db) for _ in range(8))), READ_BOUND_SECONDS)
+        assert counts == [0] * 8
+        assert not write.done()
+    finally:
+        release.set()
+    await asyncio.wait_for(write, READ_BOUND_SECONDS)
+    assert await _count_tasks(db) == 5000
+
+
+async def test_workers_starting_together_backfill_derived_tables_once(tmp_path: Path) -> None:
+    # A database from before the activity rollup existed
+    first = Database(tmp_path / "mimir.db", readers=1)
+    await first.connect()
+    await first.writer.execute("INSERT INTO projects (id, name, path) VALUES ('p', 'P', '/p')")
+    await first.writer.executemany(
+        "INSERT INTO activity (project_id, event_type, timestamp) VALUES ('p', 'progress', ?)",
+        [(f"2026-01-01T{i % 24:02d}:00:00",) for i in range(500)],
+    )
+    await first.writer.execute("DROP TABLE activity_rollup")
+    await first.writer.commit()
+    await first.close()
+
+    workers = [Database(tmp_path / "mimir.db", readers=1) for _ in range(4)]
+    await asyncio.gather(*(worker.connect() for worker in workers))
+    try:
+        async with workers[0].reader() as conn:
+            cursor = await conn.execute("SELECT sum(events) FROM activity_rollup")
+            row = await cursor.fetchone()
+        assert row is not None
+        assert row[0] == 500
+    finally:
+        for worker in workers:
+            await worker.close()
@@ -0,0 +1,198 @@
+"""Ingestion: progress.jsonl tailing, taskboard diffing, and serving requests while a large project ingests."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import time
+from typing import TYPE_CHECKING, Any
+
+import httpx
+import pytest
+
+from mimir_api.app import create_app
+from mimir_api.cache import ResponseCache
+from mimir_api.ingestion import (
+    DELTA_LIMIT,
+    STREAM_PARSE_BYTES,
+    ProjectChanges,
+    ingest_project,
+    make_parse_executor,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from mimir_api.db import Database
+
+pytestmark = pytest.mark.anyio
+
+# Slowest /api/projects response allowed while a large project is parsed and written
+LATENCY_BOUND_SECONDS = 0.15
+
+
+def _progress(*summaries: str) -> str:
+    return "".join(
+        json.dumps({"event_type": "progress", "summary": summary, "timestamp": f"2026-01-01T00:00:{i:02d}"}) + "\n"
+        for i, summary in enumerate(summaries)
+    )
+
+
+async def _summaries(db: Database) -> list[str]:
+    async with db.reader() as conn:
+        cursor = await conn.execute("SELECT summary FROM activity ORDER BY id")
+        return [row["summary"] for row in await cursor.fetchall()]
+
+
+def _board(tasks: dict[str, str], **titles: str) -> str:
+    """A taskboard.json with each task id in its column, titled by `titles` or after its id."""
+    board: dict[str, list[dict[str, Any]]] = {"backlog": [], "in_progress": [], "done": [], "blocked": []}
+    for task_id, column in tasks.items():
+        board[column].append({"id": task_id, "title": titles.get(task_id, task_id)})
+    return json.dumps(board)
+
+
+async def _tasks(db: Database) -> dict[str, tuple[str, str, str]]:
+    async with db.reader() as conn:
+        cursor = await conn.execute("SELECT id, title, status, updated_at FROM tasks")
+        return {row["id"]: (row["title"], row["status"], row["updated_at"]) for row in await cursor.fetchall()}
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+    path = tmp_path / "demo"
+    path.mkdir()
+    (path / "ullr.yaml").write_text("project: demo\n")
+    (path / "progress.jsonl").write_text(_progress("a", "b", "c"))
+    return path
+
+
+async def test_progress_is_tailed_from_the_cursor(db: Database, project: Path) -> None:
+    await ingest_project(db, project)
+    with open(project / "progress.jsonl", "a") as f:
+        f.write(_progress("d"))
+
+    await ingest_project(db, project)
+
+    assert await _summaries(db) == ["a", "b", "c", "d"]
+
+
+async def test_progress_rewritten_in_place_past_the_cursor_is_rescanned(db: Database, project: Path) -> None:
+    await ingest_project(db, project)
+    inode = os.stat(project / "progress.jsonl").st_ino
+    with open(project / "progress.jsonl", "r+") as f:
+        f.truncate(0)
+        f.write(_progress("u", "v", "w", "x", "y", "z"))
+    assert os.stat(project / "progress.jsonl").st_ino == inode
+
+    await ingest_project(db, project)
+
+    assert await _summaries(db) == ["a", "b", "c", "u", "v", "w", "x", "y", "z"]
+
+
+async def test_rotated_progress_keeps_only_entries_not_already_stored(db: Database, project: Path) -> None:
+    # History from before the rotated file's timestamp range is left out of the lookup, and kept
+    older = "".join(
+        json.dumps({"event_type": "progress", "summary": summary, "timestamp": "2025-12-31T00:00:00"}) + "\n"
+        for summary in ("a", "a")
+    )
+    (project / "progress.jsonl").write_text(older + _progress("a", "b", "c"))
+    await ingest_project(db, project)
+    # Rotated: the new file is written alongside and renamed over the old one, so its inode differs
+    (project / "progress.jsonl.new").write_text(_progress("a", "b", "c", "d", "d"))
+    (project / "progress.jsonl.new").replace(project / "progress.jsonl")
+
+    await ingest_project(db, project)
+
+    assert await _summaries(db) == ["a", "a", "a", "b", "c", "d", "d"]
+
+
+async def test_taskboard_changes_touch_only_the_changed_rows(db: Database, project: Path) -> None:
+    (project / "taskboard.json").write_text(_board({"T-1": "backlog", "T-2": "backlog", "T-3": "backlog"}))
+    await ingest_project(db, project)
+    before = await _tasks(db)
+
+    (project / "taskboard.json").write_text(_board({"T-1": "backlog", "T-2": "in_progress"}))
+    result = await ingest_project(db, project)
+
+    after = await _tasks(db)
+    assert after.keys() == {"T-1", "T-2"}
+    assert after["T-1"] == before["T-1"]
+    assert after["T-2"][1] == "in_progress"
+    assert after["T-2"][2] > before["T-2"][2]
+    changes = result.changes
+    assert not changes.refetch
+    assert [task["id"] for task in changes.tasks_moved] == ["T-2"]
+    assert changes.tasks_removed == ["T-3"]
+    assert not (changes.tasks_added or changes.tasks_edited)
+
+
+async def test_cards_with_values_stored_as_another_type_are_not_rewritten(db: Database, project: Path) -> None:
+    # SQLite stores "1" in the INTEGER priority column as 1, and 3 in the TEXT domain column as '3'
+    board = {"backlog": [{"id": "T-1", "title": "One", "priority": "1", "domain": 3, "complexity": None}]}
+    (project / "taskboard.json").write_text(json.dumps(board))
+    await ingest_project(db, project)
+    before = await _tasks(db)
+
+    # Only the whitespace differs, so the file is re-read
+    (project / "taskboard.json").write_text(json.dumps(board) + "\n")
+    generation = db.generations.get("demo")
+    result = await ingest_project(db, project)
+
+    assert result.files_read == 1
+    assert not result.changes.has_task_changes
+    assert await _tasks(db) == before
+    # Nothing to publish, and cached responses stay valid
+    assert result.changes == ProjectChanges()
+    assert db.generations.get("demo") == generation
+
+
+async def test_taskboard_change_past_the_delta_limit_asks_clients_to_refetch(db: Database, project: Path) -> None:
+    tasks = {f"T-{i}": "backlog" for i in range(DELTA_LIMIT + 1)}
+    (project / "taskboard.json").write_text(_board(tasks))
+    await ingest_project(db, project)
+
+    (project / "taskboard.json").write_text(_board(tasks, **{task_id: "Renamed" for task_id in tasks}))
+    result = await ingest_project(db, project)
+
+    assert result.changes.refetch
+    assert not result.changes.has_task_changes
+    assert {title for title, _, _ in (await _tasks(db)).values()} == {"Renamed"}
+
+
+async def test_api_latency_stays_flat_while_a_large_project_ingests(db: Database, tmp_path: Path) -> None:
+    project = tmp_path / "big"
+    project.mkdir()
+    (project / "ullr.yaml").write_text("project: big\n")
+    board = {
+        column: [
+            {"id": f"{column}-{i}", "title": f"Task {i}", "description": "x" * 300, "priority": i % 4}
+            for i in range(12000)
+        ]
+        for column in ("backlog", "in_progress", "done", "blocked")
+    }
+    (project / "taskboard.json").write_text(json.dumps(board))
+    assert (project / "taskboard.json").stat().st_size > STREAM_PARSE_BYTES
+
+    app = create_app()
+    app.state.db = db
+    app.state.response_cache = ResponseCache()
+    executor = make_parse_executor("thread", 2)
+    latencies: list[float] = []
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://mimir") as client:
+            ingest = asyncio.create_task(ingest_project(db, project, executor))
+            while not ingest.done():
+                started = time.perf_counter()
+                response = await client.get("/api/projects")
+                latencies.append(time.perf_counter() - started)
+                assert response.status_code == 200
+                await asyncio.sleep(0.01)
+            result = await ingest
+    finally:
+        executor.shutdown()
+
+    assert result.files_read == 2
+    assert len(latencies) >= 10, "the ingest finished before requests could overlap it"
+    assert max(latencies) < LATENCY_BOUND_SECONDS
@@ -0,0 +1,77 @@
+"""Query plans: activity pages and board loads walk an index instead of sorting or scanning; bad cursors get a 400."""
+
+from __future__ import annotations
+
+import base64
+import itertools
+import json
+from typing import TYPE_CHECKING, Any
+
+import httpx
+import pytest
+
+from mimir_api.app import create_app
+from mimir_api.boardview import BOARD_QUERY
+from mimir_api.cache import ResponseCache
+from mimir_api.pagination import encode_cursor
+from mimir_api.routes.activity import activity_query
+
+if TYPE_CHECKING:
+    from mimir_api.db import Database
+
+pytestmark = pytest.mark.anyio
+
+CURSOR = encode_cursor("2026-01-01T00:00:00", 42)
+
+
+async def _plan(db: Database, sql: str, params: list[Any]) -> list[str]:
+    async with db.reader() as conn:
+        cursor = await conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        return [row["detail"] for row in await cursor.fetchall()]
+
+
+def _assert_indexed(plan: list[str], table: str) -> None:
+    assert not [step for step in plan if "USE TEMP B-TREE" in step], plan
+    assert not [step for step in plan if step.startswith(f"SCAN {table}") and "INDEX" not in step], plan
+
+
+@pytest.mark.parametrize("page", ["first", "before", "after"])
+@pytest.mark.parametrize("filters", list(itertools.product([False, True], repeat=4)))
+async def test_activity_pages_walk_an_index(db: Database, filters: tuple[bool, ...], page: str) -> None:
+    project, agent, story_id, event_type = filters
+    sql, params = activity_query(
+        "demo" if project else "all",
+        "agent" if agent else None,
+        "US-001" if story_id else None,
+        "progress" if event_type else None,
+        before=CURSOR if page == "before" else None,
+        after=CURSOR if page == "after" else None,
+    )
+
+    _assert_indexed(await _plan(db, sql, params), "a")
+
+
+@pytest.mark.parametrize(
+    "values", [[[1], 2], [{"a": 1}, 2], ["2026-01-01T00:00:00", "42"], ["2026-01-01T00:00:00", True], [None, 42]]
+)
+@pytest.mark.parametrize("page", ["before", "after"])
+async def test_activity_cursors_of_the_wrong_types_are_rejected(db: Database, values: list[Any], page: str) -> None:
+    token = base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        activity_query(before=token if page == "before" else None, after=token if page == "after" else None)
+
+    app = create_app()
+    app.state.db = db
+    app.state.response_cache = ResponseCache()
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://mimir") as client:
+        response = await client.get("/api/activity", params={page: token})
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize(("where", "params"), [("", []), ("WHERE t.project_id = ?", ["demo"])])
+async def test_board_loads_walk_an_index(db: Database, where: str, params: list[Any]) -> None:
+    plan = await _plan(db, BOARD_QUERY.format(where=where), params)
+
+    _assert_indexed(plan, "t")
+    index = "idx_tasks_project_board" if where else "idx_tasks_board"
+    assert any(index in step for step in plan), plan
@@ -0,0 +1,67 @@
+"""Ingest scheduler: debounced notifications coalesce, and a running ingest gets one follow-up."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from mimir_api.scheduler import IngestScheduler
+
+pytestmark = pytest.mark.anyio
+
+DEBOUNCE_SECONDS = 0.05
+PROJECT = Path("/projects/demo")
+
+
+async def test_notifications_inside_the_debounce_window_run_one_ingest() -> None:
+    runs: list[Path] = []
+
+    async def runner(project_path: Path) -> None:
+        runs.append(project_path)
+
+    scheduler = IngestScheduler(runner, debounce_seconds=DEBOUNCE_SECONDS)
+    scheduler.start()
+    for _ in range(10):
+        scheduler.notify(PROJECT)
+        await asyncio.sleep(DEBOUNCE_SECONDS / 10)
+    assert runs == []
+
+    await asyncio.sleep(DEBOUNCE_SECONDS * 3)
+    await scheduler.close()
+
+    assert runs == [PROJECT]
+    assert scheduler.stats == {"events": 10, "coalesced": 9, "runs": 1, "pending": 0, "running": 0}
+
+
+async def test_notifications_during_a_running_ingest_run_exactly_one_follow_up() -> None:
+    started = asyncio.Event()
+    release = asyncio.Event()
+    runs = 0
+
+    async def runner(project_path: Path) -> None:
+        nonlocal runs
+        runs += 1
+        if runs == 1:
+            started.set()
+            await release.wait()
+
+    scheduler = IngestScheduler(runner, debounce_seconds=DEBOUNCE_SECONDS)
+    scheduler.start()
+    scheduler.notify(PROJECT)
+    await asyncio.wait_for(started.wait(), 1)
+
+    for _ in range(5):
+        scheduler.notify(PROJECT)
+    # Debounce timers don't start a second ingest of the same project alongside the first
+    await asyncio.sleep(DEBOUNCE_SECONDS * 3)
+    assert runs == 1
+
+    release.set()
+    await asyncio.sleep(DEBOUNCE_SECONDS * 3)
+    await scheduler.close()
+
+    assert runs == 2
+    assert scheduler.stats["runs"] == 2
+    assert scheduler.stats["running"] == 0
@@ -0,0 +1,127 @@
+"""Search: keyset paging, cursor validation, and the task index following task changes."""
+
+from __future__ import annotations
+
+import base64
+import json
+from typing import TYPE_CHECKING, Any
+
+import httpx
+import pytest
+
+from mimir_api.app import create_app
+from mimir_api.cache import ResponseCache
+from mimir_api.db import Database
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+    from pathlib import Path
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def client(db: Database) -> AsyncIterator[httpx.AsyncClient]:
+    await db.writer.execute("INSERT INTO projects (id, name, path) VALUES ('p', 'P', '/p')")
+    await db.writer.executemany(
+        "INSERT INTO tasks (id, project_id, title, description) VALUES (?, 'p', ?, ?)",
+        [(f"T-{i}", f"Widget {i}", "widget " * i) for i in range(1, 8)],
+    )
+    await db.writer.executemany(
+        "INSERT INTO activity (project_id, event_type, summary, timestamp) VALUES ('p', 'progress', ?, ?)",
+        [(f"Built widget {i}", f"2026-01-01T00:00:{i:02d}") for i in range(1, 6)],
+    )
+    await db.writer.commit()
+    app = create_app()
+    app.state.db = db
+    app.state.response_cache = ResponseCache()
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://mimir") as client:
+        yield client
+
+
+async def _search(client: httpx.AsyncClient, **params: Any) -> list[tuple[str, str]]:
+    response = await client.get("/api/search", params=params)
+    assert response.status_code == 200
+    return [(result["kind"], result["id"]) for result in response.json()]
+
+
+async def test_pages_follow_on_from_the_cursor_without_gaps_or_repeats(client: httpx.AsyncClient) -> None:
+    everything = await _search(client, q="widget", limit=100)
+    assert len(everything) == 12
+
+    paged: list[tuple[str, str]] = []
+    after = None
+    while True:
+        params: dict[str, Any] = {"q": "widget", "limit": 5}
+        if after is not None:
+            params["after"] = after
+        response = await client.get("/api/search", params=params)
+        assert response.status_code == 200
+        if not response.json():
+            break
+        paged.extend((result["kind"], result["id"]) for result in response.json())
+        after = response.headers["X-Next-Cursor"]
+
+    assert paged == everything
+
+
+async def test_task_edits_and_removals_are_reflected_in_results(db: Database, client: httpx.AsyncClient) -> None:
+    await db.writer.execute("UPDATE tasks SET title = 'Gadget', description = NULL WHERE id = 'T-1'")
+    await db.writer.execute("DELETE FROM tasks WHERE id = 'T-2'")
+    await db.writer.commit()
+
+    tasks = {task_id for _, task_id in await _search(client, q="widget", kind="task")}
+    assert tasks == {f"T-{i}" for i in range(3, 8)}
+    assert await _search(client, q="gadget") == [("task", "T-1")]
+
+
+async def test_task_results_survive_a_vacuum(db: Database, client: httpx.AsyncClient) -> None:
+    # Deleting early rows leaves rowid gaps, which VACUUM may close for tables without an INTEGER PRIMARY KEY
+    await db.writer.execute("DELETE FROM tasks WHERE id IN ('T-1', 'T-2')")
+    await db.writer.commit()
+    await db.writer.execute("VACUUM")
+
+    results = await client.get("/api/search", params={"q": "widget", "kind": "task"})
+    assert {result["id"] for result in results.json()} == {f"T-{i}" for i in range(3, 8)}
+    assert all(result["title"] == f"Widget {result['id'][2:]}" for result in results.json())
+
+
+@pytest.mark.parametrize(
+    "values",
+    [[[1], "task", 2], [-1.0, "nothing", 2], [-1.0, ["task"], 2], [-1.0, "task", "2"], [-1.0, "task", True]],
+)
+async def test_search_cursors_of_the_wrong_types_are_rejected(client: httpx.AsyncClient, values: list[Any]) -> None:
+    after = base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+    response = await client.get("/api/search", params={"q": "widget", "after": after})
+    assert response.status_code == 400
+
+
+async def test_tasks_from_before_the_seq_column_are_rekeyed_and_reindexed(tmp_path: Path) -> None:
+    db = Database(tmp_path / "mimir.db", readers=1)
+    await db.connect()
+    # The tasks table as it was, keyed by (project_id, id) on the implicit rowid
+    await db.writer.executescript(
+        """DROP TABLE tasks;
+        CREATE TABLE tasks (
+            id TEXT NOT NULL, project_id TEXT NOT NULL, story_id TEXT, title TEXT NOT NULL, description TEXT,
+            status TEXT NOT NULL DEFAULT 'backlog', domain TEXT, complexity TEXT, blocked_reason TEXT,
+            assigned_agent TEXT, priority INTEGER DEFAULT 2, updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (project_id, id)
+        );
+        INSERT INTO projects (id, name, path) VALUES ('p', 'P', '/p');
+        INSERT INTO tasks (id, project_id, title) VALUES ('T-1', 'p', 'Widget'), ('T-2', 'p', 'Gadget');"""
+    )
+    await db.close()
+
+    db = Database(tmp_path / "mimir.db", readers=1)
+    await db.connect()
+    try:
+        async with db.reader() as conn:
+            cursor = await conn.execute(
+                "SELECT t.id FROM tasks_fts JOIN tasks t ON t.seq = tasks_fts.rowid WHERE tasks_fts MATCH 'gadget'"
+            )
+            assert [row["id"] for row in await cursor.fetchall()] == ["T-2"]
+            cursor = await conn.execute("SELECT name FROM sqlite_master WHERE name = 'tasks_unkeyed'")
+            assert await cursor.fetchone() is None
+    finally:
+        await db.close()
@@ -0,0 +1,53 @@
+"""SSE event bus: per-subscriber memory stays bounded for slow clients."""
+
+from __future__ import annotations
+
+import pytest
+
+from mimir_api.sse import EventBus
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_slow_subscriber_is_resynced_when_deltas_outgrow_the_buffer() -> None:
+    bus = EventBus(replay_events=100)
+    subscriber = bus.subscribe()
+
+    # Publish 2000 deltas while the client reads only 200 of them
+    delivered: list[str] = []
+    most_pending = 0
+    for i in range(2000):
+        await bus.publish("tasks_delta", {"project_id": "demo", "seq": i}, conflate=False)
+        if i % 10 == 9:
+            event = await subscriber.next(timeout=0)
+            assert event is not None
+            delivered.append(event.event)
+            most_pending = max(most_pending, subscriber.stats["pending"])
+
+    assert most_pending <= 100
+    assert subscriber.resyncs > 0
+    assert "resync" in delivered
+
+    # Once resynced, the client is sent new deltas again
+    while await subscriber.next(timeout=0) is not None:
+        pass
+    await bus.publish("tasks_delta", {"project_id": "demo", "seq": 2000}, conflate=False)
+    event = await subscriber.next(timeout=0)
+    assert event is not None
+    assert event.event == "tasks_delta"
+
+
+async def test_lagging_subscriber_keeps_deltas_within_the_buffer() -> None:
+    bus = EventBus(replay_events=100)
+    subscriber = bus.subscribe()
+
+    for i in range(150):
+        await bus.publish("tasks_delta", {"project_id": "demo", "seq": i}, conflate=False)
+        if i % 2 == 0:
+            assert await subscriber.next(timeout=0) is not None
+
+    events = []
+    while (event := await subscriber.next(timeout=0)) is not None:
+        events.append(event)
+    assert [event.event for event in events] == ["tasks_delta"] * 75
+    assert subscriber.resyncs == 0
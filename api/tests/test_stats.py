@@ -0,0 +1,122 @@
+"""Analytics: rollups kept by ingestion match the raw rows, and cycle-time statistics are summarized in SQL."""
+
+from __future__ import annotations
+
+import json
+import statistics
+from typing import TYPE_CHECKING, Any
+
+import httpx
+import pytest
+
+from mimir_api.app import create_app
+from mimir_api.cache import ResponseCache
+from mimir_api.ingestion import ingest_project
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from mimir_api.db import Database
+
+pytestmark = pytest.mark.anyio
+
+
+def _progress(*events: tuple[str, str, str]) -> str:
+    return "".join(
+        json.dumps({"event_type": event_type, "agent": agent, "summary": "x", "timestamp": timestamp}) + "\n"
+        for event_type, agent, timestamp in events
+    )
+
+
+def _board(**statuses: str) -> str:
+    board: dict[str, list[dict[str, Any]]] = {"backlog": [], "in_progress": [], "done": [], "blocked": []}
+    for task_id, status in statuses.items():
+        board[status].append({"id": task_id, "title": task_id, "story_id": task_id[0], "assigned_agent": "ana"})
+    return json.dumps(board)
+
+
+async def _rows(db: Database, sql: str) -> list[tuple[Any, ...]]:
+    async with db.reader() as conn:
+        cursor = await conn.execute(sql)
+        return sorted(tuple(row) for row in await cursor.fetchall())
+
+
+async def test_rollups_match_a_recompute_from_the_raw_rows(db: Database, tmp_path: Path) -> None:
+    project = tmp_path / "demo"
+    project.mkdir()
+    (project / "ullr.yaml").write_text("project: demo\n")
+    steps = [
+        ({"A1": "backlog", "A2": "backlog", "B1": "backlog"}, [("progress", "ana", "2026-01-01T09:15:00")]),
+        ({"A1": "in_progress", "A2": "backlog", "B1": "in_progress"}, [("progress", "bo", "2026-01-01T09:45:00")]),
+        ({"A1": "done", "A2": "in_progress", "B1": "blocked"}, [("error", "ana", "2026-01-01T10:05:00")]),
+        ({"A1": "done", "A2": "done", "B1": "in_progress"}, [("progress", "", "not a timestamp")]),
+        ({"A1": "done", "A2": "done"}, [("progress", "bo", "2026-01-02T00:00:00")] * 3),
+    ]
+    for statuses, events in steps:
+        (project / "taskboard.json").write_text(_board(**statuses))
+        with open(project / "progress.jsonl", "a") as f:
+            f.write(_progress(*events))
+        await ingest_project(db, project)
+
+    bucket = "COALESCE(strftime('%Y-%m-%dT%H', {}), '')"
+    assert await _rows(db, "SELECT project_id, bucket, agent_name, event_type, events FROM activity_rollup") == (
+        await _rows(
+            db,
+            f"""SELECT project_id, {bucket.format("timestamp")}, COALESCE(agent_name, ''), event_type, COUNT(*)
+                FROM activity GROUP BY 1, 2, 3, 4""",
+        )
+    )
+    transitions = await _rows(
+        db, "SELECT project_id, bucket, agent_name, to_status, transitions FROM transition_rollup"
+    )
+    assert transitions
+    assert transitions == await _rows(
+        db,
+        f"""SELECT project_id, {bucket.format("at")}, COALESCE(agent_name, ''), to_status, COUNT(*)
+            FROM task_transitions WHERE to_status IS NOT NULL GROUP BY 1, 2, 3, 4""",
+    )
+    # Story A finished when its last task reached done; B's task was removed before it was done
+    assert await _rows(db, "SELECT story_id, started_at IS NOT NULL, finished_at FROM story_cycles") == (
+        await _rows(
+            db,
+            """SELECT story_id, true,
+                      CASE WHEN story_id = 'A' THEN MAX(at) FILTER (WHERE task_id = 'A2' AND to_status = 'done') END
+               FROM task_transitions GROUP BY story_id""",
+        )
+    )
+    assert await _rows(db, "SELECT tasks_total, tasks_done FROM burndown ORDER BY day DESC LIMIT 1") == (
+        await _rows(db, "SELECT COUNT(*), COUNT(*) FILTER (WHERE status = 'done') FROM tasks")
+    )
+
+
+async def test_cycle_time_statistics_match_the_stories_in_range(db: Database) -> None:
+    seconds = [5, 60, 61, 3600, 7200, 7201, 86400, 90000, 2, 400, 401]
+    await db.writer.executemany(
+        """INSERT INTO story_cycles (project_id, story_id, started_at, finished_at)
+           VALUES (?, ?, '2026-01-01T00:00:00', datetime('2026-01-01T00:00:00', ?))""",
+        [("p" if i % 3 else "q", f"S-{i}", f"+{value} seconds") for i, value in enumerate(seconds)],
+    )
+    await db.writer.execute("INSERT INTO story_cycles (project_id, story_id, started_at) VALUES ('p', 'open', '2026')")
+    await db.writer.commit()
+    app = create_app()
+    app.state.db = db
+    app.state.response_cache = ResponseCache()
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://mimir") as client:
+        for project in ("all", "p"):
+            response = await client.get("/api/stats/cycle-time", params={"project": project, "limit": 3})
+            assert response.status_code == 200
+            body = response.json()
+
+            values = sorted(
+                value for i, value in enumerate(seconds) if project == "all" or ("p" if i % 3 else "q") == project
+            )
+            assert body["count"] == len(values)
+            assert body["mean_seconds"] == pytest.approx(statistics.fmean(values), abs=1e-3)
+            assert body["p50_seconds"] == pytest.approx(values[len(values) // 2], abs=1e-3)
+            assert body["p90_seconds"] == pytest.approx(values[min(len(values) - 1, len(values) * 9 // 10)], abs=1e-3)
+            assert len(body["stories"]) == 3
+            assert body["stories"][0]["cycle_seconds"] == pytest.approx(values[-1], abs=1e-3)
+
+        empty = await client.get("/api/stats/cycle-time", params={"project": "none"})
+    assert empty.json() == {"count": 0, "mean_seconds": None, "p50_seconds": None, "p90_seconds": None, "stories": []}
@@ -0,0 +1,72 @@
+"""Project watcher: projects the native backend cannot watch fall back to polling, on either native backend."""
+
+from __future__ import annotations
+
+import errno
+import os
+import sys
+import threading
+from typing import TYPE_CHECKING
+
+import pytest
+
+from mimir_api import watcher as watcher_module
+from mimir_api.watcher import ProjectWatcher
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+@pytest.mark.parametrize("inotify_bindings", [True, False])
+def test_projects_past_the_watch_limit_are_polled(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, inotify_bindings: bool
+) -> None:
+    if not inotify_bindings:
+        # As if a watchdog release dropped the private bindings the inotify backend uses
+        def missing_bindings(*args: object) -> None:
+            raise ImportError("inotify_c")
+
+        monkeypatch.setattr(watcher_module, "_InotifyBackend", missing_bindings)
+    expected_backend = "inotify" if inotify_bindings and sys.platform.startswith("linux") else "observer"
+
+    projects = []
+    for name in ("watched", "over-limit"):
+        project = tmp_path / name
+        project.mkdir()
+        (project / "ullr.yaml").write_text(f"project: {name}\n")
+        projects.append(project)
+    watched, over_limit = projects
+
+    changed: set[Path] = set()
+    saw_change = threading.Event()
+
+    def on_change(project: Path) -> None:
+        changed.add(project)
+        if project == over_limit:
+            saw_change.set()
+
+    watcher = ProjectWatcher([tmp_path], on_change, mode="auto", poll_interval_seconds=0.05)
+    watcher.start()
+    try:
+        backend = watcher._backend
+        assert backend is not None
+        assert backend.name == expected_backend
+        add = backend.add
+
+        def add_until_the_limit(path: str) -> None:
+            if path == str(over_limit):
+                raise OSError(errno.ENOSPC, os.strerror(errno.ENOSPC), path)
+            add(path)
+
+        monkeypatch.setattr(backend, "add", add_until_the_limit)
+        watcher.track(projects)
+
+        assert watcher.stats["degraded"] is True
+        assert watcher.stats["polled_projects"] == 1
+        assert watcher.stats["watches"] == 1
+
+        (over_limit / "taskboard.json").write_text("{}")
+        assert saw_change.wait(timeout=5)
+        assert watched not in changed
+    finally:
+        watcher.stop()
@@ -0,0 +1,93 @@
+"""Write queue: group commit, per-write savepoints, draining on close, and surviving a failed rollback."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+import pytest
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from mimir_api.db import Database
+
+pytestmark = pytest.mark.anyio
+
+
+def _insert(db: Database, project_id: str, *, fail: bool = False) -> Callable[[], Awaitable[str]]:
+    async def write() -> str:
+        await db.writer.execute("INSERT INTO projects (id, name, path) VALUES (?, ?, ?)", (project_id, "P", "/p"))
+        if fail:
+            msg = f"{project_id} failed after writing"
+            raise ValueError(msg)
+        return project_id
+
+    return write
+
+
+async def _projects(db: Database) -> list[str]:
+    async with db.reader() as conn:
+        cursor = await conn.execute("SELECT id FROM projects ORDER BY id")
+        return [row["id"] for row in await cursor.fetchall()]
+
+
+async def test_writes_queued_together_commit_in_one_transaction(db: Database) -> None:
+    results = await asyncio.gather(*(db.writes.submit(_insert(db, f"p{i}")) for i in range(5)))
+
+    assert results == [f"p{i}" for i in range(5)]
+    assert await _projects(db) == [f"p{i}" for i in range(5)]
+    assert db.writes.stats["transactions"] == 1
+    assert db.writes.stats["writes_per_transaction"] == 5
+
+
+async def test_a_failing_write_is_rolled_back_alone(db: Database) -> None:
+    results = await asyncio.gather(
+        db.writes.submit(_insert(db, "a")),
+        db.writes.submit(_insert(db, "b", fail=True)),
+        db.writes.submit(_insert(db, "c")),
+        return_exceptions=True,
+    )
+
+    assert results[0] == "a"
+    assert isinstance(results[1], ValueError)
+    assert results[2] == "c"
+    assert await _projects(db) == ["a", "c"]
+    assert db.writes.stats["transactions"] == 1
+    assert db.writes.stats["failed"] == 1
+
+
+async def test_close_commits_everything_already_queued(db: Database) -> None:
+    writes = [asyncio.create_task(db.writes.submit(_insert(db, f"p{i}"))) for i in range(3)]
+    await asyncio.sleep(0)
+
+    await db.writes.close()
+
+    assert [write.result() for write in writes] == ["p0", "p1", "p2"]
+    assert await _projects(db) == ["p0", "p1", "p2"]
+    with pytest.raises(RuntimeError):
+        await db.writes.submit(_insert(db, "late"))
+
+
+async def test_the_writer_keeps_going_when_a_rollback_fails(db: Database, monkeypatch: pytest.MonkeyPatch) -> None:
+    conn = db.writer
+    commit, rollback = conn.commit, conn.rollback
+
+    async def failing_commit() -> None:
+        monkeypatch.setattr(conn, "commit", commit)
+        msg = "disk I/O error"
+        raise OSError(msg)
+
+    async def failing_rollback() -> None:
+        monkeypatch.setattr(conn, "rollback", rollback)
+        await rollback()
+        msg = "rollback failed"
+        raise OSError(msg)
+
+    monkeypatch.setattr(conn, "commit", failing_commit)
+    monkeypatch.setattr(conn, "rollback", failing_rollback)
+    with pytest.raises(OSError, match="disk I/O error"):
+        await asyncio.wait_for(db.writes.submit(_insert(db, "lost")), 1)
+
+    assert await asyncio.wait_for(db.writes.submit(_insert(db, "kept")), 1) == "kept"
+    assert await _projects(db) == ["kept"]
@@ -1,6 +1,19 @@
 import { useQuery, useQueryClient } from "@tanstack/react-query";
 import { api, createSSE } from "@/lib/api";
+import { applyActivityDelta, applyStoryCounts, applyTasksDelta } from "@/lib/deltas";
+import type {
+  ActivityDelta,
+  ActivityEvent,
+  BoardData,
+  Project,
+  StoryCountsDelta,
+  TasksDelta,
+} from "@/lib/types";
 import { useEffect, useRef } from "react";
+import { useSearchParams } from "react-router-dom";
+
+// Minimum time between dashboard refetches triggered by startup ingestion progress
+const INGEST_REFETCH_MS = 2000;
 
 export function useProjects() {
   return useQuery({
@@ -38,21 +51,67 @@ export function useActivity(limit = 50) {
   });
 }
 
+/**
+ * Subscribe to /api/sse and keep cached queries current. While the page is filtered to one
+ * project (`?project=` in the URL), only that project's events are streamed.
+ */
 export function useSSE() {
   const queryClient = useQueryClient();
   const esRef = useRef<EventSource | null>(null);
+  const lastIngestRefetch = useRef(0);
+  const [searchParams] = useSearchParams();
+  const project = searchParams.get("project");
 
   useEffect(() => {
-    esRef.current = createSSE((type) => {
+    const projects = project && project !== "all" ? [project] : undefined;
+    esRef.current = createSSE((type, data) => {
       if (type === "board_updated") queryClient.invalidateQueries({ queryKey: ["board"] });
-      if (type === "agent_changed") queryClient.invalidateQueries({ queryKey: ["agents"] });
-      if (type === "activity_new") queryClient.invalidateQueries({ queryKey: ["activity"] });
-    });
+      if (type === "agent_changed" || type === "agent_online" || type === "agent_offline") queryClient.invalidateQueries({ queryKey: ["agents"] });
+      if (type === "tasks_delta") {
+        // Apply task changes to every cached board in place instead of refetching it
+        for (const [key] of queryClient.getQueriesData<BoardData>({ queryKey: ["board"] })) {
+          const boardProject = (key[1] as string) ?? "all";
+          queryClient.setQueryData<BoardData>(key, (board) =>
+            board ? applyTasksDelta(board, data as TasksDelta, boardProject) : board,
+          );
+        }
+        queryClient.invalidateQueries({ queryKey: ["agents"] });
+      }
+      if (type === "activity_new") {
+        if (!data?.events) {
+          queryClient.invalidateQueries({ queryKey: ["activity"] });
+        } else {
+          for (const [key] of queryClient.getQueriesData<ActivityEvent[]>({ queryKey: ["activity"] })) {
+            const limit = (key[1] as number) ?? 50;
+            queryClient.setQueryData<ActivityEvent[]>(key, (feed) =>
+              feed ? applyActivityDelta(feed, data as ActivityDelta, limit) : feed,
+            );
+          }
+        }
+      }
+      if (type === "story_counts") {
+        queryClient.setQueryData<Project[]>(["projects"], (projects) =>
+          projects ? applyStoryCounts(projects, data as StoryCountsDelta) : projects,
+        );
+      }
+      if (type === "ingest_progress") {
+        // Startup ingestion landed another project — fill the dashboard in as it arrives,
+        // refetching at most every INGEST_REFETCH_MS and once more when it is done
+        const now = Date.now();
+        if (data?.status === "ready" || now - lastIngestRefetch.current >= INGEST_REFETCH_MS) {
+          lastIngestRefetch.current = now;
+          queryClient.invalidateQueries({ queryKey: ["projects"] });
+          queryClient.invalidateQueries({ queryKey: ["board"] });
+        }
+      }
+      // Reconnected after events fell out of the server's replay buffer — refetch everything
+      if (type === "resync") queryClient.invalidateQueries();
+    }, projects);
 
     return () => {
       esRef.current?.close();
     };
-  }, [queryClient]);
+  }, [queryClient, project]);
 
   return esRef;
 }
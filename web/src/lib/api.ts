@@ -21,19 +21,42 @@ export const api = {
     fetchApi<ActivityEvent[]>("/api/activity", { limit: String(limit) }),
 };
 
-export type SSEEventType = "board_updated" | "agent_changed" | "activity_new";
+export type SSEEventType =
+  | "board_updated"
+  | "agent_changed"
+  | "agent_online"
+  | "agent_offline"
+  | "activity_new"
+  | "ingest_progress"
+  | "resync"
+  | "tasks_delta"
+  | "story_counts";
 
-/** Create EventSource for SSE and call onEvent for each event. */
-export function createSSE(onEvent: (type: SSEEventType) => void): EventSource {
-  const es = new EventSource(`${API_BASE}/api/sse`);
-  es.addEventListener("board_updated", () => onEvent("board_updated"));
-  es.addEventListener("agent_changed", () => onEvent("agent_changed"));
-  es.addEventListener("activity_new", () => onEvent("activity_new"));
-  es.onmessage = (e) => {
-    const type = (e.type || "board_updated") as SSEEventType;
-    if (["board_updated", "agent_changed", "activity_new"].includes(type)) {
-      onEvent(type);
-    }
-  };
+const SSE_EVENT_TYPES: SSEEventType[] = [
+  "board_updated",
+  "agent_changed",
+  "agent_online",
+  "agent_offline",
+  "activity_new",
+  "ingest_progress",
+  "resync",
+  "tasks_delta",
+  "story_counts",
+];
+
+/**
+ * Create EventSource for SSE and call onEvent with each event's type and parsed data.
+ * Pass `projects` to only receive events for those project ids.
+ */
+export function createSSE(
+  onEvent: (type: SSEEventType, data: any) => void,
+  projects?: string[],
+): EventSource {
+  const url = new URL("/api/sse", API_BASE);
+  projects?.forEach((p) => url.searchParams.append("project", p));
+  const es = new EventSource(url.toString());
+  for (const type of SSE_EVENT_TYPES) {
+    es.addEventListener(type, (e) => onEvent(type, JSON.parse((e as MessageEvent).data || "{}")));
+  }
   return es;
 }
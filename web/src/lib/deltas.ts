@@ -0,0 +1,60 @@
+import type {
+  ActivityDelta,
+  ActivityEvent,
+  BoardData,
+  Project,
+  StoryCountsDelta,
+  Task,
+  TasksDelta,
+} from "./types";
+
+type Column = keyof BoardData["columns"];
+
+/** Compare strings by code unit, like SQLite's default (BINARY) collation rather than the locale. */
+function compareText(a: string, b: string): number {
+  return a < b ? -1 : a > b ? 1 : 0;
+}
+
+/** Same order as /api/board: priority ascending, most recently updated first, then project and task id. */
+function byBoardOrder(a: Task, b: Task): number {
+  if (a.priority !== b.priority) return a.priority - b.priority;
+  return (
+    compareText(b.updated_at, a.updated_at) ||
+    compareText(a.project_id, b.project_id) ||
+    compareText(a.id, b.id)
+  );
+}
+
+/** Apply a tasks_delta to a cached board for `project` ("all" or a project id). */
+export function applyTasksDelta(board: BoardData, delta: TasksDelta, project: string): BoardData {
+  if (project !== "all" && project !== delta.project_id) return board;
+
+  const changed = [...delta.added, ...delta.moved, ...delta.edited];
+  const drop = new Set([...delta.removed, ...changed.map((t) => t.id)]);
+  const columns = { ...board.columns };
+
+  for (const col of Object.keys(columns) as Column[]) {
+    const kept = columns[col].filter((t) => !(t.project_id === delta.project_id && drop.has(t.id)));
+    const incoming = changed.filter((t) => t.status === col);
+    columns[col] = incoming.length ? [...kept, ...incoming].sort(byBoardOrder) : kept;
+  }
+
+  const total = Object.values(columns).reduce((n, tasks) => n + tasks.length, 0);
+  return { columns, total, done_count: columns.done.length };
+}
+
+/** Prepend newly ingested activity to a cached feed, keeping it newest-first and `limit` long. */
+export function applyActivityDelta(feed: ActivityEvent[], delta: ActivityDelta, limit: number): ActivityEvent[] {
+  const merged = [...delta.events, ...feed];
+  merged.sort((a, b) => b.timestamp.localeCompare(a.timestamp) || (b.id ?? 0) - (a.id ?? 0));
+  return merged.slice(0, limit);
+}
+
+/** Update one project's story counts in the cached project list. */
+export function applyStoryCounts(projects: Project[], delta: StoryCountsDelta): Project[] {
+  return projects.map((p) =>
+    p.id === delta.project_id
+      ? { ...p, total_stories: delta.total_stories, done_stories: delta.done_stories }
+      : p,
+  );
+}
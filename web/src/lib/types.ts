@@ -39,14 +39,16 @@ export interface BoardData {
   done_count: number;
 }
 
-/** Agent from /api/agents */
+/** Agent from /api/agents: heartbeating (`last_seen` set) or inferred from an in_progress task */
 export interface Agent {
   name: string;
-  project_id: string;
-  project_name: string;
-  story_id: string;
-  current_task: string;
+  project_id: string | null;
+  project_name: string | null;
+  story_id: string | null;
+  current_task: string | null;
   since: string;
+  last_seen: string | null;
+  source: "heartbeat" | "task";
 }
 
 /** Activity event from /api/activity */
@@ -60,3 +62,25 @@ export interface ActivityEvent {
   summary: string;
   timestamp: string;
 }
+
+/** SSE `tasks_delta`: task changes from one ingest of a project */
+export interface TasksDelta {
+  project_id: string;
+  added: Task[];
+  moved: Task[];
+  edited: Task[];
+  removed: string[];
+}
+
+/** SSE `activity_new`: activity rows appended by one ingest of a project */
+export interface ActivityDelta {
+  project_id: string;
+  events: ActivityEvent[];
+}
+
+/** SSE `story_counts`: a project's PRD story totals changed */
+export interface StoryCountsDelta {
+  project_id: string;
+  total_stories: number;
+  done_stories: number;
+}
@@ -35,7 +35,7 @@ const AgentsPage = () => {
 
                 <div className="space-y-1.5">
                   <div className="flex items-center gap-2">
-                    <ProjectBadge name={agent.project_name} />
+                    {agent.project_name && <ProjectBadge name={agent.project_name} />}
                     <span className="text-xs font-mono text-muted-foreground">{agent.story_id}</span>
                   </div>
                   <p className="text-xs text-muted-foreground leading-relaxed">{agent.current_task}</p>
@@ -1,11 +1,15 @@
-import { useState } from "react";
+import { useSearchParams } from "react-router-dom";
 import { Header } from "@/components/layout/Header";
 import { KanbanColumn } from "@/components/board/KanbanColumn";
 import { useBoard, useProjects } from "@/hooks/use-api";
 import { Loader2 } from "lucide-react";
 
 const ProjectsPage = () => {
-  const [projectFilter, setProjectFilter] = useState("all");
+  // Kept in the URL, so the live event stream (useSSE) is scoped to the same project
+  const [searchParams, setSearchParams] = useSearchParams();
+  const projectFilter = searchParams.get("project") ?? "all";
+  const setProjectFilter = (project: string) =>
+    setSearchParams(project === "all" ? {} : { project }, { replace: true });
   const { data: board, isLoading: boardLoading } = useBoard(projectFilter);
   const { data: projects } = useProjects();
 